@@ -0,0 +1,68 @@
+"""
+Сравнение форматов хранения вакансий: размер файла и время записи/чтения.
+Запуск: python -m benchmarks.compression [путь к JSON-файлу вакансий]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from src.archive import EXTENSIONS, available
+from src.fileutils import JSONLinesVacancyFileHandler, JSONVacancyFileHandler, iter_concatenated_json
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Лучшее время из repeat запусков, сек."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(records: List[Dict[str, Any]], directory: str) -> List[tuple]:
+    suffix = {codec: ext for ext, codec in EXTENSIONS.items() if ext != ".lzma"}
+    handlers: List[tuple] = [("json (indent=2)", JSONVacancyFileHandler(os.path.join(directory, "v.json")))]
+    handlers.append(("jsonl", JSONLinesVacancyFileHandler(os.path.join(directory, "v.jsonl"))))
+    for codec in available():
+        path = os.path.join(directory, "v.jsonl" + suffix[codec])
+        handlers.append((f"jsonl + {codec}", JSONLinesVacancyFileHandler(path)))
+
+    rows = []
+    for name, handler in handlers:
+
+        def write() -> None:
+            if isinstance(handler, JSONVacancyFileHandler):
+                # clear() оставляет в файле "[]", а write_vacs дописывает — для замера пишем один массив
+                with open(handler.filepath, "w", encoding="utf-8") as f:
+                    json.dump(records, f, ensure_ascii=False, indent=2)
+            else:
+                handler.clear()
+                handler.write_vacs(records)
+
+        write_time = best_of(write)
+        load_time = best_of(handler.load_vacs)
+        assert len(handler.load_vacs()) == len(records)
+        rows.append((name, os.path.getsize(handler.filepath), write_time, load_time))
+    return rows
+
+
+def main(argv: List[str]) -> None:
+    source = argv[1] if len(argv) > 1 else "data/vacancies.json"
+    records = list(iter_concatenated_json(source))
+    with tempfile.TemporaryDirectory() as directory:
+        rows = run(records, directory)
+
+    base = rows[0][1]
+    print(f"{len(records)} вакансий из {source}")
+    print(f"{'формат':<18}{'размер, КБ':>12}{'доля':>8}{'запись, мс':>12}{'чтение, мс':>12}")
+    for name, size, write_time, load_time in rows:
+        print(f"{name:<18}{size / 1024:>12.1f}{size / base:>8.1%}{write_time * 1000:>12.1f}{load_time * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,210 @@
+"""
+Набор бенчмарков горячих путей: чтение файла, создание Vacancy, топ-N, поиск, загрузка страниц.
+Для каждого замера сохраняются лучшее время из нескольких запусков и пиковая память (tracemalloc).
+
+Запуск:
+    python -m benchmarks.run                                  # 10k вакансий, сравнение с benchmarks/baseline.json
+    python -m benchmarks.run --sizes 10000 100000 1000000
+    python -m benchmarks.run --save benchmarks/baseline.json  # обновить эталон
+Код возврата 1, если какой-то замер медленнее (или тяжелее) эталона больше чем на --threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.stubserver import StubServer
+from benchmarks.synthetic import generate
+from src.API import HeadHunterAPI
+from src.fileutils import JSONLinesVacancyFileHandler, JSONVacancyFileHandler
+from src.searchutils import InvertedIndex
+from src.vacutils import Vacancy, top_n
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class Context:
+    """Данные одного размера: записи, файлы с ними и лениво создаваемые Vacancy и индекс."""
+
+    def __init__(self, size: int, directory: str) -> None:
+        self.size = size
+        self.records = list(generate(size))
+        self.json_path = os.path.join(directory, f"vacancies-{size}.json")
+        self.jsonl_path = os.path.join(directory, f"vacancies-{size}.jsonl")
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+        JSONLinesVacancyFileHandler(self.jsonl_path).write_vacs(self.records)
+        self.__vacancies: List[Vacancy] | None = None
+        self.__index: InvertedIndex | None = None
+
+    @property
+    def vacancies(self) -> List[Vacancy]:
+        if self.__vacancies is None:
+            self.__vacancies = Vacancy.from_trusted_many(self.records)
+        return self.__vacancies
+
+    @property
+    def index(self) -> InvertedIndex:
+        if self.__index is None:
+            self.__index = InvertedIndex.from_vacancies(self.vacancies)
+        return self.__index
+
+
+def scan_snippets(vacancies: List[Vacancy], keyword: str) -> List[Vacancy]:
+    """Поиск перебором, как в прежнем пункте меню 3 main.py."""
+    keyword = keyword.lower()
+    return [v for v in vacancies if keyword in (v.snippet.get("requirement") or "").lower()]
+
+
+# Имя замера -> подготовка (по данным размера) функции, время которой замеряется
+CASES: Dict[str, Callable[[Context], Callable[[], Any]]] = {
+    "load_vacs.json": lambda ctx: JSONVacancyFileHandler(ctx.json_path).load_vacs,
+    "load_vacs.jsonl": lambda ctx: JSONLinesVacancyFileHandler(ctx.jsonl_path).load_vacs,
+    "vacancy.from_raw_many": lambda ctx: lambda: Vacancy.from_raw_many(ctx.records),
+    "vacancy.from_trusted_many": lambda ctx: lambda: Vacancy.from_trusted_many(ctx.records),
+    "top_n.normalized": lambda ctx: lambda: top_n(ctx.vacancies, 10, key="normalized"),
+    "search.scan": lambda ctx: lambda: scan_snippets(ctx.vacancies, "python"),
+    "search.index_build": lambda ctx: lambda: InvertedIndex.from_vacancies(ctx.vacancies),
+    "search.query": lambda ctx: lambda: ctx.index.search("python django OR react*"),
+}
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Лучшее время из repeat запусков и пиковая память отдельного запуска под tracemalloc."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"seconds": min(times), "peak_bytes": peak}
+
+
+def fetch_case(url: str, max_workers: int = 4) -> Callable[[], Any]:
+    """Загрузка всей выдачи по ключевому слову с локального сервера (см. StubServer)."""
+    api_class = type("StubHeadHunterAPI", (HeadHunterAPI,), {"url": url})
+
+    def fetch() -> int:
+        api = api_class(max_workers=max_workers)
+        api.load_vacancies("python")
+        return len(api.vacancies)
+
+    return fetch
+
+
+def run(sizes: List[int], repeat: int = 3, cases: List[str] | None = None) -> Dict[str, Dict[str, float]]:
+    """
+    Выполнить замеры.
+    :return: "<замер>@<размер>" -> {"seconds", "peak_bytes"}.
+    """
+    selected = [name for name in CASES if cases is None or name in cases]
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            ctx = Context(size, directory)
+            for name in selected:
+                results[f"{name}@{size}"] = measure(CASES[name](ctx), repeat)
+                report_line(f"{name}@{size}", results[f"{name}@{size}"])
+            del ctx
+    if cases is None or "fetch.pages" in cases:
+        # 20 страниц по 100 вакансий — предел выдачи hh.ru на один запрос
+        with StubServer(pages=20, per_page=100) as server:
+            results["fetch.pages@2000"] = measure(fetch_case(server.url), repeat)
+        report_line("fetch.pages@2000", results["fetch.pages@2000"])
+    return results
+
+
+def report_line(name: str, result: Dict[str, float], baseline: Dict[str, float] | None = None) -> None:
+    line = f"{name:<36}{result['seconds'] * 1000:>12.2f} мс{result['peak_bytes'] / 2**20:>10.2f} МБ"
+    if baseline is not None:
+        time_ratio = result["seconds"] / baseline["seconds"]
+        memory_ratio = result["peak_bytes"] / max(baseline["peak_bytes"], 1)
+        line += f"{time_ratio:>9.2f}x{memory_ratio:>8.2f}x"
+    print(line)
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float = 0.3
+) -> List[str]:
+    """
+    Замеры, ставшие хуже эталона больше чем на threshold (доля) по времени или памяти.
+    Замеры короче миллисекунды по времени не сравниваются — их разброс больше порога.
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if old["seconds"] >= 0.001 and result["seconds"] > old["seconds"] * (1 + threshold):
+            regressions.append(f"{name}: время {old['seconds'] * 1000:.2f} -> {result['seconds'] * 1000:.2f} мс")
+        if old["peak_bytes"] >= 64 * 1024 and result["peak_bytes"] > old["peak_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{name}: память {old['peak_bytes'] / 2**20:.2f} -> {result['peak_bytes'] / 2**20:.2f} МБ"
+            )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            results: Dict[str, Dict[str, float]] = json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+    return results
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    data = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000], help="число вакансий (например, 10000 100000 1000000)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="запусков на замер (берётся лучшее время)")
+    parser.add_argument("--cases", nargs="+", choices=[*CASES, "fetch.pages"], help="только эти замеры")
+    parser.add_argument("--baseline", default=BASELINE, help="эталон для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.3, help="допустимое ухудшение (доля)")
+    parser.add_argument("--save", metavar="PATH", help="сохранить результаты как эталон")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.cases)
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"Эталон сохранён в {args.save}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"Эталон {args.baseline} не найден — сравнивать не с чем")
+        return 0
+    print(f"\nСравнение с {args.baseline} (время, память):")
+    for name, result in results.items():
+        if name in baseline:
+            report_line(name, result, baseline[name])
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print("РЕГРЕССИЯ", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Локальный HTTP-сервер, отвечающий как /vacancies API hh.ru, — чтобы замерять загрузку без сети.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import raw_items
+
+
+class StubServer:
+    """
+    Сервер с pages страницами по per_page вакансий; страницы готовятся заранее,
+    чтобы замерялся клиент, а не генерация данных.
+    """
+
+    def __init__(self, pages: int = 20, per_page: int = 100, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.pages: Dict[int, bytes] = {
+            page: json.dumps(
+                {"items": raw_items(per_page, seed=page, start=page * per_page), "pages": pages, "page": page},
+                ensure_ascii=False,
+            ).encode("utf-8")
+            for page in range(pages)
+        }
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), self.__handler())
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{str(host)}:{port}/vacancies"
+
+    def __handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело уходят отдельными пакетами — без этого каждый ответ ждал бы задержанного ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query.get("page", ["0"])[0])
+                body = stub.pages.get(page)
+                stub.requests += 1
+                if stub.latency:
+                    threading.Event().wait(stub.latency)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubServer":
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
@@ -0,0 +1,108 @@
+"""
+Генератор синтетических вакансий в форме data/vacancies.json и ответов API hh.ru.
+Результат детерминирован: одинаковые n и seed дают одинаковые данные.
+"""
+
+import random
+from typing import Any, Dict, Iterator, List
+
+TITLES = [
+    "Python-разработчик",
+    "Java developer",
+    "Аналитик данных",
+    "Стажер в отдел кадров",
+    "Frontend-разработчик (React)",
+    "Инженер по тестированию",
+    "DevOps-инженер",
+    "Менеджер по продажам",
+    "Бухгалтер",
+    "Оператор call-центра",
+    "Системный администратор",
+    "Golang developer",
+]
+GRADES = ["", "Junior ", "Middle ", "Senior ", "Ведущий ", "Старший "]
+SKILLS = [
+    "Python",
+    "Django",
+    "SQL",
+    "PostgreSQL",
+    "Java",
+    "Spring",
+    "Excel",
+    "1С",
+    "Linux",
+    "Docker",
+    "Kubernetes",
+    "React",
+    "TypeScript",
+    "C++",
+    "английский язык",
+    "грамотная речь",
+]
+DUTIES = [
+    "Разработка и поддержка сервисов",
+    "Работа с клиентами",
+    "Подготовка отчётности",
+    "Участие в код-ревью",
+    "Ведение документации",
+    "Обработка входящих звонков",
+    "Автоматизация процессов",
+]
+# Валюта -> (доля вакансий, типичная зарплата)
+CURRENCIES = {
+    None: (0.45, 0),
+    "RUR": (0.45, 120_000),
+    "USD": (0.05, 3_000),
+    "EUR": (0.03, 2_500),
+    "KZT": (0.02, 500_000),
+}
+
+
+def _salary(rnd: random.Random) -> Dict[str, Any]:
+    currency = rnd.choices(list(CURRENCIES), weights=[w for w, _ in CURRENCIES.values()])[0]
+    typical = CURRENCIES[currency][1]
+    if currency is None:
+        return {"currency": None, "from": 0, "to": 0}
+    frm = int(rnd.uniform(0.5, 1.5) * typical) // 1000 * 1000
+    to = frm if rnd.random() < 0.3 else frm + rnd.randint(0, 5) * typical // 10
+    if rnd.random() < 0.2:
+        frm = 0
+    return {"currency": currency, "from": frm, "to": to}
+
+
+def _snippet(rnd: random.Random) -> Dict[str, Any]:
+    skills = rnd.sample(SKILLS, 3)
+    highlighted = [f"<highlighttext>{s}</highlighttext>" if rnd.random() < 0.2 else s for s in skills]
+    return {
+        "requirement": f"Опыт работы с {', '.join(highlighted)} от {rnd.randint(0, 5)} лет.",
+        "responsibility": ". ".join(rnd.sample(DUTIES, 2)) + "." if rnd.random() < 0.9 else None,
+    }
+
+
+def generate(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """n сохранённых вакансий в формате JSONVacancyFileHandler (name, url, salary_range, snippet)."""
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield {
+            "name": rnd.choice(GRADES) + rnd.choice(TITLES),
+            "url": f"https://hh.ru/vacancy/{100_000_000 + i}",
+            "salary_range": _salary(rnd),
+            "snippet": _snippet(rnd),
+        }
+
+
+def raw_items(n: int, seed: int = 0, start: int = 0) -> List[Dict[str, Any]]:
+    """n вакансий в формате ответа API hh.ru (id, alternate_url, salary может быть None)."""
+    items = []
+    for i, record in enumerate(generate(n, seed), start):
+        salary = record["salary_range"]
+        items.append(
+            {
+                "id": str(100_000_000 + i),
+                "name": record["name"],
+                "alternate_url": f"https://hh.ru/vacancy/{100_000_000 + i}",
+                "salary": None if salary["currency"] is None else salary,
+                "snippet": record["snippet"],
+            }
+        )
+    return items
@@ -1,12 +1,32 @@
+import os
+from typing import Any
+
 from src.API import HeadHunterAPI
-from src.fileutils import JSONVacancyFileHandler
+from src.dedup import collapse
+from src.fileutils import IndexedVacancyFileHandler, migrate_json_to_jsonl
+from src.query import Query, VacancyCollection
 from src.vacutils import Vacancy
 
+STORE = "data/vacancies.jsonl"
+# Файл прежних версий программы: JSON-массивы, дописанные друг за другом
+LEGACY_STORE = "data/vacancies.json"
+
+
+def open_store() -> IndexedVacancyFileHandler:
+    """Файл вакансий в формате JSON Lines; при первом запуске в него переносятся записи из старого JSON-файла."""
+    if os.path.exists(LEGACY_STORE) and not os.path.exists(STORE):
+        count = migrate_json_to_jsonl(LEGACY_STORE, STORE)
+        print(f"Перенесено {count} вакансий из {LEGACY_STORE} в {STORE}.")
+    return IndexedVacancyFileHandler(STORE)
+
 
 def user_interaction() -> None:
     api = HeadHunterAPI()
-    file_handler = JSONVacancyFileHandler("data/vacancies.json")
-    vacancies: list[Vacancy] = []
+    file_handler = open_store()
+    # Запросы к коллекции кешируются; кеш и поисковый индекс сбрасываются при смене списка вакансий
+    collection = VacancyCollection()
+    # Последний запрос пункта 7 — следующий уточняет его
+    query = Query()
 
     while True:
         print("\n=== Меню ===")
@@ -16,29 +36,29 @@ def user_interaction() -> None:
         print("4) Сохранить вакансии в файл")
         print("5) Загрузить вакансии из файла")
         print("6) Удалить данные из файла")
+        print("7) Фильтр: зарплата, валюта, слова, название")
         print("0) Выход")
 
         choice = input("Выберите пункт: ").strip()
         if choice == "0":
             break
 
-        # 1) Поиск — заполняем vacancies из api.vacancies (список dict)
+        # 1) Поиск — заполняем коллекцию из api.vacancies (список dict)
         if choice == "1":
-            kw = input("Ключевое слово для поиска: ").strip()
-            api.load_vacancies(kw)  # заполняет api.vacancies
-            vacancies = []
-            for raw in api.vacancies:
-                name = raw["name"]
-                url = raw.get("alternate_url") or raw.get("url")
-                # формат salary может быть в raw["salary"] или raw["salary_range"]
-                salary_dict = raw.get("salary_range") or raw.get("salary")
-                snippet = raw.get("snippet", {})
-                vacancies.append(Vacancy(name, url, salary_dict, snippet))
-            print(f"Найдено {len(vacancies)} вакансий.")
-
-        # 2) Топ-N по максимальной зарплате
+            # Несколько ключевых слов можно перечислить через запятую
+            keywords = [kw.strip() for kw in input("Ключевые слова для поиска (через запятую): ").split(",")]
+            # Результаты прошлого поиска не должны попасть в новый
+            api.vacancies, api.matches = [], {}
+            api.load_vacancies_many(keywords)  # заполняет api.vacancies без повторов
+            found = Vacancy.from_raw_many(api.vacancies)
+            # Одна и та же вакансия, выложенная заново под другим URL, остаётся в списке один раз:
+            # выдача упорядочена по релевантности, поэтому остаётся первая копия
+            collection.replace(collapse(found, keep="first"))
+            print(f"Найдено {len(collection)} вакансий (почти одинаковых скрыто: {len(found) - len(collection)}).")
+
+        # 2) Топ-N по максимальной зарплате (в пересчёте на рубли)
         elif choice == "2":
-            if not vacancies:
+            if not collection:
                 print("Сначала выполните поиск (пункт 1).")
                 continue
             try:
@@ -47,8 +67,8 @@ def user_interaction() -> None:
                 print("Нужно ввести число.")
                 continue
 
-            top_n = sorted(vacancies, reverse=True)[:n]
-            for v in top_n:
+            # Вилки в разных валютах сравниваются в рублях
+            for v in collection.select(Query().top(n)):
                 lo = v.salary_range["from"]
                 hi = v.salary_range["to"]
                 cur = v.salary_range["currency"]
@@ -56,41 +76,31 @@ def user_interaction() -> None:
 
         # 3) Поиск по ключевому слову в описании
         elif choice == "3":
-            if not vacancies:
+            if not collection:
                 print("Нет вакансий (пункт 1).")
                 continue
-            kw = input("Ключевое слово в описании: ").strip().lower()
-            filtered = []
-            for v in vacancies:
-                # v.snippet — dict
-                req = v.snippet.get("requirement", "") or ""
-                resp = v.snippet.get("responsibility", "") or ""
-                text = (req + " " + resp).lower()
-                if kw in text:
-                    filtered.append(v)
+            keyword = input("Ключевые слова в описании (OR — любое из, слово* — по началу слова): ").strip()
+            filtered = collection.select(Query().matching(keyword))
             print(f"Найдено {len(filtered)} вакансий:")
             for v in filtered:
                 print(f"- {v.name} ({v.url})")
 
-        # 4) Сохранить вакансии в файл (только атрибуты Vacancy)
+        # 4) Сохранить вакансии в файл (только атрибуты Vacancy); уже сохранённые не дублируются
         elif choice == "4":
-            if not vacancies:
+            if not collection:
                 print("Нет вакансий для сохранения.")
                 continue
-            to_dump = []
-            for v in vacancies:
-                to_dump.append({"name": v.name, "url": v.url, "salary_range": v.salary_range, "snippet": v.snippet})
-            file_handler.write_vacs(to_dump, indent=2)
-            print("Вакансии сохранены в vacancies.json")
+            to_dump = [v.to_dict() for v in collection.vacancies]
+            added, updated = file_handler.upsert_vacs(to_dump)
+            print(f"Вакансии сохранены в {STORE}: новых {added}, обновлено {updated}.")
 
         # 5) Загрузить вакансии из файла и восстановить объекты Vacancy
         elif choice == "5":
             try:
-                data = file_handler.load_vacs()
-                vacancies = []
-                for d in data:
-                    vacancies.append(Vacancy(d["name"], d["url"], d.get("salary_range"), d.get("snippet", {})))
-                print(f"Загружено {len(vacancies)} вакансий из файла.")
+                with file_handler.view() as view:
+                    # Записи в файле сохранены из проверенных Vacancy — повторная проверка не нужна
+                    collection.replace(Vacancy.from_trusted_many(view.record(i) for i in range(len(view))))
+                print(f"Загружено {len(collection)} вакансий из файла.")
             except Exception as e:
                 print("Ошибка при загрузке:", e)
 
@@ -98,8 +108,39 @@ def user_interaction() -> None:
             file_handler.clear()
             print("Сохранённые данные удаленны.")
 
+        # 7) Несколько условий сразу; пустой ответ оставляет условие прошлого запроса, "-" снимает его
+        elif choice == "7":
+            if not collection:
+                print("Нет вакансий (пункт 1).")
+                continue
+            print("Пустой ответ — оставить прошлое условие, '-' — снять его.")
+            changes: dict[str, Any] = {}
+            for field, prompt in (
+                ("min_salary", "Зарплата от (руб.): "),
+                ("currency", "Валюта (RUR, USD, ...): "),
+                ("keyword", "Ключевые слова: "),
+                ("name", "Часть названия: "),
+            ):
+                answer = input(prompt).strip()
+                if answer == "-":
+                    changes[field] = None
+                elif answer:
+                    changes[field] = answer
+            try:
+                if changes.get("min_salary") is not None:
+                    changes["min_salary"] = float(changes["min_salary"])
+            except ValueError:
+                print("Зарплата должна быть числом.")
+                continue
+            query = query.where(**changes)
+            filtered = collection.select(query)
+            print(f"Найдено {len(filtered)} вакансий:")
+            for v in filtered:
+                print(f"- {v.name} ({v.url}) — до {v.salary_range['to']} {v.salary_range['currency']}")
+
         else:
             print("Неверный выбор, попробуйте ещё раз.")
 
 
-user_interaction()
+if __name__ == "__main__":
+    user_interaction()
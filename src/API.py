@@ -1,7 +1,19 @@
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Generator, Iterable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from src import metrics
+from src.httpcache import ResponseCache
+from src.ratelimit import BACKGROUND, INTERACTIVE, RateLimiter, shared_limiter
+from src.vacutils import vacancy_key
 
 
 class ServiceAPI(ABC):
@@ -24,23 +36,377 @@ class HeadHunterAPI(ServiceAPI):
     url = "https://api.hh.ru/vacancies"
     headers = {"User-Agent": "HH-User-Agent"}
 
-    def __init__(self) -> None:
+    # hh.ru отдаёт не больше 20 страниц по 100 вакансий на один запрос
+    max_pages = 20
+    # Поиск hh.ru охватывает вакансии за последние 30 дней
+    search_period = timedelta(days=30)
+    # Коды ответа, после которых запрос имеет смысл повторить
+    retry_statuses = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10.0,
+        session: requests.Session | None = None,
+        rate_limit: float | None = None,
+        cache: ResponseCache | None = None,
+        stale_while_revalidate: bool = True,
+        limiter: RateLimiter | None = None,
+        priority: int = INTERACTIVE,
+    ) -> None:
+        """
+        :param max_workers: сколько страниц загружать одновременно (общий лимит на все ключевые слова).
+        :param retries: сколько раз повторять запрос при 429/5xx и сетевых ошибках.
+        :param backoff: базовая задержка между повторами (удваивается с каждой попыткой), сек.
+        :param timeout: таймаут одного запроса, сек.
+        :param session: готовая сессия requests (по умолчанию создаётся своя).
+        :param rate_limit: не больше стольких запросов в секунду на весь экземпляр
+                           (None — общий для процесса планировщик, см. shared_limiter).
+        :param cache: дисковый кеш ответов (None — без кеша).
+        :param stale_while_revalidate: отдавать устаревшую запись кеша сразу, обновляя её в фоне.
+        :param limiter: планировщик запросов (важнее rate_limit); один планировщик можно разделить между клиентами.
+        :param priority: приоритет запросов клиента: INTERACTIVE или BACKGROUND (например, для синхронизации).
+        """
         self.params: dict = {"text": "", "page": 0, "per_page": 100}
         self.vacancies: list = []
+        # Ключ вакансии -> ключевые слова, по которым она нашлась
+        self.matches: dict[str, list[str]] = {}
+        if limiter is None:
+            limiter = RateLimiter(rate_limit) if rate_limit else shared_limiter()
+        self.limiter = limiter
+        self.priority = priority
+        self.__lock = threading.Lock()
+        self.max_workers = max(1, max_workers)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session if session is not None else self.__make_session(self.max_workers)
+        self.cache = cache
+        self.stale_while_revalidate = stale_while_revalidate
+        self.__revalidator: ThreadPoolExecutor | None = None
+        self.__revalidating: dict[str, Future] = {}
+
+    @classmethod
+    def __make_session(cls, pool_size: int) -> requests.Session:
+        """Сессия с пулом keep-alive соединений под число потоков."""
+        session = requests.Session()
+        session.headers.update(cls.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get_page(self, page: int, params: dict | None = None) -> dict:
+        """
+        Запросить одну страницу выдачи с повтором при 429/5xx.
+        Если подключён кеш, свежая страница берётся из него, а устаревшая перепроверяется
+        условным запросом (сразу или в фоне, см. stale_while_revalidate).
+        :param page: номер страницы.
+        :param params: параметры запроса (по умолчанию self.params).
+        :return: JSON-ответ API.
+        """
+        params = {**(self.params if params is None else params), "page": page}
+        if self.cache is None:
+            return self.__decode(self._request(params))
+
+        entry = self.cache.get(self.__class__.url, params)
+        if entry is None:
+            metrics.count("cache.misses")
+        elif self.cache.is_fresh(entry):
+            metrics.count("cache.hits")
+            cached: dict = entry["body"]
+            return cached
+        else:
+            metrics.count("cache.stale")
+            if self.stale_while_revalidate:
+                self.__revalidate_later(params, entry)
+                stale: dict = entry["body"]
+                return stale
+        return self.__fetch_cached(params, entry)
+
+    @staticmethod
+    def __decode(response: requests.Response) -> dict:
+        with metrics.timer("http.decode"):
+            body: dict = response.json()
+        return body
+
+    def __fetch_cached(self, params: dict, entry: dict | None, priority: int | None = None) -> dict:
+        """Запросить страницу (условно, если есть устаревшая запись) и обновить кеш."""
+        assert self.cache is not None
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._request(params, headers, priority)
+        if response.status_code == 304 and entry is not None:
+            metrics.count("cache.revalidated")
+            self.cache.touch(self.__class__.url, params, entry)
+            cached: dict = entry["body"]
+            return cached
+        body = self.__decode(response)
+        self.cache.put(
+            self.__class__.url, params, body, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        return body
+
+    def __revalidate_later(self, params: dict, entry: dict) -> None:
+        """Обновить устаревшую запись кеша в фоновом потоке (не больше одного обновления на запись)."""
+        key = ResponseCache.key(self.__class__.url, params)
+        with self.__lock:
+            if key in self.__revalidating:
+                return
+            if self.__revalidator is None:
+                self.__revalidator = ThreadPoolExecutor(max_workers=1)
+            # Обновление кеша не должно задерживать запросы, которых ждёт пользователь
+            future = self.__revalidator.submit(self.__fetch_cached, params, entry, BACKGROUND)
+            self.__revalidating[key] = future
+        future.add_done_callback(lambda _: self.__revalidating.pop(key, None))
+
+    def wait_revalidation(self) -> None:
+        """Дождаться фоновых обновлений кеша."""
+        for future in list(self.__revalidating.values()):
+            future.exception()
+
+    def _request(self, params: dict, headers: dict | None = None, priority: int | None = None) -> requests.Response:
+        """
+        Выполнить запрос с повтором при 429/5xx и сетевых ошибках.
+        Каждая попытка ждёт разрешения планировщика; 429 приостанавливает и замедляет
+        все запросы, которые идут через тот же планировщик.
+        :param priority: приоритет запроса (по умолчанию self.priority).
+        :return: ответ со статусом 200 (или 304 на условный запрос).
+        """
+        priority = self.priority if priority is None else priority
+        # 304 — нормальный ответ только на условный запрос
+        ok_statuses = (200, 304) if headers else (200,)
+        headers = {**self.__class__.headers, **(headers or {})}
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            if attempt:
+                metrics.count("http.retries")
+            with metrics.timer("http.throttle"):
+                self.limiter.acquire(priority)
+            metrics.count("http.requests")
+            try:
+                with metrics.timer("http.request"):
+                    response = self.session.get(
+                        self.__class__.url, headers=headers, params=params, timeout=self.timeout
+                    )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.count("http.network_errors")
+                if last_attempt:
+                    raise ConnectionError(f"Ошибка запроса: {e}") from e
+                self.__sleep(self.__delay(attempt))
+                continue
+
+            if response.status_code in ok_statuses:
+                self.limiter.reward()
+                if metrics.current() is not None:
+                    metrics.count("http.bytes", len(response.content))
+                return response
+            metrics.count(f"http.status.{response.status_code}")
+            if response.status_code == 429:
+                # Паузу выдержат все запросы планировщика, а не только этот поток
+                self.limiter.penalize(self.__delay(attempt, response.headers.get("Retry-After")))
+            if response.status_code not in self.retry_statuses or last_attempt:
+                raise ConnectionError(f"Ошибка запроса: {response.status_code}")
+            if response.status_code != 429:
+                self.__sleep(self.__delay(attempt, response.headers.get("Retry-After")))
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def __delay(self, attempt: int, retry_after: Any = None) -> float:
+        """Пауза перед повтором: Retry-After от сервера или экспоненциальная задержка."""
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            return self.backoff * 2.0**attempt
+
+    @staticmethod
+    def __sleep(delay: float) -> None:
+        if delay > 0:
+            time.sleep(delay)
+
+    def _merge(self, items: Iterable[dict], keyword: str) -> None:
+        """
+        Добавить вакансии в self.vacancies без повторов.
+        Для уже известной вакансии только дописывается ключевое слово в self.matches.
+        """
+        for item in items:
+            key = vacancy_key(item)
+            if key is None:
+                self.vacancies.append(item)
+                continue
+            keywords = self.matches.get(key)
+            if keywords is None:
+                self.vacancies.append(item)
+                self.matches[key] = [keyword]
+            elif keyword not in keywords:
+                keywords.append(keyword)
+
+    def keywords_for(self, vacancy: dict) -> list[str]:
+        """Ключевые слова, по которым нашлась вакансия."""
+        key = vacancy_key(vacancy)
+        return list(self.matches.get(key, [])) if key is not None else []
+
+    def _page_count(self, first: dict) -> int:
+        """Сколько страниц запрашивать, судя по первой странице ответа."""
+        return min(int(first.get("pages", self.max_pages)), self.max_pages)
 
     def load_vacancies(self, keyword: str) -> None:
         """
         Запросить список вакансий, включающих ключевое слово.
+        Первая страница запрашивается отдельно, чтобы узнать число страниц,
+        остальные загружаются параллельно и добавляются в self.vacancies по порядку.
+        Вакансии, которые уже есть в self.vacancies, повторно не добавляются.
         :param keyword:
         :return:
         """
         self.params["text"] = keyword
 
-        # Список из 20 страниц
-        while self.params.get("page") != 20:
-            response = requests.get(self.__class__.url, headers=self.__class__.headers, params=self.params)
-            if response.status_code != 200:
-                raise ConnectionError(f"Ошибка запроса: {response.status_code}")
-            vacancies = response.json()["items"]
-            self.vacancies.extend(vacancies)
-            self.params["page"] += 1
+        first = self._get_page(0)
+        self._merge(first["items"], keyword)
+
+        # Не запрашиваем страницы, которых у API заведомо нет
+        pages = self._page_count(first)
+        if pages <= 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for data in pool.map(self._get_page, range(1, pages)):
+                self._merge(data["items"], keyword)
+
+    def iter_pages(self, keyword: str, **params: Any) -> Generator[dict, None, None]:
+        """
+        Страницы выдачи по одной и по порядку; следующая запрашивается, только когда она нужна.
+        Позволяет прекратить загрузку, не запрашивая оставшиеся страницы.
+        :param keyword: ключевое слово.
+        :param params: дополнительные параметры запроса (например, order_by).
+        """
+        query = {**self.params, "text": keyword, **params}
+        first = self._get_page(0, query)
+        yield first
+        for page in range(1, self._page_count(first)):
+            yield self._get_page(page, query)
+
+    def stream_pages(self, keyword: str, **params: Any) -> Iterator[dict]:
+        """
+        Страницы выдачи по порядку по мере загрузки: одновременно загружается не больше
+        max_workers страниц, следующая запрашивается, когда потребитель забирает готовую.
+        В отличие от load_vacancies, страницы не накапливаются в self.vacancies.
+        :param keyword: ключевое слово.
+        :param params: дополнительные параметры запроса.
+        """
+        query = {**self.params, "text": keyword, **params}
+        first = self._get_page(0, query)
+        pages = iter(range(1, self._page_count(first)))
+        yield first
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            window: deque[Future] = deque()
+            try:
+                for page in islice(pages, self.max_workers):
+                    window.append(pool.submit(self._get_page, page, query))
+                while window:
+                    data = window.popleft().result()
+                    for page in islice(pages, 1):
+                        window.append(pool.submit(self._get_page, page, query))
+                    yield data
+            finally:
+                # Потребитель остановился раньше — незапущенные запросы не нужны
+                for future in window:
+                    future.cancel()
+
+    def load_vacancies_sharded(
+        self,
+        keyword: str,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        min_window: timedelta = timedelta(minutes=1),
+    ) -> int:
+        """
+        Запросить все вакансии по ключевому слову, даже если их больше, чем hh.ru отдаёт на один запрос
+        (max_pages * per_page). Период публикации делится на окна (date_from/date_to); окно, в котором
+        найдено больше предела, делится пополам, пока не станет короче min_window. Страницы всех окон
+        загружаются в одном пуле потоков, вакансии сливаются в self.vacancies без повторов
+        (в порядке загрузки, а не выдачи).
+        :param keyword: ключевое слово.
+        :param date_from: начало периода (по умолчанию — search_period назад).
+        :param date_to: конец периода (по умолчанию — сейчас).
+        :param min_window: окно короче этого не делится; его выдача обрезается пределом API.
+                           Не меньше секунды: границы окон передаются в API с точностью до секунды.
+        :return: сколько окон пришлось запросить.
+        """
+        if min_window < timedelta(seconds=1):
+            raise ValueError("Минимальное окно должно быть не короче секунды")
+        date_to = date_to if date_to is not None else datetime.now(timezone.utc).replace(microsecond=0)
+        date_from = date_from if date_from is not None else date_to - self.search_period
+        cap = self.max_pages * self.params["per_page"]
+        windows = 0
+
+        def query(start: datetime, end: datetime) -> dict:
+            return {
+                **self.params,
+                "text": keyword,
+                "date_from": start.isoformat(timespec="seconds"),
+                "date_to": end.isoformat(timespec="seconds"),
+            }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Future -> (начало окна, конец окна, номер страницы)
+            pending: dict[Future, tuple[datetime, datetime, int]] = {}
+
+            def submit(start: datetime, end: datetime, page: int) -> None:
+                pending[pool.submit(self._get_page, page, query(start, end))] = (start, end, page)
+
+            submit(date_from, date_to, 0)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end, page = pending.pop(future)
+                    data = future.result()
+                    if page == 0:
+                        windows += 1
+                        if int(data.get("found", 0)) > cap:
+                            # Середина округляется до секунды и у короткого окна может совпасть с началом
+                            middle = (start + (end - start) / 2).replace(microsecond=0)
+                            if end - start > min_window and start < middle:
+                                # Первая страница окна не нужна: те же вакансии придут в половинах окна
+                                submit(start, middle, 0)
+                                submit(middle, end, 0)
+                                metrics.count("api.windows_split")
+                                continue
+                            metrics.count("api.windows_truncated")
+                        for next_page in range(1, self._page_count(data)):
+                            submit(start, end, next_page)
+                    self._merge(data["items"], keyword)
+        metrics.count("api.windows", windows)
+        return windows
+
+    def load_vacancies_many(self, keywords: Iterable[str]) -> None:
+        """
+        Запросить вакансии сразу по нескольким ключевым словам.
+        Все запросы идут через один пул потоков и общий rate_limit, результаты
+        сливаются в self.vacancies без повторов, а self.matches хранит,
+        по каким ключевым словам нашлась каждая вакансия.
+        :param keywords: список ключевых слов.
+        """
+        keywords = list(dict.fromkeys(kw for kw in keywords if kw))
+        if not keywords:
+            return
+        queries = [{**self.params, "text": kw} for kw in keywords]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Первые страницы всех запросов — чтобы узнать, сколько страниц у каждого
+            firsts = list(pool.map(lambda params: self._get_page(0, params), queries))
+            tasks = [(i, page) for i, first in enumerate(firsts) for page in range(1, self._page_count(first))]
+            for kw, first in zip(keywords, firsts):
+                self._merge(first["items"], kw)
+            del firsts
+
+            pages = pool.map(lambda task: self._get_page(task[1], queries[task[0]]), tasks)
+            for (i, _), data in zip(tasks, pages):
+                self._merge(data["items"], keywords[i])
@@ -0,0 +1,83 @@
+import bz2
+import gzip
+import lzma
+import os
+from io import BufferedIOBase
+from typing import IO, Callable, Dict, Literal
+
+# zstd: в стандартной библиотеке с Python 3.14, раньше — необязательный пакет zstandard
+try:
+    from compression import zstd as _zstd  # type: ignore[import-not-found]
+except ImportError:
+    try:
+        import zstandard as _zstd  # type: ignore[import-not-found, no-redef]
+    except ImportError:
+        _zstd = None
+
+# Режим открытия файла: только binary-режимы
+Mode = Literal["rb", "wb", "ab"]
+
+# Формат сжатия -> функция открытия файла
+_OPENERS: Dict[str, Callable[[str, Mode], BufferedIOBase | IO[bytes]]] = {
+    "gzip": lambda path, mode: gzip.open(path, mode, compresslevel=6),
+    "bz2": lambda path, mode: bz2.open(path, mode),
+    "xz": lambda path, mode: lzma.open(path, mode),
+}
+if _zstd is not None:
+    _OPENERS["zstd"] = lambda path, mode: _zstd.open(path, mode)
+
+# Расширение файла -> формат сжатия
+EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".lzma": "xz", ".zst": "zstd"}
+# Сигнатура в начале файла -> формат сжатия
+MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+def detect(filepath: str) -> str | None:
+    """
+    Формат сжатия файла: по сигнатуре, если файл уже есть и не пуст, иначе по расширению.
+    :return: "gzip", "bz2", "xz", "zstd" или None для несжатого файла.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            head = f.read(6)
+    except FileNotFoundError:
+        head = b""
+    for magic, codec in MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    if head:
+        return None
+    return EXTENSIONS.get(os.path.splitext(filepath)[1].lower())
+
+
+def open_stream(filepath: str, mode: Mode = "rb", codec: str | None = None) -> BufferedIOBase | IO[bytes]:
+    """
+    Открыть файл в binary-режиме ("rb", "wb" или "ab") с прозрачным сжатием.
+    Данные сжимаются и распаковываются по мере чтения/записи, файл целиком в памяти не оказывается.
+    Дозапись в сжатый файл добавляет новый сжатый блок — при чтении блоки склеиваются.
+    :param codec: формат сжатия (по умолчанию определяется через detect()).
+    """
+    if codec is None:
+        codec = detect(filepath)
+    if codec is None:
+        return open(filepath, mode)
+    opener = _OPENERS.get(codec)
+    if opener is None:
+        raise ValueError(f"Формат сжатия {codec} недоступен: установите пакет zstandard")
+    return opener(filepath, mode)
+
+
+def available() -> list[str]:
+    """Форматы сжатия, доступные в текущем окружении."""
+    return list(_OPENERS)
+
+
+# Исключения, которыми распаковщики сообщают об оборванном или испорченном архиве
+READ_ERRORS: tuple[type[BaseException], ...] = (EOFError, gzip.BadGzipFile, lzma.LZMAError) + (
+    (_zstd.ZstdError,) if _zstd is not None and hasattr(_zstd, "ZstdError") else ()
+)
@@ -0,0 +1,281 @@
+"""
+Командная строка без интерактивного меню — для cron и скриптов.
+
+    python -m src.cli fetch python django -o data/vacancies.jsonl
+    python -m src.cli top 10 -i data/vacancies.jsonl
+    python -m src.cli search "python django OR golang" -i data/vacancies.jsonl | jq .name
+    python -m src.cli export -i data/vacancies.json -o data/archive.jsonl.gz
+    python -m src.cli stats -i data/vacancies.jsonl --keyword python --above 200000
+    python -m src.cli compact -i data/vacancies.jsonl
+    python -m src.cli clear -i data/vacancies.jsonl
+
+Результаты выводятся в stdout построчно в формате JSON Lines (одна вакансия — одна строка),
+служебные сводки — одним JSON-объектом. Модуль requests импортируется только командой fetch,
+поэтому команды над сохранённым файлом запускаются быстро.
+"""
+
+import argparse
+import json
+import os
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+from src import metrics
+from src.archive import detect
+from src.fileutils import (
+    IndexedVacancyFileHandler,
+    JSONLinesVacancyFileHandler,
+    JSONVacancyFileHandler,
+    SQLiteVacancyFileHandler,
+    VacancyFileHandler,
+    iter_concatenated_json,
+)
+from src.vacutils import Vacancy, top_n
+
+DEFAULT_STORE = "data/vacancies.jsonl"
+
+
+def open_store(path: str) -> VacancyFileHandler:
+    """Обработчик файла вакансий по расширению: .json — JSON, .db/.sqlite — SQLite, иначе JSON Lines."""
+    name = path.lower()
+    if detect(path) is not None:
+        # Расширение сжатия не говорит о формате данных — смотрим на расширение перед ним
+        name = os.path.splitext(name)[0]
+    if name.endswith(".json"):
+        return JSONVacancyFileHandler(path)
+    if name.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteVacancyFileHandler(path)
+    return JSONLinesVacancyFileHandler(path)
+
+
+def iter_records(handler: VacancyFileHandler) -> Iterator[Dict[str, Any]]:
+    """Записи файла по одной (JSON-файл из нескольких склеенных массивов тоже читается)."""
+    if isinstance(handler, JSONVacancyFileHandler):
+        return iter_concatenated_json(handler.filepath)
+    if isinstance(handler, (JSONLinesVacancyFileHandler, SQLiteVacancyFileHandler)):
+        return handler.iter_vacs()
+    return iter(handler.load_vacs())
+
+
+def iter_vacancies(records: Iterable[Dict[str, Any]], batch: int = 1000) -> Iterator[Vacancy]:
+    """Проверенные Vacancy из потока записей; записи разбираются пачками, чтобы не держать в памяти все."""
+    records = iter(records)
+    while chunk := list(islice(records, batch)):
+        yield from Vacancy.from_raw_many(chunk)
+
+
+def write_lines(records: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Вывести записи построчно (JSON Lines); возвращает их число."""
+    written = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+        written += 1
+    out.flush()
+    return written
+
+
+def write_summary(summary: Dict[str, Any], out: TextIO) -> None:
+    out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def cmd_fetch(args: argparse.Namespace, out: TextIO) -> int:
+    # requests нужен только здесь — остальные команды его не загружают
+    from src.API import HeadHunterAPI
+    from src.httpcache import ResponseCache
+
+    cache = ResponseCache(args.cache) if args.cache else None
+    api = HeadHunterAPI(max_workers=args.workers, rate_limit=args.rate_limit, cache=cache)
+    if args.sharded:
+        # Широкий запрос делится на окна по дате публикации, чтобы не упереться в предел в 2000 вакансий
+        for keyword in dict.fromkeys(args.keywords):
+            api.load_vacancies_sharded(keyword)
+    else:
+        api.load_vacancies_many(args.keywords)
+    records = [v.to_dict() for v in Vacancy.from_raw_many(api.vacancies)]
+
+    handler = open_store(args.output)
+    summary: Dict[str, Any] = {"fetched": len(records), "output": args.output}
+    # Повторный запуск не дублирует вакансии, уже сохранённые в файле
+    if isinstance(handler, SQLiteVacancyFileHandler):
+        before = handler.count()
+        handler.write_vacs(records)
+        summary["added"] = handler.count() - before
+    elif isinstance(handler, JSONLinesVacancyFileHandler) and handler.compression is None:
+        # Сверка с индексом ключей вместо чтения всего файла
+        summary["added"], summary["updated"] = IndexedVacancyFileHandler(args.output).upsert_vacs(records)
+    else:
+        # Сжатый архив и JSON-файл можно только дописать
+        handler.write_vacs(records)
+        summary["added"] = len(records)
+    write_summary(summary, out)
+    return 0
+
+
+def cmd_top(args: argparse.Namespace, out: TextIO) -> int:
+    vacancies = iter_vacancies(iter_records(open_store(args.input)))
+    write_lines((v.to_dict() for v in top_n(vacancies, args.n, key=args.key)), out)
+    return 0
+
+
+def cmd_search(args: argparse.Namespace, out: TextIO) -> int:
+    from src.searchutils import InvertedIndex
+
+    handler = open_store(args.input)
+    if type(handler) is JSONLinesVacancyFileHandler and handler.compression is None:
+        # Несжатый JSON Lines: индексы смещений и поиска сохраняются рядом с файлом и дополняются
+        with IndexedVacancyFileHandler(args.input).view() as view:
+            index = InvertedIndex.for_file(args.input, view)
+            write_lines((view.record(i) for i in index.search(args.query, args.limit)), out)
+        return 0
+
+    vacancies = list(iter_vacancies(iter_records(handler)))
+    index = InvertedIndex.from_vacancies(vacancies)
+    write_lines((vacancies[i].to_dict() for i in index.search(args.query, args.limit)), out)
+    return 0
+
+
+def cmd_export(args: argparse.Namespace, out: TextIO) -> int:
+    records = iter_records(open_store(args.input))
+    if args.output == "-":
+        write_lines(records, out)
+        return 0
+
+    target = open_store(args.output)
+    batch: List[Dict[str, Any]] = []
+    count = 0
+    if isinstance(target, JSONVacancyFileHandler):
+        # JSON-файл — один массив, поэтому пачками его не дописать
+        batch = list(records)
+        target.write_vacs(batch, indent=2)
+        count = len(batch)
+    else:
+        for record in records:
+            batch.append(record)
+            if len(batch) == 1000:
+                target.write_vacs(batch)
+                count += len(batch)
+                batch = []
+        target.write_vacs(batch)
+        count += len(batch)
+    write_summary({"exported": count, "output": args.output}, out)
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace, out: TextIO) -> int:
+    from src.stats import SalaryStats, salaries
+
+    handler = open_store(args.input)
+    if isinstance(handler, SQLiteVacancyFileHandler):
+        # Из базы читаются только колонки зарплаты
+        rows = handler.iter_salaries(args.keyword)
+    else:
+        rows = salaries(iter_records(handler), args.keyword)
+    stats = SalaryStats.from_salaries(rows, args.field)
+    summary: Dict[str, Any] = {
+        "field": args.field,
+        "currencies": stats.summary(args.percentiles, args.bins if args.bins > 0 else None),
+    }
+    if args.above is not None:
+        summary["above"] = {str(c): stats.count(c, above=args.above) for c in stats.values}
+    write_summary(summary, out)
+    return 0
+
+
+def cmd_compact(args: argparse.Namespace, out: TextIO) -> int:
+    handler = open_store(args.input)
+    if type(handler) is not JSONLinesVacancyFileHandler or handler.compression is not None:
+        raise ValueError("Сжимать можно только несжатый файл JSON Lines")
+    write_summary({"freed_bytes": IndexedVacancyFileHandler(args.input).compact(), "input": args.input}, out)
+    return 0
+
+
+def cmd_clear(args: argparse.Namespace, out: TextIO) -> int:
+    open_store(args.input).clear()
+    write_summary({"cleared": args.input}, out)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--metrics", metavar="PATH", help="сохранить метрики выполнения в JSON-файл")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="загрузить вакансии с hh.ru и сохранить в файл")
+    fetch.add_argument("keywords", nargs="+", help="ключевые слова поиска")
+    fetch.add_argument("-o", "--output", default=DEFAULT_STORE, help=f"файл вакансий (по умолчанию {DEFAULT_STORE})")
+    fetch.add_argument("--workers", type=int, default=4, help="сколько страниц загружать одновременно")
+    fetch.add_argument("--rate-limit", type=float, default=None, help="не больше стольких запросов в секунду")
+    fetch.add_argument("--cache", metavar="DIR", help="каталог дискового кеша ответов API")
+    fetch.add_argument("--sharded", action="store_true", help="загрузить больше 2000 вакансий на слово (по датам)")
+    fetch.set_defaults(func=cmd_fetch)
+
+    top = commands.add_parser("top", help="N вакансий с наибольшей зарплатой")
+    top.add_argument("n", type=int, help="сколько вакансий вывести")
+    top.add_argument("-i", "--input", default=DEFAULT_STORE, help="файл вакансий")
+    top.add_argument(
+        "--key", default="normalized", choices=["normalized", "to", "from", "mid"], help="по какой зарплате"
+    )
+    top.set_defaults(func=cmd_top)
+
+    search = commands.add_parser("search", help="поиск по названию и описанию")
+    search.add_argument("query", help='запрос: слова через пробел (AND), " OR ", слово* — по началу слова')
+    search.add_argument("-i", "--input", default=DEFAULT_STORE, help="файл вакансий")
+    search.add_argument("--limit", type=int, default=None, help="не больше стольких результатов")
+    search.set_defaults(func=cmd_search)
+
+    export = commands.add_parser("export", help="переписать вакансии в другой файл или в stdout (-)")
+    export.add_argument("-i", "--input", default=DEFAULT_STORE, help="файл вакансий")
+    export.add_argument("-o", "--output", default="-", help="файл назначения (формат по расширению) или -")
+    export.set_defaults(func=cmd_export)
+
+    stats = commands.add_parser("stats", help="распределение зарплат по валютам")
+    stats.add_argument("-i", "--input", default=DEFAULT_STORE, help="файл вакансий")
+    stats.add_argument("--keyword", help="только вакансии, где есть все эти слова")
+    stats.add_argument(
+        "--field", default="to", choices=["to", "from", "mid", "normalized"], help="какую зарплату считать"
+    )
+    stats.add_argument(
+        "--percentiles", type=float, nargs="+", default=[25, 50, 75, 90], help="какие перцентили вывести"
+    )
+    stats.add_argument("--bins", type=int, default=10, help="интервалов гистограммы (0 — без гистограммы)")
+    stats.add_argument("--above", type=float, help="посчитать вакансии с зарплатой не ниже этой")
+    stats.set_defaults(func=cmd_stats)
+
+    compact = commands.add_parser("compact", help="убрать из файла JSON Lines затёртые и устаревшие записи")
+    compact.add_argument("-i", "--input", default=DEFAULT_STORE, help="файл вакансий")
+    compact.set_defaults(func=cmd_compact)
+
+    clear = commands.add_parser("clear", help="удалить вакансии из файла")
+    clear.add_argument("-i", "--input", default=DEFAULT_STORE, help="файл вакансий")
+    clear.set_defaults(func=cmd_clear)
+    return parser
+
+
+def main(argv: List[str] | None = None, out: TextIO | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    out = sys.stdout if out is None else out
+    collected = metrics.enable() if args.metrics else None
+    try:
+        code: int = args.func(args, out)
+        return code
+    except BrokenPipeError:
+        # Читатель закрыл канал (например, "| head") — это не ошибка; остаток вывода отбрасываем
+        if out is sys.stdout:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError, ConnectionError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if collected is not None:
+            collected.dump(args.metrics)
+            metrics.disable()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
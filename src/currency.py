@@ -0,0 +1,71 @@
+import json
+import os
+from typing import Mapping
+
+# Курсы в формате справочника hh.ru (/dictionaries): сколько единиц валюты дают за 1 рубль.
+# Используются, если файла с курсами нет.
+FALLBACK_RATES: dict[str, float] = {
+    "RUR": 1.0,
+    "USD": 0.0125,
+    "EUR": 0.0108,
+    "KZT": 6.25,
+    "UZS": 156.0,
+    "BYR": 0.037,
+    "KGS": 1.09,
+    "AZN": 0.0213,
+    "GEL": 0.034,
+}
+
+
+class CurrencyRates:
+    """
+    Таблица курсов для приведения зарплат к рублям.
+    Курсы берутся из локального JSON-файла: {"USD": 0.0125, ...} или ответ hh.ru /dictionaries
+    ({"currency": [{"code": "USD", "rate": 0.0125}, ...]}); сеть не нужна.
+    """
+
+    def __init__(self, rates: Mapping[str, float] | None = None, path: str | None = None) -> None:
+        self.path = path
+        self.rates: dict[str, float] = dict(FALLBACK_RATES if rates is None else rates)
+
+    @classmethod
+    def load(cls, path: str) -> "CurrencyRates":
+        rates = cls(path=path)
+        rates.refresh()
+        return rates
+
+    def refresh(self) -> None:
+        """Перечитать курсы из файла (если он задан и существует)."""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("currency"), list):
+            data = {item["code"]: item["rate"] for item in data["currency"]}
+        self.rates = {code: float(rate) for code, rate in data.items()}
+
+    def save(self, path: str | None = None) -> None:
+        with open(path or self.path or "data/rates.json", "w", encoding="utf-8") as f:
+            json.dump(self.rates, f, ensure_ascii=False, indent=2)
+
+    def to_rub(self, amount: float, currency: str | None) -> float:
+        """Сумма в рублях; для неизвестной валюты сумма возвращается как есть."""
+        rate = self.rates.get(currency) if currency is not None else None
+        return amount / rate if rate else float(amount)
+
+
+_default: CurrencyRates | None = None
+
+
+def default_rates() -> CurrencyRates:
+    """Курсы по умолчанию: data/rates.json, при его отсутствии — FALLBACK_RATES."""
+    global _default
+    if _default is None:
+        _default = CurrencyRates.load("data/rates.json")
+    return _default
+
+
+def set_default_rates(rates: CurrencyRates) -> None:
+    """Заменить курсы по умолчанию (влияет на вакансии, созданные после вызова)."""
+    global _default
+    _default = rates
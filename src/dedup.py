@@ -0,0 +1,163 @@
+import hashlib
+import operator
+from array import array
+from typing import Iterable, Sequence
+
+from src.searchutils import tokenize, vacancy_text
+from src.vacutils import Vacancy
+
+
+def shingles(text: str | None, size: int = 3) -> set[str]:
+    """Последовательности по size слов подряд (короткий текст — одна последовательность из всех слов)."""
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _bands(num_perm: int, threshold: float) -> int:
+    """
+    Число полос LSH для сигнатуры из num_perm значений: порог срабатывания (1 / bands) ** (1 / rows)
+    выбирается ближайшим к threshold.
+    """
+    options = [b for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda b: abs((1 / b) ** (b / num_perm) - threshold))
+
+
+class NearDuplicateIndex:
+    """
+    Поиск почти одинаковых вакансий (одно объявление, выложенное заново с другим URL и правками текста).
+    Текст вакансии (название и snippet) разбивается на последовательности слов, по ним строится
+    MinHash-сигнатура, а сигнатуры раскладываются по корзинам LSH: сравниваются только вакансии,
+    попавшие хотя бы в одну общую корзину, поэтому время растёт почти линейно, а не квадратично.
+    Сходство — оценка коэффициента Жаккара по сигнатурам. Вакансии добавляются по одной, группы
+    почти одинаковых вакансий поддерживаются сразу (система непересекающихся множеств).
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, shingle_size: int = 3) -> None:
+        """
+        :param threshold: минимальное сходство (0..1), при котором вакансии считаются копиями.
+        :param num_perm: длина сигнатуры; больше — точнее оценка сходства, но медленнее.
+        :param shingle_size: сколько слов подряд в одной последовательности.
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("Порог сходства должен быть в (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        bands = _bands(num_perm, threshold)
+        # Ширина полосы в байтах: значения сигнатуры 32-битные
+        self.__band = num_perm // bands * 4
+        self.__buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+        self.signatures: list[array | None] = []
+        self.__parent: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def signature(self, text: str | None) -> array | None:
+        """
+        MinHash-сигнатура текста; None, если в тексте нет слов.
+        Для каждой последовательности слов shake_128 даёт сразу num_perm независимых 32-битных хешей,
+        значение сигнатуры — минимум по последовательностям.
+        """
+        hashes = []
+        for shingle in shingles(text, self.shingle_size):
+            values = array("I")
+            values.frombytes(hashlib.shake_128(shingle.encode("utf-8")).digest(self.num_perm * 4))
+            hashes.append(values)
+        if not hashes:
+            return None
+        return array("I", map(min, zip(*hashes)))
+
+    def similarity(self, a: Sequence[int], b: Sequence[int]) -> float:
+        """Оценка коэффициента Жаккара: доля совпавших значений сигнатур."""
+        matched: int = sum(map(operator.eq, a, b))
+        return matched / self.num_perm
+
+    def __candidates(self, signature: array) -> set[int]:
+        raw = signature.tobytes()
+        found: set[int] = set()
+        for band, buckets in enumerate(self.__buckets):
+            bucket = buckets.get(raw[band * self.__band : (band + 1) * self.__band])
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def query(self, vacancy: Vacancy) -> list[int]:
+        """Номера уже добавленных вакансий, похожих на vacancy не меньше чем на threshold."""
+        signature = self.signature(vacancy_text(vacancy))
+        if signature is None:
+            return []
+        return self.__similar(signature)
+
+    def __similar(self, signature: array) -> list[int]:
+        signatures = self.signatures
+        return sorted(
+            i
+            for i in self.__candidates(signature)
+            if self.similarity(signature, signatures[i]) >= self.threshold  # type: ignore[arg-type]
+        )
+
+    def add(self, vacancy: Vacancy) -> int:
+        """Добавить вакансию и объединить её в группу с похожими; возвращает её номер."""
+        i = len(self.signatures)
+        signature = self.signature(vacancy_text(vacancy))
+        self.signatures.append(signature)
+        self.__parent.append(i)
+        # Вакансия без текста ни на что не похожа
+        if signature is None:
+            return i
+        for j in self.__similar(signature):
+            self.__union(i, j)
+        raw = signature.tobytes()
+        for band, buckets in enumerate(self.__buckets):
+            buckets.setdefault(raw[band * self.__band : (band + 1) * self.__band], []).append(i)
+        return i
+
+    def add_many(self, vacancies: Iterable[Vacancy]) -> None:
+        for vacancy in vacancies:
+            self.add(vacancy)
+
+    def __find(self, i: int) -> int:
+        parent = self.__parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def __union(self, i: int, j: int) -> None:
+        a, b = self.__find(i), self.__find(j)
+        if a != b:
+            # Корень группы — вакансия, добавленная раньше всех
+            self.__parent[max(a, b)] = min(a, b)
+
+    def cluster_of(self, i: int) -> int:
+        """Номер первой добавленной вакансии из группы вакансии i."""
+        return self.__find(i)
+
+    def clusters(self) -> list[list[int]]:
+        """Группы номеров почти одинаковых вакансий (из двух и больше), в порядке добавления."""
+        groups: dict[int, list[int]] = {}
+        for i in range(len(self.__parent)):
+            groups.setdefault(self.__find(i), []).append(i)
+        return [group for group in groups.values() if len(group) > 1]
+
+
+def collapse(vacancies: Sequence[Vacancy], threshold: float = 0.8, keep: str = "first") -> list[Vacancy]:
+    """
+    Оставить по одной вакансии из каждой группы почти одинаковых (например, перед сохранением в файл).
+    :param keep: "first" — первую в списке, "last" — последнюю (самую свежую публикацию, если список
+                 упорядочен по дате, например order_by="publication_time"); оставшиеся вакансии идут
+                 в исходном порядке.
+    """
+    if keep not in ("first", "last"):
+        raise ValueError(f"Неизвестный способ выбора: {keep}")
+    index = NearDuplicateIndex(threshold)
+    index.add_many(vacancies)
+    chosen: dict[int, int] = {}
+    for i in range(len(vacancies)):
+        root = index.cluster_of(i)
+        if keep == "last" or root not in chosen:
+            chosen[root] = i
+    return [vacancies[i] for i in sorted(chosen.values())]
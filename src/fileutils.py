@@ -1,6 +1,17 @@
+import hashlib
 import json
+import mmap
+import os
+import sqlite3
+import struct
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from array import array
+from contextlib import closing
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, overload
+
+from src import metrics
+from src.archive import READ_ERRORS, detect, open_stream
+from src.vacutils import Vacancy, vacancy_key
 
 
 class VacancyFileHandler(ABC):
@@ -34,6 +45,7 @@ class VacancyFileHandler(ABC):
 class JSONVacancyFileHandler(VacancyFileHandler):
     """
     Класс, для работы в формате JSON.
+    Файл с расширением .gz/.bz2/.xz/.zst (или уже сжатый) читается и пишется со сжатием.
     """
 
     def __init__(self, filepath: str = "data/vacancies.json") -> None:
@@ -44,13 +56,814 @@ class JSONVacancyFileHandler(VacancyFileHandler):
         return self.__filepath
 
     def write_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> None:
-        with open(self.__filepath, "a", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, **kwargs)
+        with metrics.timer("file.write"):
+            raw = json.dumps(data, ensure_ascii=False, **kwargs).encode("utf-8")
+            with open_stream(self.__filepath, "ab") as f:
+                f.write(raw)
+        metrics.count("file.records_written", len(data))
+        metrics.count("file.bytes_written", len(raw))
 
     def load_vacs(self, **kwargs: Any) -> Any:
-        with open(self.__filepath, "r", encoding="utf-8") as f:
-            return json.load(f, **kwargs)
+        with metrics.timer("file.read"), open_stream(self.__filepath, "rb") as f:
+            data = json.load(f, **kwargs)
+        metrics.count("file.records_read", len(data))
+        return data
+
+    def clear(self) -> None:
+        with open_stream(self.__filepath, "wb") as f:
+            f.write(b"[]")
+
+
+class JSONLinesVacancyFileHandler(VacancyFileHandler):
+    """
+    Класс для работы в формате JSON Lines: одна вакансия — одна строка.
+    Запись дописывает только новые строки, чтение идёт построчно.
+    Сжатые файлы (.gz/.bz2/.xz/.zst или по сигнатуре) читаются и дописываются потоково;
+    обновлять их на месте (upsert_vacs) нельзя.
+    """
+
+    def __init__(self, filepath: str = "data/vacancies.jsonl") -> None:
+        self.__filepath = filepath
+
+    @property
+    def filepath(self) -> str:
+        return self.__filepath
+
+    def write_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> None:
+        self._append(data, **kwargs)
+
+    @property
+    def compression(self) -> str | None:
+        """Формат сжатия файла (None — несжатый), см. archive.detect."""
+        return detect(self.__filepath)
+
+    def _append(self, data: List[Dict[str, Any]], **kwargs: Any) -> List[Tuple[int, int]]:
+        """
+        Дописать записи в конец файла.
+        :return: смещение и длина (в байтах, с переводом строки) каждой записанной строки
+                 (для сжатого файла — смещения внутри дописанного блока).
+        """
+        return self._append_lines(self._encode(record, **kwargs) for record in data)
+
+    def _append_lines(self, lines: Iterable[bytes]) -> List[Tuple[int, int]]:
+        """Дописать готовые строки (см. _encode) в конец файла; результат — как у _append."""
+        self._repair_tail()
+        spans = []
+        with metrics.timer("file.write"), open_stream(self.__filepath, "ab") as f:
+            start = offset = f.tell()
+            for line in lines:
+                f.write(line)
+                spans.append((offset, len(line)))
+                offset += len(line)
+        metrics.count("file.records_written", len(spans))
+        metrics.count("file.bytes_written", offset - start)
+        return spans
+
+    @staticmethod
+    def _encode(record: Dict[str, Any], **kwargs: Any) -> bytes:
+        """Запись -> строка файла (с переводом строки)."""
+        # Перенос строк внутри записи сломал бы формат, поэтому indent игнорируется
+        kwargs.pop("indent", None)
+        return (json.dumps(record, ensure_ascii=False, **kwargs) + "\n").encode("utf-8")
+
+    def upsert_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> Tuple[int, int]:
+        """
+        Записать вакансии без дублей по ключу (см. vacancy_key): новые дописываются в конец,
+        у изменившихся (или записанных несколько раз) старые строки затираются пробелами
+        (пустые строки читатели пропускают), а новая версия дописывается. Неизменившиеся записи не трогаются.
+        :return: сколько записей добавлено и сколько обновлено.
+        """
+        if self.compression is not None:
+            raise ValueError("Сжатый файл нельзя обновлять на месте")
+        self._repair_tail()
+        # Ключ -> (смещение, длина, хеш строки) всех версий записи в файле (write_vacs мог записать повторы)
+        stored: Dict[str, List[Tuple[int, int, bytes]]] = {}
+        try:
+            with open(self.__filepath, "rb") as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        key = vacancy_key(json.loads(line))
+                        if key is not None:
+                            stored.setdefault(key, []).append((offset, len(line), _digest(line)))
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+
+        changed, batch = self._dedupe(data)
+        added, updated = len(changed), 0
+        stale: List[Tuple[int, int]] = []
+        for key, record in batch.items():
+            found = stored.get(key)
+            if found:
+                if len(found) == 1 and found[0][2] == _digest(self._encode(record, **kwargs)):
+                    continue
+                stale.extend((offset, length) for offset, length, _ in found)
+                updated += 1
+            else:
+                added += 1
+            changed.append(record)
+
+        if stale:
+            self._blank(stale)
+            # Размер файла не изменился, поэтому индексы рядом с ним не заметили бы затёртых строк
+            self._drop_sidecars(".idx", ".fts.json")
+        self._append(changed, **kwargs)
+        return added, updated
+
+    @staticmethod
+    def _dedupe(data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Разделить пачку на записи без ключа (они просто дописываются) и записи по ключу;
+        внутри одной пачки побеждает последняя версия записи.
+        """
+        keyless: List[Dict[str, Any]] = []
+        batch: Dict[str, Dict[str, Any]] = {}
+        for record in data:
+            key = vacancy_key(record)
+            if key is None:
+                keyless.append(record)
+            else:
+                batch.pop(key, None)
+                batch[key] = record
+        return keyless, batch
+
+    def _drop_sidecars(self, *suffixes: str) -> None:
+        """
+        Удалить сохранённые рядом с файлом индексы (<filepath><suffix>): индекс смещений (.idx)
+        и поисковый индекс (.fts.json) ссылаются на строки файла и при следующем обращении строятся заново.
+        """
+        for suffix in suffixes:
+            try:
+                os.remove(self.__filepath + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _blank(self, spans: List[Tuple[int, int]]) -> None:
+        """Затереть строки пробелами, сохранив длину файла и перевод строки."""
+        if not spans:
+            return
+        with open(self.__filepath, "r+b") as f:
+            for offset, length in spans:
+                f.seek(offset)
+                f.write(b" " * (length - 1))
+
+    def iter_vacs(self, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Читать вакансии по одной, не загружая файл целиком.
+        Оборванная последняя строка (например, после сбоя при записи) пропускается,
+        как и оборванный конец сжатого файла.
+        """
+        with open_stream(self.__filepath, "rb") as f:
+            lines = iter(f)
+            while True:
+                try:
+                    line = next(lines)
+                except StopIteration:
+                    return
+                except READ_ERRORS:
+                    return
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line, **kwargs)
+                except json.JSONDecodeError:
+                    # Испорченная строка в середине файла — это не обрыв записи
+                    if line.endswith(b"\n"):
+                        raise
+                    return
+
+    def load_vacs(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        with metrics.timer("file.read"):
+            data = list(self.iter_vacs(**kwargs))
+        metrics.count("file.records_read", len(data))
+        return data
 
     def clear(self) -> None:
-        with open(self.__filepath, "w", encoding="utf-8") as f:
-            json.dump([], f)
+        with open_stream(self.__filepath, "wb"):
+            pass
+        self._drop_sidecars(".idx", ".fts.json")
+
+    def _repair_tail(self) -> None:
+        """
+        Подготовить файл к дозаписи: если последняя строка не завершена переводом строки,
+        дописать его (строка цела) или отрезать оборванную строку.
+        Сжатый файл не трогается: дописанный блок начнётся с новой строки сам по себе.
+        """
+        if self.compression is not None:
+            return
+        try:
+            f = open(self.__filepath, "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Ищем начало последней строки, читая файл с конца блоками
+            start = size
+            while start > 0:
+                step = min(64 * 1024, start)
+                f.seek(start - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    start = start - step + newline + 1
+                    break
+                start -= step
+
+            f.seek(start)
+            try:
+                json.loads(f.read())
+            except ValueError:
+                f.truncate(start)
+            else:
+                f.write(b"\n")
+
+
+def _digest(line: bytes) -> bytes:
+    return hashlib.blake2b(line, digest_size=16).digest()
+
+
+# Сколько байт с начала и с конца файла входит в его отпечаток
+FINGERPRINT_WINDOW = 4096
+
+
+def fingerprint(filepath: str, size: int) -> bytes:
+    """
+    Отпечаток первых size байт файла: хеш размера, начала и конца этой части (по FINGERPRINT_WINDOW байт).
+    Индексы, сохранённые рядом с файлом, сверяют его, чтобы заметить перезапись файла данными
+    того же или большего размера, не читая файл целиком.
+    """
+    h = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+    if size:
+        with open(filepath, "rb") as f:
+            h.update(f.read(min(size, FINGERPRINT_WINDOW)))
+            f.seek(max(0, size - FINGERPRINT_WINDOW))
+            h.update(f.read(size - f.tell()))
+    return h.digest()
+
+
+class OffsetIndex:
+    """
+    Индекс JSON Lines-файла: смещение, длина, ключ и хеш каждой живой записи.
+    Хранится в отдельном файле рядом с данными и дополняется по мере роста файла.
+    Затёртые (пустые) строки в индекс не входят, их суммарный размер хранится в garbage.
+    """
+
+    MAGIC = b"VACIDX3\n"
+    __header = struct.Struct("<QQQ16s")
+    DIGEST_SIZE = 16
+
+    def __init__(self) -> None:
+        self.offsets = array("Q")
+        self.lengths = array("Q")
+        self.keys: List[str | None] = []
+        # Хеши строк (по DIGEST_SIZE байт) — чтобы узнать, изменилась ли запись, не читая файл
+        self.digests = bytearray()
+        # Сколько байт файла данных уже проиндексировано
+        self.size = 0
+        # Сколько байт файла занимают затёртые строки (освобождаются при сжатии файла)
+        self.garbage = 0
+        # Отпечаток проиндексированной части файла (см. fingerprint) — по нему видно, что файл перезаписан
+        self.fingerprint = bytes(self.DIGEST_SIZE)
+        self.__positions: Dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def add(self, offset: int, length: int, key: str | None, digest: bytes = bytes(DIGEST_SIZE)) -> None:
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.keys.append(key)
+        self.digests += digest
+        if self.__positions is not None and key is not None:
+            self.__positions[key] = len(self.keys) - 1
+
+    def digest(self, i: int) -> bytes:
+        return bytes(self.digests[i * self.DIGEST_SIZE : (i + 1) * self.DIGEST_SIZE])
+
+    def position(self, key: str) -> int | None:
+        """Номер последней записи с таким ключом."""
+        if self.__positions is None:
+            self.__positions = {k: i for i, k in enumerate(self.keys) if k is not None}
+        return self.__positions.get(key)
+
+    def remove(self, positions: set[int]) -> None:
+        """Убрать записи из индекса (номера остальных записей сдвигаются)."""
+        if not positions:
+            return
+        keep = [i for i in range(len(self)) if i not in positions]
+        width = self.DIGEST_SIZE
+        self.offsets = array("Q", (self.offsets[i] for i in keep))
+        self.lengths = array("Q", (self.lengths[i] for i in keep))
+        self.keys = [self.keys[i] for i in keep]
+        self.digests = bytearray(b"".join(self.digests[i * width : (i + 1) * width] for i in keep))
+        self.__positions = None
+
+    def scan(self, filepath: str) -> None:
+        """Проиндексировать записи файла, появившиеся после self.size."""
+        with open(filepath, "rb") as f:
+            f.seek(self.size)
+            offset = self.size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Незавершённая последняя строка: дочитаем, когда её допишут или отрежут
+                    break
+                if line.strip():
+                    self.add(offset, len(line), vacancy_key(json.loads(line)), _digest(line))
+                else:
+                    self.garbage += len(line)
+                offset += len(line)
+        self.size = offset
+
+    def save(self, path: str) -> None:
+        """Сохранить индекс (атомарно: через временный файл)."""
+        keys = "\n".join(key or "" for key in self.keys).encode("utf-8")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self.__header.pack(self.size, len(self), self.garbage, self.fingerprint))
+            f.write(self.offsets.tobytes())
+            f.write(self.lengths.tobytes())
+            f.write(self.digests)
+            f.write(keys)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "OffsetIndex | None":
+        """Прочитать индекс; None, если файла нет, он повреждён или записан в старом формате."""
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        head = len(cls.MAGIC) + cls.__header.size
+        if not raw.startswith(cls.MAGIC) or len(raw) < head:
+            return None
+        size, count, garbage, stamp = cls.__header.unpack_from(raw, len(cls.MAGIC))
+        width = array("Q").itemsize * count
+        digests = cls.DIGEST_SIZE * count
+        if len(raw) < head + 2 * width + digests:
+            return None
+
+        index = cls()
+        index.size = size
+        index.garbage = garbage
+        index.fingerprint = stamp
+        index.offsets.frombytes(raw[head : head + width])
+        index.lengths.frombytes(raw[head + width : head + 2 * width])
+        index.digests = bytearray(raw[head + 2 * width : head + 2 * width + digests])
+        keys = raw[head + 2 * width + digests :].decode("utf-8").split("\n") if count else []
+        if len(keys) != count:
+            return None
+        index.keys = [key or None for key in keys]
+        return index
+
+
+class VacancyView(Sequence[Vacancy]):
+    """
+    Ленивое представление файла вакансий поверх mmap.
+    Запись декодируется и проверяется (создаётся Vacancy) только при обращении к ней.
+    """
+
+    def __init__(self, filepath: str, index: OffsetIndex) -> None:
+        self.__index = index
+        self.__file = open(filepath, "rb")
+        # Пустой файл отобразить в память нельзя — он и не нужен
+        self.__mm = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) if index.size else None
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    @overload
+    def __getitem__(self, i: int) -> Vacancy:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Vacancy]:
+        ...
+
+    def __getitem__(self, i: int | slice) -> Vacancy | List[Vacancy]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        d = self.record(i)
+        return Vacancy(d["name"], d["url"], d.get("salary_range"), d.get("snippet", {}))
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Сырая запись по номеру, без создания Vacancy."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self) or self.__mm is None:
+            raise IndexError("номер записи вне диапазона")
+        start = self.__index.offsets[i]
+        record: Dict[str, Any] = json.loads(self.__mm[start : start + self.__index.lengths[i]])
+        return record
+
+    def get(self, key: str) -> Vacancy | None:
+        """Вакансия по ключу (id или ссылке), см. vacancy_key."""
+        i = self.__index.position(key)
+        return None if i is None else self[i]
+
+    def close(self) -> None:
+        if self.__mm is not None:
+            self.__mm.close()
+        self.__file.close()
+
+    def __enter__(self) -> "VacancyView":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class IndexedVacancyFileHandler(JSONLinesVacancyFileHandler):
+    """
+    Класс для работы в формате JSON Lines с индексом смещений в файле <filepath>.idx.
+    Позволяет открыть файл как ленивую последовательность вакансий (view)
+    и получать записи по номеру или ключу без чтения всего файла.
+
+    upsert_vacs сверяет записи с индексом (ключ и хеш строки), не читая файл: дописываются
+    только новые и изменившиеся записи, старые версии затираются пробелами. Место,
+    занятое затёртыми строками, освобождает compact().
+    """
+
+    def __init__(self, filepath: str = "data/vacancies.jsonl") -> None:
+        super().__init__(filepath)
+        if self.compression is not None:
+            raise ValueError("Индекс смещений строится только для несжатого файла")
+        self.__index_path = filepath + ".idx"
+
+    @property
+    def index_path(self) -> str:
+        return self.__index_path
+
+    def index(self) -> OffsetIndex:
+        """Индекс, согласованный с текущим содержимым файла (дополняется и сохраняется при необходимости)."""
+        index = OffsetIndex.load(self.__index_path)
+        try:
+            size = os.path.getsize(self.filepath)
+        except FileNotFoundError:
+            size = 0
+        # Файл укорочен или перезаписан (отпечаток не совпал) — старый индекс не годится
+        if index is None or index.size > size or index.fingerprint != fingerprint(self.filepath, index.size):
+            index = OffsetIndex()
+        if index.size < size:
+            index.scan(self.filepath)
+            self.__save(index)
+        return index
+
+    def __save(self, index: OffsetIndex) -> None:
+        """Сохранить индекс вместе с отпечатком текущего содержимого файла."""
+        index.fingerprint = fingerprint(self.filepath, index.size)
+        index.save(self.__index_path)
+
+    def write_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> None:
+        # Хвост чиним до построения индекса, чтобы строка, завершённая при починке, попала в индекс
+        self._repair_tail()
+        index = self.index()
+        lines = [self._encode(record, **kwargs) for record in data]
+        for record, line, (offset, length) in zip(data, lines, self._append_lines(lines)):
+            index.add(offset, length, vacancy_key(record), _digest(line))
+            index.size = offset + length
+        self.__save(index)
+
+    def upsert_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> Tuple[int, int]:
+        """
+        Записать вакансии без дублей по ключу (см. JSONLinesVacancyFileHandler.upsert_vacs),
+        сверяясь с индексом вместо чтения файла.
+        :return: сколько записей добавлено и сколько обновлено.
+        """
+        self._repair_tail()
+        index = self.index()
+        keyless, batch = self._dedupe(data)
+        # Ключ -> номера всех его записей в индексе (write_vacs мог записать повторы)
+        occurrences: Dict[str, List[int]] = {}
+        for i, key in enumerate(index.keys):
+            if key is not None:
+                occurrences.setdefault(key, []).append(i)
+
+        lines = [self._encode(record, **kwargs) for record in keyless]
+        keys: List[str | None] = [None] * len(lines)
+        stale: set[int] = set()
+        added, updated = len(lines), 0
+        for key, record in batch.items():
+            line = self._encode(record, **kwargs)
+            found = occurrences.get(key)
+            if found:
+                if len(found) == 1 and index.digest(found[0]) == _digest(line):
+                    continue
+                stale.update(found)
+                updated += 1
+            else:
+                added += 1
+            lines.append(line)
+            keys.append(key)
+
+        if stale:
+            self._blank([(index.offsets[i], index.lengths[i]) for i in sorted(stale)])
+            index.garbage += sum(index.lengths[i] for i in stale)
+            index.remove(stale)
+            # Номера записей сдвинулись — сохранённый поисковый индекс больше не годится
+            self._drop_sidecars(".fts.json")
+        for line, key, (offset, length) in zip(lines, keys, self._append_lines(lines)):
+            index.add(offset, length, key, _digest(line))
+            index.size = offset + length
+        self.__save(index)
+        return added, updated
+
+    def compact(self) -> int:
+        """
+        Переписать файл без затёртых строк и старых повторов записей (остаётся последняя версия
+        по каждому ключу). Новый файл пишется во временный и атомарно заменяет старый.
+        :return: сколько байт освобождено.
+        """
+        self._repair_tail()
+        index = self.index()
+        last: Dict[str, int] = {}
+        for i, key in enumerate(index.keys):
+            if key is not None:
+                last[key] = i
+        keep = [i for i, key in enumerate(index.keys) if key is None or last[key] == i]
+        if len(keep) == len(index) and not index.garbage:
+            return 0
+
+        compacted = OffsetIndex()
+        tmp = self.filepath + ".tmp"
+        with open(self.filepath, "rb") as src, open(tmp, "wb") as dst:
+            for i in keep:
+                src.seek(index.offsets[i])
+                line = src.read(index.lengths[i])
+                compacted.add(dst.tell(), len(line), index.keys[i], index.digest(i))
+                dst.write(line)
+            compacted.size = dst.tell()
+            dst.flush()
+            os.fsync(dst.fileno())
+        old_size = os.path.getsize(self.filepath)
+        os.replace(tmp, self.filepath)
+        # Если упадём до сохранения индекса, он не совпадёт по размеру с файлом и будет построен заново
+        self.__save(compacted)
+        self._drop_sidecars(".fts.json")
+        return old_size - compacted.size
+
+    def view(self) -> VacancyView:
+        """Открыть файл как ленивую последовательность Vacancy (закрыть через close() или with)."""
+        index = self.index()
+        if not os.path.exists(self.filepath):
+            self.clear()
+        return VacancyView(self.filepath, index)
+
+    def clear(self) -> None:
+        super().clear()
+        self.__save(OffsetIndex())
+
+
+class SQLiteVacancyFileHandler(VacancyFileHandler):
+    """
+    Класс для хранения вакансий в SQLite: индексы по зарплате и валюте,
+    полнотекстовый поиск (FTS5) по названию и snippet. Фильтры load_vacs выполняются в SQL.
+    """
+
+    __schema = """
+        CREATE TABLE IF NOT EXISTS vacancies (
+            id INTEGER PRIMARY KEY,
+            key TEXT UNIQUE,
+            name TEXT NOT NULL,
+            url TEXT NOT NULL,
+            currency TEXT,
+            salary_from INTEGER NOT NULL,
+            salary_to INTEGER NOT NULL,
+            requirement TEXT,
+            responsibility TEXT,
+            snippet TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS vacancies_salary_to ON vacancies (salary_to);
+        CREATE INDEX IF NOT EXISTS vacancies_salary_from ON vacancies (salary_from);
+        CREATE INDEX IF NOT EXISTS vacancies_currency ON vacancies (currency, salary_to);
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5 (name, requirement, responsibility);
+    """
+    # Разметку подсветки hh.ru в полнотекстовый индекс не кладём
+    __fts_text = "replace(replace({}, '<highlighttext>', ''), '</highlighttext>', '')"
+    # Новые строки попадают в полнотекстовый индекс одним запросом в write_vacs (это вдвое быстрее триггера)
+    __fts_insert = """
+        INSERT INTO vacancies_fts (rowid, name, requirement, responsibility)
+        SELECT id, {name}, {requirement}, {responsibility} FROM vacancies WHERE id > ?
+    """
+    __triggers = """
+        CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+            DELETE FROM vacancies_fts WHERE rowid = old.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE ON vacancies BEGIN
+            DELETE FROM vacancies_fts WHERE rowid = old.id;
+            INSERT INTO vacancies_fts (rowid, name, requirement, responsibility)
+            VALUES (new.id, {name}, {requirement}, {responsibility});
+        END;
+    """
+    __upsert = """
+        INSERT INTO vacancies (key, name, url, currency, salary_from, salary_to, requirement, responsibility, snippet)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (key) DO UPDATE SET
+            name = excluded.name, url = excluded.url, currency = excluded.currency,
+            salary_from = excluded.salary_from, salary_to = excluded.salary_to,
+            requirement = excluded.requirement, responsibility = excluded.responsibility,
+            snippet = excluded.snippet
+        WHERE (name, url, currency, salary_from, salary_to, snippet) IS NOT
+              (excluded.name, excluded.url, excluded.currency, excluded.salary_from, excluded.salary_to,
+               excluded.snippet)
+    """
+    __order_columns = {"salary_to": "salary_to", "salary_from": "salary_from", "id": "id"}
+
+    def __init__(self, filepath: str = "data/vacancies.db") -> None:
+        self.__filepath = filepath
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(self.__schema)
+            columns = {c: self.__fts_text.format("new." + c) for c in ("name", "requirement", "responsibility")}
+            conn.executescript(self.__triggers.format(**columns))
+        self.__fts_insert = self.__fts_insert.format(
+            **{c: self.__fts_text.format(c) for c in ("name", "requirement", "responsibility")}
+        )
+
+    @property
+    def filepath(self) -> str:
+        return self.__filepath
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.__filepath)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -65536")
+        return conn
+
+    @staticmethod
+    def __row(record: Dict[str, Any]) -> tuple:
+        salary = record.get("salary_range") or record.get("salary") or {}
+        frm = salary.get("from") or 0
+        to = max(salary.get("to") or 0, frm)
+        snippet = record.get("snippet") or {}
+        return (
+            vacancy_key(record),
+            record["name"],
+            record.get("alternate_url") or record["url"],
+            salary.get("currency"),
+            frm,
+            to,
+            snippet.get("requirement"),
+            snippet.get("responsibility"),
+            json.dumps(snippet, ensure_ascii=False),
+        )
+
+    def write_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> None:
+        """
+        Записать вакансии одной транзакцией. Вакансия с уже известным ключом обновляется, а не дублируется
+        (внутри одной пачки побеждает последняя версия).
+        """
+        rows: Dict[Any, tuple] = {}
+        for i, record in enumerate(data):
+            row = self.__row(record)
+            key = row[0] if row[0] is not None else i
+            rows.pop(key, None)
+            rows[key] = row
+        with closing(self._connect()) as conn, conn:
+            last_id = conn.execute("SELECT coalesce(max(id), 0) FROM vacancies").fetchone()[0]
+            conn.executemany(self.__upsert, rows.values())
+            conn.execute(self.__fts_insert, (last_id,))
+
+    def iter_vacs(
+        self,
+        min_salary: int | None = None,
+        max_salary: int | None = None,
+        currency: str | None = None,
+        keyword: str | None = None,
+        limit: int | None = None,
+        order_by: str | None = None,
+        descending: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Читать вакансии, подходящие под условия; фильтрация, сортировка и limit выполняются в SQLite.
+        :param min_salary: верхняя граница зарплаты не меньше этого значения.
+        :param max_salary: верхняя граница зарплаты не больше этого значения.
+        :param currency: код валюты (например, "RUR").
+        :param keyword: слова, которые все должны встретиться в названии или snippet.
+        :param limit: не больше стольких записей.
+        :param order_by: "salary_to", "salary_from" или "id" (по умолчанию — порядок добавления).
+        :param descending: сортировать по убыванию.
+        """
+        where: List[str] = []
+        args: List[Any] = []
+        if min_salary is not None:
+            where.append("salary_to >= ?")
+            args.append(min_salary)
+        if max_salary is not None:
+            where.append("salary_to <= ?")
+            args.append(max_salary)
+        if currency is not None:
+            where.append("currency = ?")
+            args.append(currency)
+        if keyword:
+            where.append(self.__match)
+            args.append(self.__terms(keyword))
+
+        sql = "SELECT name, url, currency, salary_from, salary_to, snippet FROM vacancies"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        column = self.__order_columns.get(order_by or "id")
+        if column is None:
+            raise ValueError(f"Неизвестный ключ сортировки: {order_by}")
+        direction = "DESC" if descending and order_by else "ASC"
+        sql += f" ORDER BY {column} {direction}, id ASC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+
+        with closing(self._connect()) as conn:
+            for name, url, cur, frm, to, snippet in conn.execute(sql, args):
+                yield {
+                    "name": name,
+                    "url": url,
+                    "salary_range": {"currency": cur, "from": frm, "to": to},
+                    "snippet": json.loads(snippet),
+                }
+
+    __match = "id IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH ?)"
+
+    @staticmethod
+    def __terms(keyword: str) -> str:
+        # Каждое слово — отдельная фраза FTS, чтобы спецсимволы запроса не ломали синтаксис
+        # ("слово*" — поиск по началу слова)
+        return " ".join(
+            '"' + word.rstrip("*").replace('"', '""') + '"' + ("*" if word.endswith("*") else "")
+            for word in keyword.split()
+        )
+
+    def iter_salaries(self, keyword: str | None = None) -> Iterator[Tuple[str | None, int, int]]:
+        """
+        Только зарплаты (валюта, от, до) — для статистики (см. src.stats): остальные колонки не читаются.
+        :param keyword: как у iter_vacs.
+        """
+        sql = "SELECT currency, salary_from, salary_to FROM vacancies"
+        args = []
+        if keyword:
+            sql += " WHERE " + self.__match
+            args.append(self.__terms(keyword))
+        with closing(self._connect()) as conn:
+            yield from conn.execute(sql, args)
+
+    def load_vacs(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Загрузить вакансии; условия — как у iter_vacs."""
+        return list(self.iter_vacs(**kwargs))
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            count: int = conn.execute("SELECT count(*) FROM vacancies").fetchone()[0]
+            return count
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM vacancies")
+
+
+def iter_concatenated_json(filepath: str) -> Iterator[Any]:
+    """
+    Читать файл из нескольких JSON-документов подряд (например, "[...][...]",
+    как его оставлял JSONVacancyFileHandler.write_vacs). Элементы массивов отдаются по одному.
+    """
+    with open_stream(filepath, "rb") as f:
+        text = f.read().decode("utf-8")
+
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        # Пропускаем пробельные символы между документами
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos == len(text):
+            return
+        doc, pos = decoder.raw_decode(text, pos)
+        if isinstance(doc, list):
+            yield from doc
+        else:
+            yield doc
+
+
+def migrate_json_to_jsonl(src: str, dst: str) -> int:
+    """
+    Разовый перенос файла JSONVacancyFileHandler (в том числе склеенных массивов) в JSON Lines.
+    :param src: путь к исходному JSON-файлу.
+    :param dst: путь к файлу JSON Lines (дописывается).
+    :return: число перенесённых записей.
+    """
+    handler = JSONLinesVacancyFileHandler(dst)
+    batch: List[Dict[str, Any]] = []
+    count = 0
+    for record in iter_concatenated_json(src):
+        batch.append(record)
+        if len(batch) == 1000:
+            handler.write_vacs(batch)
+            count += len(batch)
+            batch = []
+    handler.write_vacs(batch)
+    return count + len(batch)
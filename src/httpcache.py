@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable
+
+
+class ResponseCache:
+    """
+    Дисковый кеш ответов API: одна запись — один JSON-файл в каталоге кеша.
+    Запись свежая ttl секунд; устаревшую можно отдать сразу и перепроверить
+    по ETag/Last-Modified. При превышении max_bytes удаляются давно не использованные записи (LRU).
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/.http_cache",
+        ttl: float = 600.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.__lock = threading.Lock()
+        self.__size: int | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: dict | None = None) -> str:
+        """Ключ записи: url и параметры запроса без учёта их порядка и пустых значений."""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+        raw = json.dumps([url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, url: str, params: dict | None = None) -> dict | None:
+        """
+        Запись кеша: {"body", "stored_at", "etag", "last_modified"} или None.
+        Свежесть записи проверяется через is_fresh().
+        """
+        path = self.__path(self.key(url, params))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry: dict = json.load(f)
+            # Время изменения файла служит отметкой последнего использования для LRU
+            now = self.clock()
+            os.utime(path, (now, now))
+        except (FileNotFoundError, ValueError):
+            with self.__lock:
+                self.misses += 1
+            return None
+        with self.__lock:
+            if self.is_fresh(entry):
+                self.hits += 1
+            else:
+                self.stale += 1
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        age: float = self.clock() - entry["stored_at"]
+        return age < self.ttl
+
+    def put(
+        self,
+        url: str,
+        params: dict | None,
+        body: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Сохранить ответ (атомарно: через временный файл) и при необходимости освободить место."""
+        key = self.key(url, params)
+        entry = {"body": body, "stored_at": self.clock(), "etag": etag, "last_modified": last_modified}
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        path = self.__path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+
+        with self.__lock:
+            size = self.__total_size()
+            try:
+                size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, path)
+            os.utime(path, (entry["stored_at"], entry["stored_at"]))
+            self.__size = size + len(data)
+            self.__evict()
+
+    def touch(self, url: str, params: dict | None, entry: dict) -> None:
+        """Ответ не изменился (304): продлить срок жизни записи."""
+        with self.__lock:
+            self.revalidated += 1
+        self.put(url, params, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+    def clear(self) -> None:
+        with self.__lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+            self.__size = 0
+
+    def __total_size(self) -> int:
+        if self.__size is None:
+            self.__size = sum(size for _, size, _ in self.__entries())
+        return self.__size
+
+    def __entries(self) -> list[tuple[str, int, float]]:
+        """(ключ, размер, время последнего использования) всех записей на диске."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[: -len(".json")]
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((key, stat.st_size, stat.st_mtime))
+        return entries
+
+    def __evict(self) -> None:
+        if self.__total_size() <= self.max_bytes:
+            return
+        for key, size, _ in sorted(self.__entries(), key=lambda e: e[2]):
+            if self.__size is not None and self.__size <= self.max_bytes:
+                break
+            try:
+                os.remove(self.__path(key))
+            except FileNotFoundError:
+                continue
+            self.__size = (self.__size or 0) - size
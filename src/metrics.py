@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Iterator
+
+# Хук получает вид события ("count" или "time"), имя метрики и значение (приращение или секунды)
+Hook = Callable[[str, str, float], None]
+
+
+class Metrics:
+    """
+    Счётчики и таймеры этапов работы (запросы, байты, повторы, разбор записей, кеш, диск).
+    Потокобезопасен: этапы могут выполняться в пуле потоков HeadHunterAPI.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, float] = {}
+        # Имя таймера -> [число замеров, суммарное время, максимальное время]
+        self.timers: dict[str, list[float]] = {}
+        self.hooks: list[Hook] = []
+        self.__lock = threading.Lock()
+
+    def add_hook(self, hook: Hook) -> None:
+        """Вызывать hook на каждое событие (например, чтобы передавать метрики в свою систему)."""
+        self.hooks.append(hook)
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        for hook in self.hooks:
+            hook("count", name, value)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Учесть длительность одного выполнения этапа."""
+        with self.__lock:
+            stat = self.timers.get(name)
+            if stat is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                stat[0] += 1
+                stat[1] += seconds
+                stat[2] = max(stat[2], seconds)
+        for hook in self.hooks:
+            hook("time", name, seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self) -> dict[str, Any]:
+        """Сводка для вывода в JSON: счётчики и для каждого таймера число замеров, сумма, среднее и максимум."""
+        with self.__lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "timers": {
+                    name: {"count": int(n), "total": total, "mean": total / n, "max": longest}
+                    for name, (n, total, longest) in sorted(self.timers.items())
+                },
+            }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.counters.clear()
+            self.timers.clear()
+
+
+# Включённый сборщик метрик; None — метрики выключены и вызовы ниже почти ничего не стоят
+_current: Metrics | None = None
+_disabled = nullcontext()
+
+
+def enable(metrics: Metrics | None = None) -> Metrics:
+    """Начать сбор метрик (в переданный или новый Metrics)."""
+    global _current
+    _current = metrics if metrics is not None else Metrics()
+    return _current
+
+
+def disable() -> None:
+    global _current
+    _current = None
+
+
+def current() -> Metrics | None:
+    return _current
+
+
+def count(name: str, value: float = 1) -> None:
+    """Увеличить счётчик, если метрики включены."""
+    if _current is not None:
+        _current.count(name, value)
+
+
+def timer(name: str) -> ContextManager[None]:
+    """Замерить время блока with, если метрики включены."""
+    if _current is None:
+        return _disabled
+    return _current.timer(name)
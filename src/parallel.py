@@ -0,0 +1,117 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+from src import metrics
+from src.archive import detect
+from src.fileutils import JSONLinesVacancyFileHandler, OffsetIndex
+from src.vacutils import Vacancy, VacancyTable
+
+# Диапазон байт файла: [начало, конец)
+Range = Tuple[int, int]
+T = TypeVar("T")
+
+
+def split_ranges(filepath: str, chunk_size: int = 8 * 1024 * 1024) -> List[Range]:
+    """
+    Разбить файл JSON Lines на диапазоны примерно по chunk_size байт, выровненные по концам строк.
+    Файл не читается целиком: для каждой границы читается только хвост строки, на которую она попала.
+    """
+    size = os.path.getsize(filepath)
+    ranges = []
+    with open(filepath, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def index_ranges(index: OffsetIndex, chunk_size: int = 8 * 1024 * 1024) -> List[Range]:
+    """Диапазоны по индексу смещений (см. IndexedVacancyFileHandler.index()): границы — начала записей."""
+    ranges: List[Range] = []
+    if not len(index):
+        return ranges
+    start = end = index.offsets[0]
+    for offset, length in zip(index.offsets, index.lengths):
+        if offset + length - start > chunk_size and end > start:
+            ranges.append((start, end))
+            start = offset
+        end = offset + length
+    ranges.append((start, end))
+    return ranges
+
+
+def _read_range(filepath: str, span: Range) -> List[Dict[str, Any]]:
+    with open(filepath, "rb") as f:
+        f.seek(span[0])
+        data = f.read(span[1] - span[0])
+    records = []
+    for line in data.splitlines(keepends=True):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            # Оборванная последняя строка файла пропускается, как в iter_vacs
+            if line.endswith(b"\n"):
+                raise
+    return records
+
+
+def _parse_records(task: Tuple[str, Range]) -> List[Dict[str, Any]]:
+    """Разобрать и проверить записи диапазона (выполняется в процессе пула)."""
+    return [vacancy.to_dict() for vacancy in Vacancy.from_raw_many(_read_range(*task))]
+
+
+def _parse_table(task: Tuple[str, Range]) -> VacancyTable:
+    """То же, что _parse_records, но результат — колоночная таблица."""
+    return VacancyTable.from_vacancies(Vacancy.from_raw_many(_read_range(*task)))
+
+
+def _map(func: Callable[[Tuple[str, Range]], T], tasks: List[Tuple[str, Range]], workers: int) -> List[T]:
+    """Применить func к кускам по порядку — в пуле процессов или, если он не нужен, в текущем."""
+    # На одном ядре пул только добавил бы передачу данных между процессами
+    if len(tasks) <= 1 or workers == 1:
+        return list(map(func, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tasks))
+
+
+def load_parallel(
+    filepath: str,
+    workers: int | None = None,
+    as_table: bool = False,
+    chunk_size: int = 8 * 1024 * 1024,
+    index: OffsetIndex | None = None,
+) -> List[Dict[str, Any]] | VacancyTable:
+    """
+    Загрузить файл JSON Lines, разбирая и проверяя куски файла параллельно в пуле процессов.
+    Порядок записей сохраняется. Сжатый файл нельзя разрезать по байтам — он читается в одном процессе.
+    :param workers: число процессов (по умолчанию — по числу ядер).
+    :param as_table: вернуть одну колоночную таблицу VacancyTable вместо списка записей —
+                     её куски передаются между процессами компактнее, чем словари.
+    :param chunk_size: примерный размер куска файла, байт.
+    :param index: индекс смещений файла — тогда куски режутся по границам записей из него.
+    :return: проверенные записи (как Vacancy.to_dict) или VacancyTable.
+    """
+    with metrics.timer("file.parallel_read"):
+        if detect(filepath) is not None:
+            vacancies = Vacancy.from_raw_many(JSONLinesVacancyFileHandler(filepath).iter_vacs())
+            result: List[Dict[str, Any]] | VacancyTable = (
+                VacancyTable.from_vacancies(vacancies) if as_table else [v.to_dict() for v in vacancies]
+            )
+        else:
+            ranges = index_ranges(index, chunk_size) if index is not None else split_ranges(filepath, chunk_size)
+            tasks = [(filepath, span) for span in ranges]
+            workers = workers or os.cpu_count() or 1
+            if as_table:
+                result = VacancyTable.concat(_map(_parse_table, tasks, workers))
+            else:
+                result = [record for part in _map(_parse_records, tasks, workers) for record in part]
+    metrics.count("file.records_read", len(result))
+    return result
@@ -0,0 +1,104 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator
+
+from src.fileutils import VacancyFileHandler
+from src.vacutils import Vacancy
+
+# Конец потока данных между стадиями
+_DONE = object()
+
+
+class _Failure:
+    """Исключение стадии, переданное по конвейеру дальше."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Положить элемент в очередь, ожидая места (backpressure); False, если конвейер остановлен."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _stage(source: Iterable[Any], out: queue.Queue, stop: threading.Event) -> None:
+    try:
+        for item in source:
+            if not _put(out, item, stop):
+                return
+    except BaseException as e:
+        _put(out, _Failure(e), stop)
+    else:
+        _put(out, _DONE, stop)
+    finally:
+        # Генератор страниц мог не дойти до конца — освобождаем его ресурсы (пул потоков, соединения)
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
+
+
+def _drain(q: queue.Queue, stop: threading.Event | None = None) -> Iterator[Any]:
+    """Элементы очереди до конца потока; исключение предыдущей стадии выбрасывается здесь."""
+    while True:
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            if stop is not None and stop.is_set():
+                return
+            continue
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def parse_page(page: dict) -> list[dict]:
+    """Страница ответа API -> проверенные записи для сохранения."""
+    return [vacancy.to_dict() for vacancy in Vacancy.from_raw_many(page["items"])]
+
+
+def ingest(
+    pages: Iterable[dict],
+    handler: VacancyFileHandler,
+    queue_size: int = 2,
+    parse: Callable[[dict], list[dict]] = parse_page,
+) -> int:
+    """
+    Конвейер загрузки: получение страниц, разбор в Vacancy и запись в файл идут одновременно
+    в разных потоках. Между стадиями — очереди на queue_size элементов, поэтому быстрая стадия
+    ждёт медленную, а в памяти одновременно находится лишь несколько страниц.
+    :param pages: страницы ответа API (например, HeadHunterAPI.stream_pages(keyword)).
+    :param handler: куда записывать вакансии (write_vacs вызывается на каждую страницу).
+    :param queue_size: размер очередей между стадиями.
+    :param parse: разбор страницы в список записей.
+    :return: сколько записей передано в handler.
+    """
+    stop = threading.Event()
+    fetched: queue.Queue = queue.Queue(maxsize=queue_size)
+    parsed: queue.Queue = queue.Queue(maxsize=queue_size)
+    threads = [
+        threading.Thread(target=_stage, args=(pages, fetched, stop), daemon=True),
+        threading.Thread(target=_stage, args=(map(parse, _drain(fetched, stop)), parsed, stop), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    written = 0
+    try:
+        for records in _drain(parsed):
+            if records:
+                handler.write_vacs(records)
+                written += len(records)
+    finally:
+        # Остановить стадии, если запись прервалась с ошибкой
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return written
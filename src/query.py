@@ -0,0 +1,226 @@
+import bisect
+import heapq
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Sequence
+
+from src import metrics
+from src.searchutils import InvertedIndex
+from src.vacutils import Vacancy
+
+
+class Query:
+    """
+    Условия отбора вакансий: зарплата в рублях, валюта, слова поиска, часть названия,
+    а также порядок и число результатов. Запрос неизменяем: методы возвращают новый запрос,
+    поэтому условия можно уточнять по шагам, не теряя предыдущий вариант.
+
+        Query().salary(min=200_000).matching("python django").top(10)
+    """
+
+    __slots__ = ("min_salary", "max_salary", "currency", "keyword", "name", "order", "limit")
+
+    def __init__(
+        self,
+        min_salary: float | None = None,
+        max_salary: float | None = None,
+        currency: str | None = None,
+        keyword: str | None = None,
+        name: str | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+    ) -> None:
+        """
+        :param min_salary: верхняя граница зарплаты в рублях (Vacancy.salary_rub) не меньше этой.
+        :param max_salary: верхняя граница зарплаты в рублях не больше этой.
+        :param currency: код валюты вилки (например, "USD").
+        :param keyword: поисковый запрос по названию и snippet (синтаксис — как у InvertedIndex.search).
+        :param name: часть названия вакансии (без учёта регистра).
+        :param order: "salary" — по убыванию зарплаты в рублях; по умолчанию — по релевантности,
+                      если задан keyword, иначе в порядке коллекции.
+        :param limit: не больше стольких результатов.
+        """
+        if order not in (None, "salary"):
+            raise ValueError(f"Неизвестный порядок: {order}")
+        # Пустые условия равны отсутствующим, чтобы одинаковые по смыслу запросы попадали в один ключ кеша
+        self.min_salary = float(min_salary) if min_salary is not None else None
+        self.max_salary = float(max_salary) if max_salary is not None else None
+        self.currency = currency.strip().upper() or None if currency else None
+        self.keyword = self.__normalize_keyword(keyword) if keyword else None
+        self.name = name.strip().lower().replace("ё", "е") or None if name else None
+        self.order = order
+        self.limit = limit
+
+    @staticmethod
+    def __normalize_keyword(keyword: str) -> str | None:
+        """Слова в нижнем регистре, без лишних пробелов; порядок слов внутри группы AND не важен."""
+        groups = []
+        for group in keyword.split(" OR "):
+            words = sorted(word.lower() for word in group.split())
+            if words:
+                groups.append(" ".join(words))
+        return " OR ".join(sorted(set(groups))) or None
+
+    def where(self, **changes: Any) -> "Query":
+        """Новый запрос с заменёнными условиями (None снимает условие)."""
+        fields = {field: getattr(self, field) for field in self.__slots__}
+        unknown = set(changes) - set(fields)
+        if unknown:
+            raise ValueError(f"Неизвестные условия: {', '.join(sorted(unknown))}")
+        fields.update(changes)
+        return Query(**fields)
+
+    def salary(self, min: float | None = None, max: float | None = None) -> "Query":
+        return self.where(min_salary=min, max_salary=max)
+
+    def in_currency(self, currency: str | None) -> "Query":
+        return self.where(currency=currency)
+
+    def matching(self, keyword: str | None) -> "Query":
+        return self.where(keyword=keyword)
+
+    def named(self, name: str | None) -> "Query":
+        return self.where(name=name)
+
+    def top(self, n: int) -> "Query":
+        """N вакансий с наибольшей зарплатой в рублях."""
+        return self.where(order="salary", limit=n)
+
+    def key(self) -> tuple:
+        """Нормализованный запрос — ключ кеша результатов."""
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Query) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        conditions = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__ if getattr(self, f) is not None)
+        return f"Query({conditions})"
+
+
+class VacancyCollection:
+    """
+    Список вакансий с выполнением запросов Query.
+    Условия проверяются от самого избирательного: число подходящих строк для зарплаты, валюты
+    и слов поиска известно точно (сортированная колонка зарплат, счётчики валют, поисковый индекс),
+    поэтому отбор начинается с самого короткого списка кандидатов, а остальные условия проверяются
+    только для них и прерываются на первом несовпадении.
+
+    Результаты последних запросов хранятся в LRU-кеше. Любое изменение коллекции увеличивает
+    version и сбрасывает кеш вместе с индексами.
+    """
+
+    def __init__(self, vacancies: Iterable[Vacancy] = (), cache_size: int = 128) -> None:
+        self.vacancies: list[Vacancy] = list(vacancies)
+        self.version = 0
+        self.cache_size = cache_size
+        self.__cache: OrderedDict[tuple, list[int]] = OrderedDict()
+        self.__index: InvertedIndex | None = None
+        self.__by_salary: list[int] | None = None
+        self.__salaries: list[float] = []
+        self.__by_currency: dict[str | None, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.vacancies)
+
+    def replace(self, vacancies: Iterable[Vacancy]) -> None:
+        """Заменить содержимое коллекции."""
+        self.vacancies = list(vacancies)
+        self.__changed()
+
+    def extend(self, vacancies: Iterable[Vacancy]) -> None:
+        self.vacancies.extend(vacancies)
+        self.__changed()
+
+    def __changed(self) -> None:
+        self.version += 1
+        self.__cache.clear()
+        self.__index = None
+        self.__by_salary = None
+        self.__by_currency = None
+
+    @property
+    def index(self) -> InvertedIndex:
+        """Поисковый индекс (строится при первом запросе со словами)."""
+        if self.__index is None:
+            self.__index = InvertedIndex.from_vacancies(self.vacancies)
+        return self.__index
+
+    def __salary_rows(self, low: float | None, high: float | None) -> list[int]:
+        """Строки с зарплатой в рублях в [low, high] — срез заранее отсортированного списка."""
+        if self.__by_salary is None:
+            self.__by_salary = sorted(range(len(self.vacancies)), key=lambda i: self.vacancies[i].salary_rub)
+            self.__salaries = [self.vacancies[i].salary_rub for i in self.__by_salary]
+        start = 0 if low is None else bisect.bisect_left(self.__salaries, low)
+        end = len(self.__salaries) if high is None else bisect.bisect_right(self.__salaries, high)
+        return self.__by_salary[start:end]
+
+    def __currency_rows(self, currency: str) -> list[int]:
+        if self.__by_currency is None:
+            self.__by_currency = {}
+            for i, vacancy in enumerate(self.vacancies):
+                self.__by_currency.setdefault(vacancy.salary_range["currency"], []).append(i)
+        return self.__by_currency.get(currency, [])
+
+    def run(self, query: Query) -> list[int]:
+        """Номера подходящих вакансий в порядке, заданном запросом."""
+        key = query.key()
+        rows = self.__cache.get(key)
+        if rows is not None:
+            self.__cache.move_to_end(key)
+            metrics.count("query.cache_hits")
+            return list(rows)
+        metrics.count("query.cache_misses")
+        with metrics.timer("query.run"):
+            rows = self.__evaluate(query)
+        self.__cache[key] = rows
+        if len(self.__cache) > self.cache_size:
+            self.__cache.popitem(last=False)
+        return list(rows)
+
+    def select(self, query: Query) -> list[Vacancy]:
+        """Подходящие вакансии (см. run)."""
+        return [self.vacancies[i] for i in self.run(query)]
+
+    def __evaluate(self, query: Query) -> list[int]:
+        vacancies = self.vacancies
+        # Условия, для которых известен точный список подходящих строк: (строки, проверка одной строки)
+        exact: list[tuple[Sequence[int], Callable[[int], bool]]] = []
+        ranked: list[int] | None = None
+        if query.keyword is not None:
+            ranked = self.index.search(query.keyword)
+            found = set(ranked)
+            exact.append((ranked, found.__contains__))
+        if query.currency is not None:
+            currency = query.currency
+            exact.append(
+                (self.__currency_rows(currency), lambda i: vacancies[i].salary_range["currency"] == currency)
+            )
+        if query.min_salary is not None or query.max_salary is not None:
+            low = query.min_salary if query.min_salary is not None else float("-inf")
+            high = query.max_salary if query.max_salary is not None else float("inf")
+            salary_rows = self.__salary_rows(query.min_salary, query.max_salary)
+            exact.append((salary_rows, lambda i: low <= vacancies[i].salary_rub <= high))
+        exact.sort(key=lambda condition: len(condition[0]))
+
+        # Кандидаты — строки самого избирательного условия; остальные проверяются от более избирательных
+        candidates: Iterable[int] = exact[0][0] if exact else range(len(vacancies))
+        checks = [check for _, check in exact[1:]]
+        if query.name is not None:
+            # Проверка подстроки дороже сравнения чисел — она последняя
+            name = query.name
+            checks.append(lambda i: name in vacancies[i].name.lower().replace("ё", "е"))
+        rows = [i for i in candidates if all(check(i) for check in checks)]
+
+        if query.order == "salary":
+            limit = len(rows) if query.limit is None else query.limit
+            # При равной зарплате сохраняется порядок коллекции
+            return heapq.nsmallest(limit, rows, key=lambda i: (-vacancies[i].salary_rub, i))
+        if ranked is not None:
+            position = {row: n for n, row in enumerate(ranked)}
+            rows.sort(key=position.__getitem__)
+        else:
+            rows.sort()
+        return rows if query.limit is None else rows[: query.limit]
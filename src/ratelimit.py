@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Callable
+
+# Приоритеты запросов: интерактивные (пользователь ждёт ответа) обслуживаются раньше фоновых (синхронизация)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+
+class RateLimiter:
+    """
+    Планировщик запросов по принципу token bucket: в среднем не больше rate запросов в секунду,
+    подряд без ожидания — не больше burst. Один экземпляр можно разделить между всеми потоками
+    и всеми клиентами процесса (см. shared_limiter).
+
+    Интерактивный запрос сразу резервирует ближайший свободный слот, фоновый занимает слот,
+    только когда тот уже наступил, — поэтому интерактивные запросы не ждут в очереди за фоновыми.
+
+    Скорость подстраивается под ответы сервера: после 429 все запросы приостанавливаются
+    на Retry-After, а скорость уменьшается вдвое (не ниже min_rate); каждый успешный ответ
+    понемногу возвращает её к max_rate.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        fallback_rate: float = 5.0,
+        recovery: float = 0.1,
+        clock: Callable[[], float] | None = None,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        """
+        :param rate: запросов в секунду (None — без ограничения, пока сервер не ответит 429).
+        :param burst: сколько запросов можно выполнить подряд без ожидания.
+        :param min_rate: ниже этой скорости после 429 не опускаемся.
+        :param max_rate: выше этой скорости после восстановления не поднимаемся (по умолчанию rate).
+        :param fallback_rate: скорость после первого 429, если исходно ограничения не было.
+        :param recovery: на сколько запросов в секунду поднимать скорость после каждого успешного ответа.
+        :param clock: монотонные часы (для тестов — поддельные).
+        :param sleep: функция ожидания (для тестов — сдвигающая поддельные часы).
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.fallback_rate = fallback_rate
+        self.recovery = recovery
+        self.penalties = 0
+        # Часы и sleep берутся из модуля time в момент вызова, чтобы их можно было подменить в тестах
+        self.__clock = clock if clock is not None else lambda: time.monotonic()
+        self.__sleep = sleep if sleep is not None else lambda seconds: time.sleep(seconds)
+        self.__lock = threading.Lock()
+        # Теоретическое время следующего запроса (GCRA): слоты до него уже заняты
+        self.__next = 0.0
+        # До этого момента запросы не отправляются (пауза после 429)
+        self.__paused_until = 0.0
+
+    def __start(self, now: float) -> float:
+        """Когда можно начать ближайший свободный запрос."""
+        start = max(now, self.__paused_until)
+        if self.rate:
+            tolerance = (self.burst - 1) / self.rate
+            start = max(start, self.__next - tolerance)
+        return start
+
+    def __reserve(self, start: float) -> None:
+        if self.rate:
+            self.__next = max(self.__next, start) + 1 / self.rate
+
+    def acquire(self, priority: int = INTERACTIVE) -> float:
+        """
+        Дождаться разрешения на запрос.
+        :param priority: INTERACTIVE или BACKGROUND.
+        :return: сколько секунд пришлось ждать.
+        """
+        waited = 0.0
+        while True:
+            with self.__lock:
+                now = self.__clock()
+                start = self.__start(now)
+                reserved = priority == INTERACTIVE or start <= now
+                if reserved:
+                    self.__reserve(start)
+            delay = start - now
+            if delay > 0:
+                self.__sleep(delay)
+                waited += delay
+            # Фоновый запрос только дождался слота — проверяем снова: слот мог занять интерактивный
+            if reserved:
+                return waited
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        """
+        Сервер ответил 429: приостановить все запросы на retry_after секунд и снизить скорость.
+        """
+        with self.__lock:
+            self.penalties += 1
+            now = self.__clock()
+            if retry_after:
+                self.__paused_until = max(self.__paused_until, now + retry_after)
+            current = self.rate if self.rate else self.fallback_rate
+            self.rate = max(self.min_rate, current / 2 if self.rate else current)
+
+    def reward(self) -> None:
+        """Успешный ответ: немного увеличить скорость (до max_rate, если он задан)."""
+        if not self.rate or not self.penalties:
+            return
+        with self.__lock:
+            if self.rate is None:
+                return
+            rate = self.rate + self.recovery
+            self.rate = rate if self.max_rate is None else min(self.max_rate, rate)
+
+
+_shared: RateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> RateLimiter:
+    """
+    Планировщик, общий для всех клиентов процесса: без ограничения скорости,
+    пока hh.ru не ответит 429, после чего скорость подстраивается.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter()
+        return _shared
+
+
+def set_shared_limiter(limiter: RateLimiter | None) -> None:
+    """Заменить общий планировщик (None — создать новый при следующем обращении)."""
+    global _shared
+    with _shared_lock:
+        _shared = limiter
@@ -0,0 +1,204 @@
+import bisect
+import json
+import math
+import os
+import re
+from typing import Any, Iterable, Sequence
+
+from src.fileutils import fingerprint
+from src.vacutils import Vacancy
+
+# hh.ru подсвечивает совпадения разметкой <highlighttext>...</highlighttext>
+_TAG = re.compile(r"<[^>]*>")
+# Слова на любом языке; "c++" и "c#" остаются отдельными словами
+_TOKEN = re.compile(r"\w+[+#]*")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Разбить русский или английский текст на слова в нижнем регистре, без HTML-разметки."""
+    if not text:
+        return []
+    return _TOKEN.findall(_TAG.sub(" ", text).lower().replace("ё", "е"))
+
+
+def vacancy_text(vacancy: Vacancy) -> str:
+    """Текст вакансии, по которому идёт поиск: название и snippet."""
+    snippet = vacancy.snippet
+    return " ".join(filter(None, (vacancy.name, snippet.get("requirement"), snippet.get("responsibility"))))
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс по названию и snippet вакансий.
+    Документы нумеруются в порядке добавления; поиск возвращает номера,
+    отсортированные по релевантности (BM25).
+
+    Запрос: слова через пробел — все должны встретиться (AND), группы через " OR " —
+    хотя бы одна (OR), слово со звёздочкой на конце ("pyth*") — поиск по префиксу.
+    """
+
+    # Параметры BM25
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self) -> None:
+        # слово -> {номер документа: сколько раз встретилось}
+        self.postings: dict[str, dict[int, int]] = {}
+        self.lengths: list[int] = []
+        self.__total_length = 0
+        self.__vocabulary: list[str] | None = None
+        # Размер и отпечаток (см. fileutils.fingerprint) файла вакансий, по которому построен загруженный индекс
+        self.source_size: int | None = None
+        self.source_fingerprint: bytes | None = None
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "InvertedIndex":
+        index = cls()
+        index.add_many(vacancies)
+        return index
+
+    def add(self, vacancy: Vacancy) -> int:
+        """Добавить вакансию; возвращает её номер в индексе."""
+        return self.add_text(vacancy_text(vacancy))
+
+    def add_many(self, vacancies: Iterable[Vacancy]) -> None:
+        for vacancy in vacancies:
+            self.add(vacancy)
+
+    def add_text(self, text: str) -> int:
+        doc = len(self.lengths)
+        tokens = tokenize(text)
+        for token in tokens:
+            docs = self.postings.get(token)
+            if docs is None:
+                docs = self.postings[token] = {}
+                self.__vocabulary = None
+            docs[doc] = docs.get(doc, 0) + 1
+        self.lengths.append(len(tokens))
+        self.__total_length += len(tokens)
+        return doc
+
+    def __expand(self, term: str) -> list[str]:
+        """Слова индекса, подходящие под терм (с учётом префикса "term*")."""
+        if not term.endswith("*"):
+            return [term] if term in self.postings else []
+        prefix = term.rstrip("*")
+        if self.__vocabulary is None:
+            self.__vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self.__vocabulary, prefix)
+        words = []
+        for word in self.__vocabulary[start:]:
+            if not word.startswith(prefix):
+                break
+            words.append(word)
+        return words
+
+    def __parse(self, query: str) -> list[list[str]]:
+        """Запрос -> группы (OR) термов (AND). Префиксная звёздочка сохраняется."""
+        groups = []
+        for group in query.split(" OR "):
+            terms = []
+            for raw in group.split():
+                tokens = tokenize(raw)
+                if tokens and raw.endswith("*"):
+                    tokens[-1] += "*"
+                terms.extend(tokens)
+            if terms:
+                groups.append(terms)
+        return groups
+
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        """
+        Номера документов, подходящих под запрос, от самых релевантных.
+        :param query: запрос (см. описание класса).
+        :param limit: сколько результатов вернуть (None — все).
+        """
+        scores: dict[int, float] = {}
+        for group in self.__parse(query):
+            matched: set[int] | None = None
+            group_scores: dict[int, float] = {}
+            for term in group:
+                term_docs: set[int] = set()
+                for word in self.__expand(term):
+                    docs = self.postings[word]
+                    term_docs.update(docs)
+                    idf = self.__idf(len(docs))
+                    for doc, tf in docs.items():
+                        group_scores[doc] = group_scores.get(doc, 0.0) + idf * self.__tf(tf, doc)
+                matched = term_docs if matched is None else matched & term_docs
+                if not matched:
+                    break
+            for doc in matched or ():
+                scores[doc] = max(scores.get(doc, 0.0), group_scores[doc])
+
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))
+        return ranked if limit is None else ranked[:limit]
+
+    def __idf(self, df: int) -> float:
+        n = len(self.lengths)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def __tf(self, tf: int, doc: int) -> float:
+        avg = self.__total_length / len(self.lengths) or 1
+        norm = 1 - self.b + self.b * self.lengths[doc] / avg
+        return tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+    def save(self, path: str, source_size: int | None = None, source_fingerprint: bytes | None = None) -> None:
+        """
+        Сохранить индекс в JSON-файл.
+        :param source_size: размер файла вакансий, по которому построен индекс (для проверки актуальности).
+        :param source_fingerprint: отпечаток этих source_size байт файла.
+        """
+        data: dict[str, Any] = {
+            "version": 2,
+            "source_size": source_size,
+            "source_fingerprint": source_fingerprint.hex() if source_fingerprint is not None else None,
+            "lengths": self.lengths,
+            "postings": {word: list(docs.items()) for word, docs in self.postings.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "InvertedIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls()
+        index.lengths = data["lengths"]
+        index.source_size = data.get("source_size")
+        if data.get("source_fingerprint"):
+            index.source_fingerprint = bytes.fromhex(data["source_fingerprint"])
+        index.__total_length = sum(index.lengths)
+        index.postings = {word: dict(map(tuple, docs)) for word, docs in data["postings"].items()}
+        return index
+
+    @classmethod
+    def for_file(cls, filepath: str, vacancies: Sequence[Vacancy]) -> "InvertedIndex":
+        """
+        Индекс для файла вакансий в формате JSON Lines, сохраняемый рядом с ним (<filepath>.fts.json).
+        Если сохранённый индекс есть, в него добавляются только дописанные с тех пор вакансии;
+        если файл с тех пор был перезаписан (не совпал отпечаток) или укорочен, индекс строится заново.
+        :param vacancies: вакансии файла по порядку (например, IndexedVacancyFileHandler.view()).
+        """
+        path = filepath + ".fts.json"
+        size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+        index = cls()
+        try:
+            stored = cls.load(path)
+        except (FileNotFoundError, ValueError, KeyError):
+            stored = None
+        if stored is not None and stored.source_size is not None and stored.source_size <= size:
+            unchanged = stored.source_fingerprint == fingerprint(filepath, stored.source_size)
+            if unchanged and len(stored) <= len(vacancies):
+                index = stored
+
+        known = len(index)
+        for i in range(known, len(vacancies)):
+            index.add(vacancies[i])
+        # Файл индекса переписывается, только если индекс построен заново или в него что-то добавлено
+        if index is not stored or len(index) > known:
+            index.save(path, source_size=size, source_fingerprint=fingerprint(filepath, size))
+        return index
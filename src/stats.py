@@ -0,0 +1,190 @@
+import bisect
+from array import array
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple
+
+from src import metrics
+from src.currency import default_rates
+from src.searchutils import tokenize
+from src.vacutils import VacancyTable
+
+# Зарплата одной вакансии: (валюта, нижняя граница, верхняя граница); 0 — граница не указана
+Salary = Tuple[str | None, int, int]
+
+FIELDS = ("to", "from", "mid", "normalized")
+
+
+def _matches(words: list[str], text: str) -> bool:
+    """Все слова запроса есть в тексте ("слово*" — по началу слова)."""
+    tokens = tokenize(text)
+    for word in words:
+        if word.endswith("*"):
+            if not any(token.startswith(word[:-1]) for token in tokens):
+                return False
+        elif word not in tokens:
+            return False
+    return True
+
+
+def salaries(records: Iterable[Dict[str, Any]], keyword: str | None = None) -> Iterator[Salary]:
+    """
+    Зарплаты из потока записей (сырых из API hh.ru или сохранённых) — без создания Vacancy.
+    :param keyword: слова, которые все должны встретиться в названии или snippet.
+    """
+    words = [word.lower().replace("ё", "е") for word in keyword.split()] if keyword else []
+    for record in records:
+        salary = record.get("salary_range") or record.get("salary") or {}
+        if words:
+            snippet = record.get("snippet") or {}
+            text = " ".join(
+                filter(None, (record.get("name"), snippet.get("requirement"), snippet.get("responsibility")))
+            )
+            if not _matches(words, text):
+                continue
+        frm = salary.get("from") or 0
+        yield salary.get("currency"), frm, max(salary.get("to") or 0, frm)
+
+
+class SalaryStats:
+    """
+    Распределение зарплат по валютам: число вакансий, минимум, максимум, среднее, перцентили, гистограмма.
+    Хранит только числа (по 8 байт на вакансию в array), поэтому миллион записей занимает около 8 МБ.
+    Вакансии без указанной зарплаты не учитываются.
+    """
+
+    def __init__(self, field: str = "to") -> None:
+        """
+        :param field: "to", "from", "mid" (середина вилки) или "normalized" (верхняя граница в рублях,
+                      все валюты попадают в группу "RUR").
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Неизвестное поле зарплаты: {field}")
+        self.field = field
+        self.values: Dict[str | None, array] = {}
+        self.__sorted: Dict[str | None, array] = {}
+
+    @classmethod
+    def from_salaries(cls, rows: Iterable[Salary], field: str = "to") -> "SalaryStats":
+        stats = cls(field)
+        stats.extend(rows)
+        return stats
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Dict[str, Any]], field: str = "to", keyword: str | None = None
+    ) -> "SalaryStats":
+        return cls.from_salaries(salaries(records, keyword), field)
+
+    @classmethod
+    def from_table(cls, table: VacancyTable, field: str = "to", rows: Iterable[int] | None = None) -> "SalaryStats":
+        """Статистика по колонкам VacancyTable (всем строкам или выбранным, например из where)."""
+        stats = cls(field)
+        if rows is None and field != "mid":
+            # Числовые колонки копируются целиком и раскладываются по валютам за один проход
+            column = table.column(field)
+            if field == "normalized":
+                stats.values["RUR"] = array("d", (v for v in column if v > 0))
+                return stats
+            groups: Dict[int, array] = {}
+            for code, value in zip(table.currency_codes, column):
+                if value > 0:
+                    group = groups.get(code)
+                    if group is None:
+                        group = groups[code] = array("d")
+                    group.append(value)
+            stats.values = {table.currencies[code]: values for code, values in groups.items()}
+            return stats
+        currencies, codes = table.currencies, table.currency_codes
+        frm, to = table.salary_from, table.salary_to
+        stats.extend((currencies[codes[i]], frm[i], to[i]) for i in (range(len(table)) if rows is None else rows))
+        return stats
+
+    def extend(self, rows: Iterable[Salary]) -> None:
+        """Учесть зарплаты за один проход по потоку."""
+        field, values = self.field, self.values
+        to_rub = default_rates().to_rub
+        with metrics.timer("stats.collect"):
+            for currency, frm, to in rows:
+                if field == "to":
+                    value: float = to
+                elif field == "from":
+                    value = frm
+                elif field == "mid":
+                    value = (frm + to) / 2
+                else:
+                    value, currency = to_rub(to, currency), "RUR"
+                if value <= 0:
+                    continue
+                group = values.get(currency)
+                if group is None:
+                    group = values[currency] = array("d")
+                group.append(value)
+        self.__sorted.clear()
+
+    def __sorted_values(self, currency: str | None) -> array:
+        values = self.__sorted.get(currency)
+        if values is None:
+            values = self.__sorted[currency] = array("d", sorted(self.values.get(currency, ())))
+        return values
+
+    def count(self, currency: str | None = None, above: float | None = None) -> int:
+        """
+        Число вакансий с зарплатой (в валюте currency или во всех валютах).
+        :param above: учитывать только зарплаты не ниже этого значения.
+        """
+        groups = [currency] if currency is not None else list(self.values)
+        if above is None:
+            return sum(len(self.values.get(group, ())) for group in groups)
+        total = 0
+        for group in groups:
+            values = self.__sorted_values(group)
+            total += len(values) - bisect.bisect_left(values, above)
+        return total
+
+    def percentile(self, currency: str | None, p: float) -> float | None:
+        """Перцентиль p (0..100) с линейной интерполяцией между соседними значениями; None, если данных нет."""
+        values = self.__sorted_values(currency)
+        if not values:
+            return None
+        position = (len(values) - 1) * p / 100
+        low = int(position)
+        high = min(low + 1, len(values) - 1)
+        return float(values[low] + (values[high] - values[low]) * (position - low))
+
+    def histogram(self, currency: str | None, bins: int | Sequence[float] = 10) -> Dict[str, list]:
+        """
+        Гистограмма: {"edges": [...], "counts": [...]}; в i-й интервал [edges[i], edges[i + 1]) попадает
+        counts[i] вакансий, последний интервал включает правую границу.
+        :param bins: число интервалов равной ширины от минимума до максимума или свои границы.
+        """
+        values = self.__sorted_values(currency)
+        if isinstance(bins, int):
+            if not values:
+                return {"edges": [], "counts": []}
+            low, high = values[0], values[-1]
+            if low == high:
+                edges = [low, high]
+            else:
+                edges = [low + (high - low) * i / bins for i in range(bins)] + [high]
+        else:
+            edges = list(bins)
+        positions = [bisect.bisect_left(values, edge) for edge in edges[:-1]]
+        positions.append(bisect.bisect_right(values, edges[-1]) if edges else 0)
+        return {"edges": edges, "counts": [b - a for a, b in zip(positions, positions[1:])]}
+
+    def summary(
+        self, percentiles: Sequence[float] = (25, 50, 75, 90), bins: int | Sequence[float] | None = 10
+    ) -> Dict[str | None, Dict[str, Any]]:
+        """Сводка по каждой валюте (от самой частой): count, min, max, mean, перцентили и гистограмма."""
+        result: Dict[str | None, Dict[str, Any]] = {}
+        for currency in sorted(self.values, key=lambda group: -len(self.values[group])):
+            values = self.__sorted_values(currency)
+            result[currency] = {
+                "count": len(values),
+                "min": values[0],
+                "max": values[-1],
+                "mean": sum(values) / len(values),
+                "percentiles": {f"{p:g}": self.percentile(currency, p) for p in percentiles},
+            }
+            if bins is not None:
+                result[currency]["histogram"] = self.histogram(currency, bins)
+        return result
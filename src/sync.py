@@ -0,0 +1,100 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Iterator, Protocol
+
+from src.fileutils import JSONLinesVacancyFileHandler
+from src.vacutils import Vacancy, vacancy_key
+
+
+class PageSource(Protocol):
+    """Источник страниц выдачи (HeadHunterAPI.iter_pages)."""
+
+    def iter_pages(self, keyword: str, **params: Any) -> Iterator[dict]:
+        ...  # pragma: no cover
+
+
+def parse_published_at(value: str) -> datetime:
+    """Дата публикации hh.ru вида 2025-05-01T10:00:00+0300."""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+
+class SyncState:
+    """
+    Водяные знаки инкрементальной синхронизации по ключевым словам:
+    дата самой свежей из уже загруженных вакансий и ключи вакансий с этой датой.
+    Хранится в JSON-файле рядом с файлом вакансий (<filepath>.sync.json).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.marks: dict[str, dict] = json.load(f)
+        except FileNotFoundError:
+            self.marks = {}
+
+    @classmethod
+    def for_store(cls, filepath: str) -> "SyncState":
+        return cls(filepath + ".sync.json")
+
+    def get(self, keyword: str) -> dict | None:
+        return self.marks.get(keyword)
+
+    def update(self, keyword: str, published_at: str, keys: list[str]) -> None:
+        self.marks[keyword] = {"published_at": published_at, "keys": keys}
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.marks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+def sync_keyword(
+    api: PageSource,
+    handler: JSONLinesVacancyFileHandler,
+    keyword: str,
+    state: SyncState | None = None,
+) -> tuple[int, int]:
+    """
+    Загрузить только вакансии, появившиеся после прошлой синхронизации, и дописать их в файл.
+    Страницы запрашиваются от новых вакансий к старым, пока не встретится уже известная;
+    новые и изменившиеся записи попадают в файл через upsert, остальной файл не переписывается.
+    :return: сколько записей добавлено и сколько обновлено.
+    """
+    state = state if state is not None else SyncState.for_store(handler.filepath)
+    mark = state.get(keyword)
+    mark_date = parse_published_at(mark["published_at"]) if mark else None
+    mark_keys = set(mark["keys"]) if mark else set()
+
+    records = []
+    newest: datetime | None = mark_date
+    newest_raw = mark["published_at"] if mark else None
+    newest_keys: set[str] = set(mark_keys)
+    for page in api.iter_pages(keyword, order_by="publication_time"):
+        reached = False
+        for raw in page["items"]:
+            key = vacancy_key(raw)
+            published = parse_published_at(raw["published_at"]) if raw.get("published_at") else None
+            if mark_date is not None and published is not None:
+                if published < mark_date or published == mark_date and key in mark_keys:
+                    reached = True
+                    continue
+            records.append(Vacancy.from_raw(raw).to_dict())
+
+            if published is None or key is None:
+                continue
+            if newest is None or published > newest:
+                newest, newest_raw, newest_keys = published, raw["published_at"], {key}
+            elif published == newest:
+                newest_keys.add(key)
+        # Дальше по выдаче только уже загруженные вакансии
+        if reached:
+            break
+
+    result = handler.upsert_vacs(records)
+    if newest_raw is not None:
+        state.update(keyword, newest_raw, sorted(newest_keys))
+        state.save()
+    return result
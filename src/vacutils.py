@@ -1,16 +1,136 @@
-from typing import Any
+import heapq
+import re
+import sys
+from array import array
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+from src import metrics
+from src.currency import default_rates
+
+# Номер вакансии в ссылках hh.ru: https://hh.ru/vacancy/123, https://api.hh.ru/vacancies/123
+_VACANCY_ID = re.compile(r"/vacanc(?:y|ies)/(\d+)")
+
+
+def vacancy_key(record: dict) -> str | None:
+    """
+    Ключ вакансии для дедупликации: id из ответа API, иначе номер из ссылки, иначе сама ссылка.
+    Одинаков для сырых данных API и для сохранённых записей (у них есть только url).
+    """
+    vac_id = record.get("id")
+    if vac_id is not None:
+        return str(vac_id)
+    url = record.get("alternate_url") or record.get("url")
+    if not url:
+        return None
+    match = _VACANCY_ID.search(url)
+    return match.group(1) if match else url
+
 
 class Vacancy:
     """
     Класс для работы с вакансиями.
+    Вакансии сравниваются по верхней границе зарплаты в рублях (salary_rub),
+    которая считается один раз при создании по курсам currency.default_rates().
+    salary_range доступен только для чтения: одна вилка может быть общей для многих вакансий.
     """
-    __slots__ = ("name", "url", "salary_range", "snippet")
+    __slots__ = ("name", "url", "salary_range", "snippet", "salary_rub")
+
+    salary_range: Mapping[str, Any]
 
     def __init__(self, name: str, url: str, salary_range: dict | None, snippet: dict):
         self.name = self.__validate_string(name)
         self.url = self.__validate_string(url)
-        self.salary_range = self.__validate_salary_range(salary_range)
+        self.salary_range = MappingProxyType(self.__validate_salary_range(salary_range))
         self.snippet = self.__validate_snippet(snippet)
+        self.salary_rub = default_rates().to_rub(self.salary_range["to"], self.salary_range["currency"])
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "Vacancy":
+        """Вакансия из ответа API hh.ru или из сохранённой записи."""
+        url = raw.get("alternate_url") or raw.get("url")
+        # формат salary может быть в raw["salary"] или raw["salary_range"]
+        salary = raw.get("salary_range") or raw.get("salary")
+        return cls(raw["name"], url, salary, raw.get("snippet", {}))  # type: ignore[arg-type]
+
+    @classmethod
+    def from_raw_many(cls, raws: Iterable[dict]) -> list["Vacancy"]:
+        """
+        Вакансии из ответов API или сохранённых записей (с проверкой, как from_raw).
+        Одинаковые зарплатные вилки разделяют один неизменяемый salary_range.
+        """
+        with metrics.timer("vacancy.validate"):
+            vacancies = cls.__from_raw_many(raws)
+        metrics.count("vacancy.records", len(vacancies))
+        return vacancies
+
+    @classmethod
+    def __from_raw_many(cls, raws: Iterable[dict]) -> list["Vacancy"]:
+        rates = default_rates()
+        salaries: dict[tuple, tuple[Mapping[str, Any], float]] = {}
+        vacancies = []
+        for raw in raws:
+            vacancy = object.__new__(cls)
+            vacancy.name = cls.__validate_string(raw["name"])
+            vacancy.url = cls.__validate_string(raw.get("alternate_url") or raw.get("url"))
+            salary = raw.get("salary_range") or raw.get("salary")
+            if salary is not None and not isinstance(salary, dict):
+                raise ValueError("salary_range должен быть словарём или None")
+            shared_key = (
+                (None, 0, 0) if salary is None else (salary.get("currency"), salary.get("from"), salary.get("to"))
+            )
+            shared = salaries.get(shared_key)
+            if shared is None:
+                salary_range = cls.__validate_salary_range(salary)
+                if salary_range["currency"] is not None:
+                    salary_range["currency"] = sys.intern(salary_range["currency"])
+                rub = rates.to_rub(salary_range["to"], salary_range["currency"])
+                shared = salaries[shared_key] = (MappingProxyType(salary_range), rub)
+            vacancy.salary_range, vacancy.salary_rub = shared
+            vacancy.snippet = cls.__validate_snippet(raw.get("snippet", {}))
+            vacancies.append(vacancy)
+        return vacancies
+
+    @classmethod
+    def from_trusted_many(cls, records: Iterable[dict]) -> list["Vacancy"]:
+        """
+        Вакансии из записей, уже прошедших проверку (например, сохранённых через to_dict).
+        Проверки не выполняются; одинаковые зарплатные вилки разделяют один неизменяемый salary_range.
+        """
+        with metrics.timer("vacancy.trusted"):
+            vacancies = cls.__from_trusted_many(records)
+        metrics.count("vacancy.records", len(vacancies))
+        return vacancies
+
+    @classmethod
+    def __from_trusted_many(cls, records: Iterable[dict]) -> list["Vacancy"]:
+        rates = default_rates()
+        salaries: dict[tuple, tuple[Mapping[str, Any], float]] = {}
+        vacancies = []
+        new = object.__new__
+        for record in records:
+            vacancy = new(cls)
+            vacancy.name = record["name"]
+            vacancy.url = record["url"]
+            salary = record.get("salary_range")
+            shared_key = (None, 0, 0) if salary is None else (salary["currency"], salary["from"], salary["to"])
+            shared = salaries.get(shared_key)
+            if shared is None:
+                currency = sys.intern(shared_key[0]) if shared_key[0] is not None else None
+                salary_range = MappingProxyType({"currency": currency, "from": shared_key[1], "to": shared_key[2]})
+                shared = salaries[shared_key] = (salary_range, rates.to_rub(shared_key[2], currency))
+            vacancy.salary_range, vacancy.salary_rub = shared
+            vacancy.snippet = record.get("snippet", {})
+            vacancies.append(vacancy)
+        return vacancies
+
+    def to_dict(self) -> dict:
+        """Запись для сохранения в файл (только атрибуты Vacancy)."""
+        return {"name": self.name, "url": self.url, "salary_range": dict(self.salary_range), "snippet": self.snippet}
+
+    def __reduce__(self) -> tuple:
+        # MappingProxyType не сериализуется pickle — передаём то, из чего вакансия создаётся заново
+        return self.__class__, (self.name, self.url, dict(self.salary_range), self.snippet)
 
     @staticmethod
     def __validate_salary_range(salary_range: dict | None) -> dict:
@@ -47,36 +167,308 @@ class Vacancy:
 
     def __eq__(self, other: object) -> bool | Any:
         if isinstance(other, Vacancy):
-            return self.salary_range["to"] == other.salary_range["to"]
+            return self.salary_rub == other.salary_rub
         else:
             return NotImplemented
 
     def __ne__(self, other: object) -> bool | Any:
         if isinstance(other, Vacancy):
-            return self.salary_range["to"] != other.salary_range["to"]
+            return self.salary_rub != other.salary_rub
         else:
             return NotImplemented
 
     def __lt__(self, other: object) -> bool | Any:
         if isinstance(other, Vacancy):
-            return self.salary_range["to"] < other.salary_range["to"]
+            return self.salary_rub < other.salary_rub
         else:
             return NotImplemented
 
     def __le__(self, other: object) -> bool | Any:
         if isinstance(other, Vacancy):
-            return self.salary_range["to"] <= other.salary_range["to"]
+            return self.salary_rub <= other.salary_rub
         else:
             return NotImplemented
 
     def __gt__(self, other: object) -> bool | Any:
         if isinstance(other, Vacancy):
-            return self.salary_range["to"] > other.salary_range["to"]
+            return self.salary_rub > other.salary_rub
         else:
             return NotImplemented
 
     def __ge__(self, other: object) -> bool | Any:
         if isinstance(other, Vacancy):
-            return self.salary_range["to"] >= other.salary_range["to"]
+            return self.salary_rub >= other.salary_rub
         else:
-            return NotImplemented
\ No newline at end of file
+            return NotImplemented
+
+
+def salary_value(vacancy: Vacancy, key: str = "to", rates: Mapping[str, float] | None = None) -> float:
+    """
+    Значение зарплаты для ранжирования.
+    :param key: "to", "from", "mid" (середина вилки) или "normalized" (верхняя граница в рублях).
+    :param rates: курсы в формате hh.ru — сколько единиц валюты за 1 рубль; без них для "normalized"
+        берётся значение salary_rub, посчитанное при создании вакансии.
+    """
+    salary = vacancy.salary_range
+    if key == "to":
+        return float(salary["to"])
+    if key == "from":
+        return float(salary["from"])
+    if key == "mid":
+        return float(salary["from"] + salary["to"]) / 2
+    if key == "normalized":
+        if rates is None:
+            return vacancy.salary_rub
+        rate = rates.get(salary["currency"])
+        return float(salary["to"] / rate if rate else salary["to"])
+    raise ValueError(f"Неизвестный ключ сортировки: {key}")
+
+
+def top_n(
+    vacancies: Iterable[Vacancy],
+    n: int,
+    key: str | Callable[[Vacancy], float] = "to",
+    rates: Mapping[str, float] | None = None,
+) -> list[Vacancy]:
+    """
+    N вакансий с наибольшей зарплатой без полной сортировки (куча размера n, O(len * log n)).
+    При равных значениях сохраняется исходный порядок вакансий.
+    :param key: ключ из salary_value или своя функция Vacancy -> число.
+    :param rates: курсы валют для key="normalized" (по умолчанию — уже посчитанный salary_rub).
+    """
+    if n <= 0:
+        return []
+    if callable(key):
+        return heapq.nlargest(n, vacancies, key=key)
+    if key not in ("to", "from", "mid", "normalized"):
+        raise ValueError(f"Неизвестный ключ сортировки: {key}")
+    return heapq.nlargest(n, vacancies, key=lambda v: salary_value(v, key, rates))  # type: ignore[arg-type]
+
+
+class StringColumn:
+    """
+    Компактная колонка строк: все значения лежат в одной строке-буфере,
+    отдельно хранятся только границы значений. None поддерживается.
+    """
+
+    __slots__ = ("_buf", "_parts", "_ends", "_nulls")
+
+    def __init__(self, values: Iterable[str | None] = ()) -> None:
+        self._buf = ""
+        self._parts: list[str] = []
+        self._ends = array("Q")
+        self._nulls: set[int] = set()
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def append(self, value: str | None) -> None:
+        if value is None:
+            self._nulls.add(len(self._ends))
+            value = ""
+        end = self._ends[-1] if self._ends else 0
+        self._parts.append(value)
+        self._ends.append(end + len(value))
+
+    def extend(self, values: Iterable[str | None]) -> None:
+        for value in values:
+            self.append(value)
+
+    def extend_column(self, other: "StringColumn") -> None:
+        """Дописать все значения другой колонки, склеив буферы целиком."""
+        self._flush()
+        other._flush()
+        base = self._ends[-1] if self._ends else 0
+        count = len(self._ends)
+        self._nulls.update(count + i for i in other._nulls)
+        self._ends.extend(end + base for end in other._ends)
+        self._buf += other._buf
+
+    def _flush(self) -> None:
+        # Дописанные значения склеиваются в буфер один раз, при первом чтении
+        if self._parts:
+            self._buf += "".join(self._parts)
+            self._parts = []
+
+    def __getitem__(self, i: int) -> str | None:
+        if i < 0:
+            i += len(self._ends)
+        end = self._ends[i]
+        if i in self._nulls:
+            return None
+        self._flush()
+        return self._buf[self._ends[i - 1] if i else 0 : end]
+
+    def __iter__(self) -> Iterator[str | None]:
+        return (self[i] for i in range(len(self)))
+
+
+class VacancyTable:
+    """
+    Колоночное хранилище вакансий: зарплаты — в числовых массивах, валюта — код из справочника,
+    тексты — в компактных строковых колонках. Vacancy создаётся только при обращении к строке.
+    """
+
+    __slots__ = (
+        "salary_from",
+        "salary_to",
+        "salary_rub",
+        "currency_codes",
+        "currencies",
+        "names",
+        "urls",
+        "requirements",
+        "responsibilities",
+        "_codes",
+    )
+
+    def __init__(self) -> None:
+        self.salary_from = array("q")
+        self.salary_to = array("q")
+        # Верхняя граница зарплаты в рублях (см. Vacancy.salary_rub)
+        self.salary_rub = array("d")
+        self.currency_codes = array("H")
+        # Код 0 зарезервирован за вакансиями без указанной валюты
+        self.currencies: list[str | None] = [None]
+        self._codes: dict[str | None, int] = {None: 0}
+        self.names = StringColumn()
+        self.urls = StringColumn()
+        self.requirements = StringColumn()
+        self.responsibilities = StringColumn()
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "VacancyTable":
+        """
+        Собрать таблицу из сырых словарей API hh.ru или из сохранённых записей.
+        """
+        table = cls()
+        table.extend(records)
+        return table
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyTable":
+        table = cls()
+        for v in vacancies:
+            table.append({"name": v.name, "url": v.url, "salary_range": v.salary_range, "snippet": v.snippet})
+        return table
+
+    @classmethod
+    def concat(cls, tables: Iterable["VacancyTable"]) -> "VacancyTable":
+        """Склеить таблицы по порядку (справочники валют объединяются)."""
+        result = cls()
+        for table in tables:
+            remap = [result.currency_code(currency) for currency in table.currencies]
+            result.salary_from.extend(table.salary_from)
+            result.salary_to.extend(table.salary_to)
+            result.salary_rub.extend(table.salary_rub)
+            if remap == list(range(len(remap))):
+                result.currency_codes.extend(table.currency_codes)
+            else:
+                result.currency_codes.extend(remap[code] for code in table.currency_codes)
+            result.names.extend_column(table.names)
+            result.urls.extend_column(table.urls)
+            result.requirements.extend_column(table.requirements)
+            result.responsibilities.extend_column(table.responsibilities)
+        return result
+
+    def currency_code(self, currency: str | None) -> int:
+        """Код валюты в справочнике таблицы (новая валюта добавляется)."""
+        code = self._codes.get(currency)
+        if code is None:
+            code = self._codes[currency] = len(self.currencies)
+            self.currencies.append(currency)
+        return code
+
+    def append(self, record: dict) -> None:
+        salary = record.get("salary_range") or record.get("salary") or {}
+        frm = salary.get("from") or 0
+        to = salary.get("to") or 0
+        snippet = record.get("snippet") or {}
+        currency = salary.get("currency")
+        self.salary_from.append(int(frm))
+        self.salary_to.append(int(max(to, frm)))
+        self.salary_rub.append(default_rates().to_rub(max(to, frm), currency))
+        self.currency_codes.append(self.currency_code(currency))
+        self.names.append(record["name"].strip())
+        self.urls.append((record.get("alternate_url") or record["url"]).strip())
+        self.requirements.append(snippet.get("requirement"))
+        self.responsibilities.append(snippet.get("responsibility"))
+
+    def extend(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.salary_to)
+
+    def salary_range(self, i: int) -> dict:
+        return {
+            "currency": self.currencies[self.currency_codes[i]],
+            "from": self.salary_from[i],
+            "to": self.salary_to[i],
+        }
+
+    def snippet(self, i: int) -> dict:
+        return {"requirement": self.requirements[i], "responsibility": self.responsibilities[i]}
+
+    def record(self, i: int) -> dict:
+        """Строка таблицы в формате сохранённой записи."""
+        return {
+            "name": self.names[i],
+            "url": self.urls[i],
+            "salary_range": self.salary_range(i),
+            "snippet": self.snippet(i),
+        }
+
+    def __getitem__(self, i: int) -> Vacancy:
+        return Vacancy(self.names[i], self.urls[i], self.salary_range(i), self.snippet(i))  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[Vacancy]:
+        return (self[i] for i in range(len(self)))
+
+    def take(self, indices: Iterable[int]) -> "VacancyTable":
+        """Новая таблица из выбранных строк (в указанном порядке)."""
+        table = VacancyTable()
+        for i in indices:
+            table.append(self.record(i))
+        return table
+
+    def where(
+        self,
+        min_salary: int | None = None,
+        max_salary: int | None = None,
+        currency: str | None = None,
+    ) -> list[int]:
+        """
+        Номера строк с верхней границей зарплаты в [min_salary, max_salary] и указанной валютой.
+        Сравнения идут по колонкам, без создания Vacancy.
+        """
+        rows: Iterable[int] = range(len(self))
+        if currency is not None:
+            code = self._codes.get(currency)
+            if code is None:
+                return []
+            codes = self.currency_codes
+            rows = [i for i in rows if codes[i] == code]
+        to = self.salary_to
+        if min_salary is not None:
+            rows = [i for i in rows if to[i] >= min_salary]
+        if max_salary is not None:
+            rows = [i for i in rows if to[i] <= max_salary]
+        return list(rows)
+
+    def column(self, name: str) -> array:
+        """Числовая колонка зарплаты: "to", "from" или "normalized" (в рублях)."""
+        columns: dict[str, array] = {"to": self.salary_to, "from": self.salary_from, "normalized": self.salary_rub}
+        if name not in columns:
+            raise ValueError(f"Неизвестная колонка: {name}")
+        return columns[name]
+
+    def top_n(self, n: int, column: str = "to") -> list[int]:
+        """Номера n строк с наибольшим значением колонки (см. column), без полной сортировки."""
+        return heapq.nlargest(n, range(len(self)), key=self.column(column).__getitem__)
+
+    def argsort(self, column: str = "to", reverse: bool = False) -> list[int]:
+        """Номера строк, упорядоченные по колонке зарплаты (см. column)."""
+        return sorted(range(len(self)), key=self.column(column).__getitem__, reverse=reverse)
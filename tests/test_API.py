@@ -1,38 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from time import sleep as real_sleep
+
 import pytest
 import requests
 
 from src.API import HeadHunterAPI
+from src.httpcache import ResponseCache
+from src.ratelimit import RateLimiter, set_shared_limiter
 from _pytest.monkeypatch import MonkeyPatch
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 
 class DummyResponse:
-    def __init__(self, status_code: int, items: List[Union[Dict[str, int], Any]]):
+    def __init__(
+        self,
+        status_code: int,
+        items: List[Union[Dict[str, int], Any]],
+        pages: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
         self.status_code = status_code
+        self.headers = headers or {}
         # Предположим, API возвращает JSON-объект со списком "items"
-        self._data = {"items": items}
+        self._data: Dict[str, Any] = {"items": items}
+        if pages is not None:
+            self._data["pages"] = pages
 
-    def json(self) -> Dict[str, Union[List[Dict[str, int]], List[Any]]]:
+    def json(self) -> Dict[str, Any]:
         return self._data
 
 
-def make_dummy_request_fn(page_to_items_map: dict, status_map: Optional[Dict[int, int]]=None) -> object:
+def make_dummy_request_fn(
+    page_to_items_map: dict, status_map: Optional[Dict[int, int]] = None, pages: Optional[int] = None
+) -> object:
     """
-    Возвращает функцию для monkeypatch, которая имитирует requests.get.
+    Возвращает функцию для monkeypatch, которая имитирует requests.Session.get.
     - page_to_items_map: dict, где ключ = номер страницы, значение = список items
     - status_map (опционально): dict, где ключ = номер страницы, значение = status_code
+    - pages (опционально): число страниц, которое сообщает API
     """
 
-    def _dummy_get(url: Any, headers: Any, params: Any) -> object:
+    def _dummy_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
         page = params.get("page", 0)
         # Если статус указан вручную — используем его, иначе 200
         status = status_map.get(page, 200) if status_map else 200
         items = page_to_items_map.get(page, [])
-        return DummyResponse(status, items)
+        return DummyResponse(status, items, pages=pages)
 
     return _dummy_get
 
 
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: MonkeyPatch) -> Iterator[List[float]]:
+    """Паузы между повторами не ждём, а только запоминаем. Общий планировщик у каждого теста свой."""
+    delays: List[float] = []
+    monkeypatch.setattr("src.API.time.sleep", delays.append)
+    set_shared_limiter(None)
+    yield delays
+    set_shared_limiter(None)
+
+
+class FakeClock:
+    """Поддельные монотонные часы: sleep не ждёт, а сдвигает время."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
 def test_load_vacancies_accumulates_20_pages(monkeypatch: MonkeyPatch) -> None:
     """
     Проверяем, что HeadHunterAPI.load_vacancies()
@@ -42,7 +84,7 @@ def test_load_vacancies_accumulates_20_pages(monkeypatch: MonkeyPatch) -> None:
     # Для страниц 0..19 возвращаем по одному элементу; для 20 не вызываем, т.к. цикл прекращается
     page_to_items = {i: [{"id": i}] for i in range(20)}
     dummy_fn = make_dummy_request_fn(page_to_items)
-    monkeypatch.setattr(requests, "get", dummy_fn)
+    monkeypatch.setattr(requests.Session, "get", dummy_fn)
 
     api = HeadHunterAPI()
     api.load_vacancies("python")
@@ -54,20 +96,81 @@ def test_load_vacancies_accumulates_20_pages(monkeypatch: MonkeyPatch) -> None:
     assert ids == list(range(20))
 
 
-def test_load_vacancies_connection_error(monkeypatch: MonkeyPatch) -> None:
+def test_load_vacancies_connection_error(monkeypatch: MonkeyPatch, no_sleep: List[float]) -> None:
     """
-    Если первый запрос возвращает статус != 200, ожидаем ConnectionError.
+    Если запрос стабильно возвращает статус != 200, после всех повторов ожидаем ConnectionError.
     """
     # Для страницы 0 вернём статус 500
     page_to_items: dict = {0: []}
     status_map = {0: 500}
     dummy_fn = make_dummy_request_fn(page_to_items, status_map=status_map)
-    monkeypatch.setattr(requests, "get", dummy_fn)
+    monkeypatch.setattr(requests.Session, "get", dummy_fn)
 
-    api = HeadHunterAPI()
+    api = HeadHunterAPI(retries=2, backoff=0.5)
     with pytest.raises(ConnectionError) as excinfo:
         api.load_vacancies("java")
     assert "Ошибка запроса: 500" in str(excinfo.value)
+    # Две паузы с экспоненциальным ростом перед последней попыткой
+    assert no_sleep == [0.5, 1.0]
+
+
+def test_load_vacancies_client_error_is_not_retried(monkeypatch: MonkeyPatch) -> None:
+    """
+    Ошибки 4xx (кроме 429) повторять бессмысленно — ConnectionError сразу.
+    """
+    calls = []
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        calls.append(params["page"])
+        return DummyResponse(400, [])
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+
+    api = HeadHunterAPI(retries=3)
+    with pytest.raises(ConnectionError, match="Ошибка запроса: 400"):
+        api.load_vacancies("go")
+    assert calls == [0]
+
+
+def test_load_vacancies_retries_429_and_5xx(monkeypatch: MonkeyPatch) -> None:
+    """
+    429 и 5xx повторяются; Retry-After от сервера имеет приоритет над backoff.
+    """
+    clock = FakeClock()
+    monkeypatch.setattr("src.API.time.sleep", clock.sleep)
+    monkeypatch.setattr("src.API.time.monotonic", clock.monotonic)
+    responses = [
+        DummyResponse(429, [], headers={"Retry-After": "2"}),
+        DummyResponse(503, []),
+        DummyResponse(200, [{"id": 1}], pages=1),
+    ]
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+
+    api = HeadHunterAPI(retries=3, backoff=0.1)
+    api.load_vacancies("kotlin")
+    assert api.vacancies == [{"id": 1}]
+    # Пауза после 429 выдерживается в планировщике, после 503 — в самом запросе
+    assert clock.sleeps == [2.0, 0.2]
+    assert api.limiter.penalties == 1
+
+
+def test_load_vacancies_retries_network_errors(monkeypatch: MonkeyPatch) -> None:
+    """
+    Сетевые ошибки requests повторяются, а после исчерпания попыток превращаются в ConnectionError.
+    """
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        raise requests.Timeout("timed out")
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+
+    api = HeadHunterAPI(retries=1)
+    with pytest.raises(ConnectionError, match="timed out"):
+        api.load_vacancies("scala")
 
 
 def test_load_vacancies_partial_empty_pages_then_continue(monkeypatch: MonkeyPatch) -> None:
@@ -80,7 +183,7 @@ def test_load_vacancies_partial_empty_pages_then_continue(monkeypatch: MonkeyPat
     for i in range(10, 20):
         page_to_items[i] = []
     dummy_fn = make_dummy_request_fn(page_to_items)
-    monkeypatch.setattr(requests, "get", dummy_fn)
+    monkeypatch.setattr(requests.Session, "get", dummy_fn)
 
     api = HeadHunterAPI()
     api.load_vacancies("c++")
@@ -91,26 +194,370 @@ def test_load_vacancies_partial_empty_pages_then_continue(monkeypatch: MonkeyPat
     assert ids == list(range(10))
 
 
+def test_load_vacancies_stops_at_reported_pages(monkeypatch: MonkeyPatch) -> None:
+    """
+    Если API сообщает, что страниц меньше 20, лишние страницы не запрашиваются.
+    """
+    calls = []
+    page_to_items = {i: [{"id": i}] for i in range(3)}
+    dummy_fn = make_dummy_request_fn(page_to_items, pages=3)
+
+    def _capture_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        calls.append(params["page"])
+        return dummy_fn(self, url, headers=headers, params=params)  # type: ignore[operator]
+
+    monkeypatch.setattr(requests.Session, "get", _capture_get)
+
+    api = HeadHunterAPI(max_workers=8)
+    api.load_vacancies("php")
+
+    assert sorted(calls) == [0, 1, 2]
+    assert [item["id"] for item in api.vacancies] == [0, 1, 2]
+
+
+def test_load_vacancies_keeps_page_order_with_concurrency(monkeypatch: MonkeyPatch) -> None:
+    """
+    Страницы, завершившиеся не по порядку, всё равно складываются в self.vacancies по номеру страницы.
+    """
+    def _slow_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        page = params["page"]
+        # Ранние страницы отвечают медленнее поздних
+        real_sleep(0.002 * (20 - page))
+        return DummyResponse(200, [{"id": page}], pages=20)
+
+    monkeypatch.setattr(requests.Session, "get", _slow_get)
+
+    api = HeadHunterAPI(max_workers=8)
+    api.load_vacancies("swift")
+    assert [item["id"] for item in api.vacancies] == list(range(20))
+
+
+def test_load_vacancies_uses_shared_session() -> None:
+    """
+    Все страницы идут через одну сессию с пулом соединений под число потоков.
+    """
+    api = HeadHunterAPI(max_workers=6)
+    assert isinstance(api.session, requests.Session)
+    assert api.session.headers["User-Agent"] == HeadHunterAPI.headers["User-Agent"]
+    assert api.session.get_adapter("https://api.hh.ru")._pool_maxsize == 6  # type: ignore[attr-defined]
+
+    own = requests.Session()
+    assert HeadHunterAPI(session=own).session is own
+
+
 def test_load_vacancies_text_parameter_passed(monkeypatch: MonkeyPatch) -> None:
     """
     Проверяем, что параметр 'text' в запросе действительно передаётся в каждый вызов.
     """
     calls = []
 
-    def _capture_get(url: Any, headers: Any, params: Any) -> object:
+    def _capture_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
         calls.append(params.copy())
         # Возвращаем минимальный "пустой" ответ, 20 итераций
         page = params.get("page", 0)
         items = [{"dummy": page}] if page < 1 else []
         return DummyResponse(200, items)
 
-    monkeypatch.setattr(requests, "get", _capture_get)
+    monkeypatch.setattr(requests.Session, "get", _capture_get)
 
     api = HeadHunterAPI()
     api.load_vacancies("rust")
 
+    # Страницы грузятся параллельно, поэтому порядок вызовов не фиксирован
+    calls.sort(key=lambda c: c["page"])
     # Проверяем первые два вызова: page=0 с text="rust" и page=1 с text="rust"
     assert calls[0]["text"] == "rust" and calls[0]["page"] == 0
     assert calls[1]["text"] == "rust" and calls[1]["page"] == 1
     # Всего должно быть ровно 20 итераций (page 0..19)
     assert len(calls) == 20
+    assert all(c["text"] == "rust" for c in calls)
+
+
+def make_keyword_request_fn(keyword_to_pages: Dict[str, List[List[dict]]], calls: Optional[list] = None) -> object:
+    """
+    Имитация requests.Session.get для нескольких ключевых слов:
+    keyword_to_pages[text][page] — список items этой страницы.
+    """
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        if calls is not None:
+            calls.append((params["text"], params["page"]))
+        pages = keyword_to_pages[params["text"]]
+        return DummyResponse(200, pages[params["page"]], pages=len(pages))
+
+    return _get
+
+
+def test_load_vacancies_deduplicates_across_calls(monkeypatch: MonkeyPatch) -> None:
+    """
+    Повторный поиск с пересекающимися результатами не дублирует вакансии.
+    """
+    pages = {
+        "python": [[{"id": "1"}, {"id": "2"}], [{"id": "3"}]],
+        "django": [[{"id": "2"}, {"id": "4"}]],
+    }
+    monkeypatch.setattr(requests.Session, "get", make_keyword_request_fn(pages))
+
+    api = HeadHunterAPI()
+    api.load_vacancies("python")
+    api.load_vacancies("django")
+    api.load_vacancies("python")
+
+    assert [v["id"] for v in api.vacancies] == ["1", "2", "3", "4"]
+    assert api.keywords_for({"id": "2"}) == ["python", "django"]
+    assert api.keywords_for({"alternate_url": "https://hh.ru/vacancy/4"}) == ["django"]
+    assert api.keywords_for({"id": "404"}) == []
+
+
+def test_load_vacancies_many_merges_and_reports_keywords(monkeypatch: MonkeyPatch) -> None:
+    """
+    Пакетный поиск: все страницы всех слов загружаются, результат без повторов,
+    для каждой вакансии известны совпавшие ключевые слова.
+    """
+    calls: list = []
+    pages: Dict[str, List[List[dict]]] = {
+        "python": [[{"id": "1"}, {"id": "2"}], [{"id": "3"}, {"id": "5"}]],
+        "sql": [[{"id": "3"}], [{"id": "1"}], [{"id": "6"}]],
+        "go": [[]],
+    }
+    monkeypatch.setattr(requests.Session, "get", make_keyword_request_fn(pages, calls))
+
+    api = HeadHunterAPI(max_workers=3)
+    api.load_vacancies_many(["python", "sql", "go", "python", ""])
+
+    assert sorted(calls) == [("go", 0), ("python", 0), ("python", 1), ("sql", 0), ("sql", 1), ("sql", 2)]
+    assert [v["id"] for v in api.vacancies] == ["1", "2", "3", "5", "6"]
+    assert api.matches == {
+        "1": ["python", "sql"],
+        "2": ["python"],
+        "3": ["sql", "python"],
+        "5": ["python"],
+        "6": ["sql"],
+    }
+
+
+def test_load_vacancies_many_empty_keywords(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(requests.Session, "get", make_keyword_request_fn({}))
+    api = HeadHunterAPI()
+    api.load_vacancies_many([])
+    assert api.vacancies == []
+
+
+def test_rate_limit_spaces_requests(monkeypatch: MonkeyPatch, no_sleep: List[float]) -> None:
+    """
+    При rate_limit запросы распределяются не чаще 1/rate_limit секунды.
+    """
+    clock = [100.0]
+    monkeypatch.setattr("src.API.time.monotonic", lambda: clock[0])
+    pages = {"rust": [[{"id": str(i)}] for i in range(4)]}
+    monkeypatch.setattr(requests.Session, "get", make_keyword_request_fn(pages))
+
+    api = HeadHunterAPI(max_workers=1, rate_limit=10)
+    api.load_vacancies("rust")
+
+    assert len(api.vacancies) == 4
+    # Первый запрос сразу, дальше — ожидание своего слота (часы в тесте стоят на месте)
+    assert no_sleep == pytest.approx([0.1, 0.2, 0.3])
+
+
+def test_429_slows_down_every_client_of_shared_limiter(monkeypatch: MonkeyPatch) -> None:
+    """
+    429 одному клиенту приостанавливает и замедляет все клиенты с тем же планировщиком.
+    """
+    clock = FakeClock()
+    monkeypatch.setattr("src.API.time.sleep", clock.sleep)
+    monkeypatch.setattr("src.API.time.monotonic", clock.monotonic)
+    responses = {"sync": [DummyResponse(429, [], headers={"Retry-After": "5"})]}
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        queue = responses.get(params["text"])
+        return queue.pop(0) if queue else DummyResponse(200, [{"id": params["text"]}], pages=1)
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+    limiter = RateLimiter(rate=10)
+    background = HeadHunterAPI(limiter=limiter, retries=0)
+    interactive = HeadHunterAPI(limiter=limiter)
+
+    with pytest.raises(ConnectionError, match="429"):
+        background.load_vacancies("sync")
+    interactive.load_vacancies("python")
+    interactive.load_vacancies("java")
+
+    assert interactive.vacancies == [{"id": "python"}, {"id": "java"}]
+    assert limiter.rate == pytest.approx(5.2)
+    # Пауза Retry-After, затем интервал между запросами уже не 0.1, а 1/5 секунды
+    assert clock.sleeps == [5.0, 0.2]
+
+
+class CachingServer:
+    """
+    Поддельный транспорт с поддержкой ETag: отвечает 304, если версия страницы не изменилась.
+    """
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.calls: List[tuple] = []
+
+    def get(self, session: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        etag = f'"v{self.version}"'
+        self.calls.append((params["page"], headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == etag:
+            return DummyResponse(304, [], headers={"ETag": etag})
+        items: List[Any] = [{"id": f"{params['page']}-{self.version}"}]
+        return DummyResponse(200, items, pages=2, headers={"ETag": etag})
+
+
+@pytest.fixture
+def server(monkeypatch: MonkeyPatch) -> CachingServer:
+    server = CachingServer()
+    monkeypatch.setattr(requests.Session, "get", lambda session, *args, **kwargs: server.get(session, *args, **kwargs))
+    return server
+
+
+def test_cache_hit_skips_network(tmp_path: Any, server: CachingServer) -> None:
+    """
+    Повторная загрузка того же ключевого слова в пределах TTL не ходит в сеть.
+    """
+    cache = ResponseCache(str(tmp_path), ttl=600)
+    HeadHunterAPI(cache=cache).load_vacancies("python")
+    assert sorted(server.calls) == [(0, None), (1, None)]
+
+    api = HeadHunterAPI(cache=cache)
+    api.load_vacancies("python")
+    assert len(server.calls) == 2
+    assert [v["id"] for v in api.vacancies] == ["0-1", "1-1"]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_cache_stale_entry_is_revalidated(tmp_path: Any, server: CachingServer) -> None:
+    """
+    Устаревшая запись перепроверяется с If-None-Match; 304 продлевает её, 200 заменяет.
+    """
+    clock = [1000.0]
+    cache = ResponseCache(str(tmp_path), ttl=60, clock=lambda: clock[0])
+    HeadHunterAPI(cache=cache).load_vacancies("python")
+    server.calls.clear()
+
+    clock[0] += 120
+    api = HeadHunterAPI(cache=cache, stale_while_revalidate=False)
+    api.load_vacancies("python")
+    assert sorted(server.calls) == [(0, '"v1"'), (1, '"v1"')]
+    assert cache.revalidated == 2
+    assert [v["id"] for v in api.vacancies] == ["0-1", "1-1"]
+
+    clock[0] += 120
+    server.version = 2
+    api = HeadHunterAPI(cache=cache, stale_while_revalidate=False)
+    api.load_vacancies("python")
+    assert [v["id"] for v in api.vacancies] == ["0-2", "1-2"]
+
+
+def test_cache_serves_stale_while_revalidating(tmp_path: Any, server: CachingServer) -> None:
+    """
+    По умолчанию устаревшая запись отдаётся сразу, а свежая версия загружается в фоне.
+    """
+    clock = [1000.0]
+    cache = ResponseCache(str(tmp_path), ttl=60, clock=lambda: clock[0])
+    HeadHunterAPI(cache=cache).load_vacancies("python")
+    server.version = 2
+    clock[0] += 120
+
+    api = HeadHunterAPI(cache=cache)
+    api.load_vacancies("python")
+    assert [v["id"] for v in api.vacancies] == ["0-1", "1-1"]
+    api.wait_revalidation()
+
+    api = HeadHunterAPI(cache=cache)
+    api.load_vacancies("python")
+    assert [v["id"] for v in api.vacancies] == ["0-2", "1-2"]
+
+
+def test_unexpected_304_is_an_error(monkeypatch: MonkeyPatch) -> None:
+    """
+    304 без условного запроса — ошибка, а не пустая страница.
+    """
+    monkeypatch.setattr(requests.Session, "get", make_dummy_request_fn({}, status_map={0: 304}))
+    with pytest.raises(ConnectionError, match="304"):
+        HeadHunterAPI().load_vacancies("python")
+
+
+def test_iter_pages_is_lazy(monkeypatch: MonkeyPatch) -> None:
+    """
+    iter_pages запрашивает следующую страницу только по требованию и передаёт доп. параметры.
+    """
+    calls: list = []
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        calls.append((params["page"], params["order_by"]))
+        return DummyResponse(200, [{"id": params["page"]}], pages=5)
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+
+    pages = HeadHunterAPI().iter_pages("python", order_by="publication_time")
+    assert next(pages)["items"] == [{"id": 0}]
+    assert next(pages)["items"] == [{"id": 1}]
+    pages.close()
+    assert calls == [(0, "publication_time"), (1, "publication_time")]
+
+
+def test_load_vacancies_sharded_splits_capped_windows(monkeypatch: MonkeyPatch) -> None:
+    """Окно, в котором найдено больше предела API, делится пополам; вакансии всех окон сливаются без повторов."""
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    # 450 вакансий за сутки, причём половина — за первый час
+    published = [start + timedelta(seconds=8 * i) for i in range(225)]
+    published += [start + timedelta(hours=1, seconds=300 * i) for i in range(225)]
+    items: List[Dict[str, Any]] = [{"id": str(i), "published_at": moment} for i, moment in enumerate(published)]
+    queries: List[Dict[str, Any]] = []
+
+    def fake_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> DummyResponse:
+        queries.append(params)
+        low, high = datetime.fromisoformat(params["date_from"]), datetime.fromisoformat(params["date_to"])
+        found = [item for item in items if low <= item["published_at"] <= high]
+        page, per_page = params["page"], params["per_page"]
+        response = DummyResponse(200, found[page * per_page : (page + 1) * per_page], pages=-(-len(found) // per_page))
+        response._data["found"] = len(found)
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    api = HeadHunterAPI(max_workers=3)
+    # Предел выдачи — 200 вакансий на запрос
+    api.max_pages = 2
+    windows = api.load_vacancies_sharded("python", start, start + timedelta(days=1))
+
+    assert sorted(int(v["id"]) for v in api.vacancies) == list(range(450))
+    assert windows > 1
+    assert all(q["text"] == "python" and q["page"] < 2 for q in queries)
+
+
+def test_load_vacancies_sharded_stops_at_min_window(monkeypatch: MonkeyPatch) -> None:
+    """Окно короче min_window не делится, даже если выдача в нём обрезана."""
+
+    def fake_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> DummyResponse:
+        response = DummyResponse(200, [{"id": f"{params['date_from']}-{params['page']}"}], pages=100)
+        response._data["found"] = 10**6
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    api = HeadHunterAPI()
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert api.load_vacancies_sharded("python", start, start + timedelta(minutes=4)) == 7
+    # 4 окна по минуте, по 20 страниц в каждом
+    assert len(api.vacancies) == 4 * 20
+
+
+def test_load_vacancies_sharded_stops_at_whole_seconds(monkeypatch: MonkeyPatch) -> None:
+    """Окно не делится, если округлённая до секунды середина совпадает с его началом."""
+
+    def fake_get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> DummyResponse:
+        response = DummyResponse(200, [{"id": f"{params['date_from']}-{params['page']}"}], pages=1)
+        response._data["found"] = 10**6
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    api = HeadHunterAPI()
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    end = start + timedelta(seconds=1, milliseconds=500)
+    assert api.load_vacancies_sharded("python", start, end, min_window=timedelta(seconds=1)) == 1
+
+    with pytest.raises(ValueError):
+        api.load_vacancies_sharded("python", start, end, min_window=timedelta(milliseconds=500))
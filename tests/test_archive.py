@@ -0,0 +1,40 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from src.archive import available, detect, open_stream
+
+
+@pytest.mark.parametrize("codec", available())
+def test_open_stream_roundtrip_and_append(tmp_path: Path, codec: str) -> None:
+    """
+    Дозапись добавляет новый сжатый блок, при чтении блоки склеиваются.
+    """
+    path = str(tmp_path / "data.bin")
+    with open_stream(path, "wb", codec=codec) as f:
+        f.write(b"first\n")
+    with open_stream(path, "ab") as f:
+        f.write(b"second\n")
+    assert detect(path) == codec
+    with open_stream(path, "rb") as f:
+        assert f.read() == b"first\nsecond\n"
+
+
+def test_detect_by_extension_and_magic(tmp_path: Path) -> None:
+    assert detect(str(tmp_path / "v.jsonl.gz")) == "gzip"
+    assert detect(str(tmp_path / "v.jsonl.XZ")) == "xz"
+    assert detect(str(tmp_path / "v.jsonl")) is None
+
+    # Содержимое важнее расширения
+    misnamed = tmp_path / "v.jsonl"
+    misnamed.write_bytes(gzip.compress(b"{}\n"))
+    assert detect(str(misnamed)) == "gzip"
+    plain = tmp_path / "plain.gz"
+    plain.write_bytes(b"{}\n")
+    assert detect(str(plain)) is None
+
+
+def test_unknown_codec(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        open_stream(str(tmp_path / "v.bin"), "wb", codec="snappy")
@@ -0,0 +1,37 @@
+from benchmarks.run import compare, run
+from benchmarks.stubserver import StubServer
+from benchmarks.synthetic import generate, raw_items
+from src.API import HeadHunterAPI
+from src.vacutils import Vacancy
+
+
+def test_synthetic_data_is_deterministic_and_valid() -> None:
+    assert list(generate(20, seed=1)) == list(generate(20, seed=1))
+    assert list(generate(20, seed=1)) != list(generate(20, seed=2))
+
+    # Записи проходят те же проверки, что и данные API
+    vacancies = Vacancy.from_raw_many(raw_items(200))
+    assert len(vacancies) == 200
+    assert {v.salary_range["currency"] for v in vacancies} >= {None, "RUR"}
+
+
+def test_stub_server_serves_pages_for_api() -> None:
+    with StubServer(pages=3, per_page=10) as server:
+        api_class = type("StubHeadHunterAPI", (HeadHunterAPI,), {"url": server.url})
+        api = api_class(max_workers=2)
+        api.load_vacancies("python")
+        assert server.requests == 3
+    assert len(api.vacancies) == 30
+
+
+def test_run_and_compare() -> None:
+    results = run([50], repeat=1, cases=["vacancy.from_raw_many", "top_n.normalized"])
+    assert set(results) == {"vacancy.from_raw_many@50", "top_n.normalized@50"}
+    assert all(r["seconds"] > 0 and r["peak_bytes"] >= 0 for r in results.values())
+
+    baseline = {"slow@10": {"seconds": 0.010, "peak_bytes": 1 << 20}, "tiny@10": {"seconds": 0.0001, "peak_bytes": 0}}
+    current = {"slow@10": {"seconds": 0.020, "peak_bytes": 1 << 20}, "tiny@10": {"seconds": 0.0005, "peak_bytes": 10}}
+    regressions = compare(current, baseline, threshold=0.3)
+    # Сверхкороткие замеры шумят и не сравниваются
+    assert len(regressions) == 1 and regressions[0].startswith("slow@10")
+    assert compare(current, current) == []
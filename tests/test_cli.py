@@ -0,0 +1,134 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+
+from src.cli import main
+from src.fileutils import JSONLinesVacancyFileHandler, JSONVacancyFileHandler
+
+RECORDS = [
+    {
+        "name": "Python-разработчик",
+        "url": "https://hh.ru/vacancy/1",
+        "salary_range": {"currency": "RUR", "from": 100000, "to": 150000},
+        "snippet": {"requirement": "Python, Django", "responsibility": None},
+    },
+    {
+        "name": "Java developer",
+        "url": "https://hh.ru/vacancy/2",
+        "salary_range": {"currency": "USD", "from": 3000, "to": 4000},
+        "snippet": {"requirement": "Java, Spring. Python будет плюсом."},
+    },
+    {
+        "name": "Стажёр",
+        "url": "https://hh.ru/vacancy/3",
+        "salary_range": {"currency": None, "from": 0, "to": 0},
+        "snippet": {},
+    },
+]
+
+
+def run(*argv: str) -> List[Any]:
+    out = io.StringIO()
+    assert main(list(argv), out) == 0
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> str:
+    path = str(tmp_path / "vacancies.jsonl")
+    JSONLinesVacancyFileHandler(path).write_vacs(RECORDS)
+    return path
+
+
+def test_top(store: str) -> None:
+    # 4000 USD больше 150000 RUR в пересчёте на рубли
+    assert [r["url"] for r in run("top", "2", "-i", store)] == ["https://hh.ru/vacancy/2", "https://hh.ru/vacancy/1"]
+    assert [r["url"] for r in run("top", "1", "-i", store, "--key", "to")] == ["https://hh.ru/vacancy/1"]
+
+
+def test_search_jsonl_and_json(store: str, tmp_path: Path) -> None:
+    assert [r["url"] for r in run("search", "python", "-i", store)] == [
+        "https://hh.ru/vacancy/1",
+        "https://hh.ru/vacancy/2",
+    ]
+    assert run("search", "python", "-i", store, "--limit", "1")[0] == RECORDS[0]
+    assert Path(store + ".fts.json").exists()
+
+    json_path = str(tmp_path / "vacancies.json")
+    JSONVacancyFileHandler(json_path).write_vacs(RECORDS, indent=2)
+    assert [r["url"] for r in run("search", "spring", "-i", json_path)] == ["https://hh.ru/vacancy/2"]
+
+
+def test_export_and_clear(store: str, tmp_path: Path) -> None:
+    assert run("export", "-i", store) == RECORDS
+
+    archive = str(tmp_path / "archive.jsonl.gz")
+    assert run("export", "-i", store, "-o", archive) == [{"exported": 3, "output": archive}]
+    assert run("export", "-i", archive) == RECORDS
+
+    assert run("clear", "-i", store) == [{"cleared": store}]
+    assert run("export", "-i", store) == []
+
+
+def test_fetch_upserts_into_store(store: str, monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    class Response:
+        status_code = 200
+        headers: dict = {}
+        content = b""
+
+        def json(self) -> dict:
+            return {
+                "items": [
+                    {
+                        "id": "1",
+                        "name": "Python-разработчик",
+                        "alternate_url": "https://hh.ru/vacancy/1",
+                        "salary": RECORDS[0]["salary_range"],
+                        "snippet": RECORDS[0]["snippet"],
+                    },
+                    {"id": "4", "name": "Golang", "alternate_url": "https://hh.ru/vacancy/4", "salary": None},
+                ],
+                "pages": 1,
+            }
+
+    monkeypatch.setattr(requests.Session, "get", lambda self, url, **kwargs: Response())
+    metrics_path = tmp_path / "metrics.json"
+    summary = run("--metrics", str(metrics_path), "fetch", "python", "-o", store)
+    assert summary == [{"fetched": 2, "output": store, "added": 1, "updated": 0}]
+    assert len(JSONLinesVacancyFileHandler(store).load_vacs()) == 4
+    assert run("compact", "-i", store) == [{"freed_bytes": 0, "input": store}]
+    assert json.loads(metrics_path.read_text(encoding="utf-8"))["counters"]["http.requests"] == 1
+
+
+def test_errors_go_to_stderr(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    assert main(["top", "3", "-i", str(tmp_path / "missing.jsonl")], io.StringIO()) == 1
+    assert "Ошибка" in capsys.readouterr().err
+
+
+def test_offline_commands_do_not_import_requests() -> None:
+    """
+    CLI и main.py можно импортировать без побочных эффектов: requests не загружается, меню не запускается.
+    """
+    code = "import sys, src.cli; print('requests' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+    code = "import main"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, input="", timeout=30)
+    assert result.returncode == 0 and "Меню" not in result.stdout
+
+
+def test_stats(store: str) -> None:
+    [summary] = run("stats", "-i", store, "--above", "3500", "--percentiles", "50")
+    assert summary["currencies"]["RUR"]["percentiles"] == {"50": 150000}
+    assert summary["above"] == {"RUR": 1, "USD": 1}
+    [summary] = run("stats", "-i", store, "--keyword", "django", "--bins", "0")
+    assert list(summary["currencies"]) == ["RUR"]
+    assert "histogram" not in summary["currencies"]["RUR"]
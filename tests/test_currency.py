@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src import currency
+from src.currency import FALLBACK_RATES, CurrencyRates, default_rates, set_default_rates
+
+
+def test_to_rub() -> None:
+    rates = CurrencyRates({"RUR": 1, "USD": 0.0125})
+    assert rates.to_rub(1000, "USD") == 80_000
+    assert rates.to_rub(1000, "RUR") == 1000
+    # Неизвестная валюта и вакансии без зарплаты не пересчитываются
+    assert rates.to_rub(1000, "XXX") == 1000
+    assert rates.to_rub(0, None) == 0
+
+
+def test_load_plain_and_hh_dictionary_formats(tmp_path: Path) -> None:
+    plain = tmp_path / "plain.json"
+    plain.write_text(json.dumps({"RUR": 1, "EUR": 0.01}), encoding="utf-8")
+    assert CurrencyRates.load(str(plain)).rates == {"RUR": 1.0, "EUR": 0.01}
+
+    hh = tmp_path / "hh.json"
+    rates = {"currency": [{"code": "RUR", "rate": 1}, {"code": "KZT", "rate": 6.0}]}
+    hh.write_text(json.dumps(rates), encoding="utf-8")
+    assert CurrencyRates.load(str(hh)).to_rub(600, "KZT") == 100
+
+
+def test_missing_file_falls_back_and_refresh(tmp_path: Path) -> None:
+    path = tmp_path / "rates.json"
+    rates = CurrencyRates.load(str(path))
+    assert rates.rates == FALLBACK_RATES
+
+    CurrencyRates({"RUR": 1, "USD": 0.02}).save(str(path))
+    rates.refresh()
+    assert rates.to_rub(10, "USD") == 500
+
+
+def test_default_rates_can_be_replaced(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(currency, "_default", None)
+    assert default_rates() is default_rates()
+    custom = CurrencyRates({"RUR": 1})
+    set_default_rates(custom)
+    assert default_rates() is custom
@@ -0,0 +1,55 @@
+import pytest
+
+from src.dedup import NearDuplicateIndex, collapse, shingles
+from src.vacutils import Vacancy
+
+TEXT = (
+    "Разработка backend-сервисов на Python и Django, проектирование REST API, код-ревью, "
+    "оптимизация запросов к PostgreSQL, написание тестов, участие в планировании спринтов"
+)
+
+
+def vacancy(n: int, name: str, requirement: str) -> Vacancy:
+    return Vacancy(name, f"https://hh.ru/vacancy/{n}", None, {"requirement": requirement, "responsibility": None})
+
+
+def test_shingles() -> None:
+    assert shingles("Python, Django и <highlighttext>REST</highlighttext>", 3) == {
+        "python django и",
+        "django и rest",
+    }
+    assert shingles("Python", 3) == {"python"}
+    assert shingles(None) == set()
+
+
+def test_reposted_vacancy_is_grouped() -> None:
+    index = NearDuplicateIndex(threshold=0.7)
+    first = index.add(vacancy(1, "Python-разработчик", TEXT))
+    index.add(vacancy(2, "Java-разработчик", "Java, Spring Boot, Kafka, микросервисы, Kubernetes и Helm"))
+    # Та же вакансия с другим URL и небольшой правкой в конце
+    repost = index.add(vacancy(3, "Python-разработчик", TEXT + ", наставничество"))
+    assert index.cluster_of(repost) == first
+    assert index.clusters() == [[0, 2]]
+    assert index.query(vacancy(4, "Python-разработчик", TEXT)) == [0, 2]
+    assert index.similarity(index.signatures[0], index.signatures[0]) == 1  # type: ignore[arg-type]
+
+
+def test_empty_text_is_not_duplicate() -> None:
+    index = NearDuplicateIndex()
+    index.add_many([vacancy(1, "—", ""), vacancy(2, "—", "")])
+    assert index.clusters() == []
+    assert index.query(vacancy(3, "—", "")) == []
+
+
+def test_collapse_keeps_one_per_group() -> None:
+    vacancies = [
+        vacancy(1, "Python-разработчик", TEXT),
+        vacancy(2, "Java-разработчик", "Java, Spring Boot, Kafka, микросервисы"),
+        vacancy(3, "Python-разработчик", TEXT),
+    ]
+    assert [v.url for v in collapse(vacancies)] == ["https://hh.ru/vacancy/1", "https://hh.ru/vacancy/2"]
+    assert [v.url for v in collapse(vacancies, keep="last")] == ["https://hh.ru/vacancy/2", "https://hh.ru/vacancy/3"]
+    with pytest.raises(ValueError):
+        collapse(vacancies, keep="middle")
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=0)
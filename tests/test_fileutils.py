@@ -1,9 +1,21 @@
 import json
 from pathlib import Path
+from typing import Any, Dict, List
 
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 
-from src.fileutils import JSONVacancyFileHandler
+from src.fileutils import (
+    IndexedVacancyFileHandler,
+    JSONLinesVacancyFileHandler,
+    JSONVacancyFileHandler,
+    iter_concatenated_json,
+    migrate_json_to_jsonl,
+    OffsetIndex,
+    SQLiteVacancyFileHandler,
+)
+from src.searchutils import InvertedIndex
+from src.vacutils import Vacancy
 
 
 @pytest.fixture
@@ -93,3 +105,490 @@ def test_clear_on_nonexistent_file_creates_empty(temp_json_file: Path) -> None:
     assert temp_json_file.exists()
     loaded = json.loads(temp_json_file.read_text(encoding="utf-8"))
     assert loaded == []
+
+
+VACS: List[Dict[str, Any]] = [
+    {
+        "name": "Dev1",
+        "url": "https://hh.ru/vacancy/1",
+        "salary_range": {"currency": "RUR", "from": 100, "to": 200},
+        "snippet": {"requirement": "Знание <highlighttext>Python</highlighttext>"},
+    },
+    {
+        "name": "Dev2",
+        "url": "https://hh.ru/vacancy/2",
+        "salary_range": {"currency": "USD", "from": 50, "to": 150},
+        "snippet": {"requirement": "req2"},
+    },
+]
+
+
+@pytest.fixture
+def temp_jsonl_file(tmp_path: Path) -> Path:
+    return tmp_path / "vacancies_test.jsonl"
+
+
+def test_jsonl_init(temp_jsonl_file: Path) -> None:
+    assert JSONLinesVacancyFileHandler(str(temp_jsonl_file)).filepath == str(temp_jsonl_file)
+    assert JSONLinesVacancyFileHandler().filepath == "data/vacancies.jsonl"
+
+
+def test_jsonl_write_appends_one_record_per_line(temp_jsonl_file: Path) -> None:
+    """
+    Каждая запись — отдельная строка; повторная запись только дописывает строки.
+    """
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS[:1], indent=2)
+    handler.write_vacs(VACS[1:])
+
+    lines = temp_jsonl_file.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == VACS
+    assert "Python" in lines[0]  # ensure_ascii=False: кириллица и текст без экранирования
+    assert handler.load_vacs() == VACS
+
+
+def test_jsonl_iter_vacs_is_lazy(temp_jsonl_file: Path) -> None:
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    it = handler.iter_vacs()
+    assert next(it) == VACS[0]
+    assert list(it) == VACS[1:]
+
+
+def test_jsonl_truncated_last_line_is_skipped_and_repaired(temp_jsonl_file: Path) -> None:
+    """
+    Оборванная последняя строка при чтении пропускается, а перед дозаписью отрезается.
+    """
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS[:1])
+    with open(temp_jsonl_file, "a", encoding="utf-8") as f:
+        f.write('{"name": "Обрыв", "url": "htt')
+
+    assert handler.load_vacs() == VACS[:1]
+
+    handler.write_vacs(VACS[1:])
+    assert handler.load_vacs() == VACS
+    assert len(temp_jsonl_file.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_jsonl_complete_last_line_without_newline_is_kept(temp_jsonl_file: Path) -> None:
+    temp_jsonl_file.write_text(json.dumps(VACS[0]), encoding="utf-8")
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS[1:])
+    assert handler.load_vacs() == VACS
+
+
+def test_jsonl_corrupted_middle_line_raises(temp_jsonl_file: Path) -> None:
+    temp_jsonl_file.write_text(json.dumps(VACS[0]) + "\n{oops\n" + json.dumps(VACS[1]) + "\n", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        JSONLinesVacancyFileHandler(str(temp_jsonl_file)).load_vacs()
+
+
+def test_jsonl_clear(temp_jsonl_file: Path) -> None:
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    handler.clear()
+    assert temp_jsonl_file.read_text(encoding="utf-8") == ""
+    assert handler.load_vacs() == []
+
+
+def test_iter_concatenated_json(temp_json_file: Path) -> None:
+    """
+    Файл вида "[][...][...]" читается как одна последовательность записей.
+    """
+    handler = JSONVacancyFileHandler(str(temp_json_file))
+    handler.clear()
+    handler.write_vacs(VACS[:1], indent=2)
+    handler.write_vacs(VACS[1:])
+    assert temp_json_file.read_text(encoding="utf-8").startswith("[][")
+
+    assert list(iter_concatenated_json(str(temp_json_file))) == VACS
+
+
+def test_migrate_json_to_jsonl(temp_json_file: Path, temp_jsonl_file: Path) -> None:
+    temp_json_file.write_text("[]\n" + json.dumps(VACS, indent=2) + " " + json.dumps(VACS[0]), encoding="utf-8")
+
+    count = migrate_json_to_jsonl(str(temp_json_file), str(temp_jsonl_file))
+
+    assert count == 3
+    assert JSONLinesVacancyFileHandler(str(temp_jsonl_file)).load_vacs() == VACS + VACS[:1]
+
+
+def test_indexed_view_is_lazy_sequence(temp_jsonl_file: Path) -> None:
+    """
+    view() отдаёт Vacancy по номеру, срезу и ключу; файл при этом остаётся обычным JSON Lines.
+    """
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    handler.write_vacs([{**VACS[0], "name": "Dev3", "url": "https://hh.ru/vacancy/3"}])
+
+    with handler.view() as view:
+        assert len(view) == 3
+        assert isinstance(view[0], Vacancy)
+        assert view[0].name == "Dev1"
+        assert view[-1].name == "Dev3"
+        assert [v.name for v in view[1:]] == ["Dev2", "Dev3"]
+        assert view.record(1) == VACS[1]
+        assert view.get("2").url == "https://hh.ru/vacancy/2"  # type: ignore[union-attr]
+        assert view.get("404") is None
+        with pytest.raises(IndexError):
+            view[3]
+
+    assert JSONLinesVacancyFileHandler(str(temp_jsonl_file)).load_vacs()[:2] == VACS
+
+
+def test_indexed_sidecar_is_reused_and_extended(temp_jsonl_file: Path) -> None:
+    """
+    Индекс сохраняется рядом с файлом и при дозаписи чужим кодом дополняется только новыми строками.
+    """
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS[:1])
+    assert Path(handler.index_path).exists()
+
+    # Дозапись в обход индекса
+    JSONLinesVacancyFileHandler(str(temp_jsonl_file)).write_vacs(VACS[1:])
+    stored = OffsetIndex.load(handler.index_path)
+    assert stored is not None and len(stored) == 1
+
+    index = handler.index()
+    assert len(index) == 2
+    assert index.keys == ["1", "2"]
+    assert OffsetIndex.load(handler.index_path).keys == ["1", "2"]  # type: ignore[union-attr]
+
+
+def test_indexed_rebuilds_after_external_rewrite(temp_jsonl_file: Path) -> None:
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    temp_jsonl_file.write_text(json.dumps(VACS[1]) + "\n", encoding="utf-8")
+
+    with handler.view() as view:
+        assert len(view) == 1
+        assert view[0].name == "Dev2"
+
+
+def test_indexed_rebuilds_after_clear_and_longer_rewrite(temp_jsonl_file: Path) -> None:
+    """
+    Очистка файла любым обработчиком удаляет индексы рядом с ним, а перезапись файла
+    данными большего размера видна по отпечатку, даже если индекс остался.
+    """
+    IndexedVacancyFileHandler(str(temp_jsonl_file)).write_vacs(VACS)
+    JSONLinesVacancyFileHandler(str(temp_jsonl_file)).clear()
+    assert not Path(str(temp_jsonl_file) + ".idx").exists()
+
+    longer = [{**record, "name": record["name"] * 20} for record in VACS + VACS]
+    JSONLinesVacancyFileHandler(str(temp_jsonl_file)).write_vacs(longer)
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    with handler.view() as view:
+        assert [v.name for v in view] == [r["name"] for r in longer]
+
+    handler.write_vacs(VACS)
+    temp_jsonl_file.write_bytes(b"".join(json.dumps(r).encode() + b"\n" for r in longer + VACS))
+    with handler.view() as view:
+        assert [v.name for v in view] == [r["name"] for r in longer + VACS]
+
+
+def test_indexed_truncated_tail_and_corrupted_index(temp_jsonl_file: Path) -> None:
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS[:1])
+    with open(temp_jsonl_file, "a", encoding="utf-8") as f:
+        f.write('{"name": "Обр')
+    Path(handler.index_path).write_bytes(b"garbage")
+
+    assert len(handler.index()) == 1
+    handler.write_vacs(VACS[1:])
+    with handler.view() as view:
+        assert [v.name for v in view] == ["Dev1", "Dev2"]
+
+
+def test_indexed_clear_and_empty_view(temp_jsonl_file: Path) -> None:
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    with handler.view() as view:
+        assert len(view) == 0
+        with pytest.raises(IndexError):
+            view.record(0)
+
+    handler.write_vacs(VACS)
+    handler.clear()
+    assert len(handler.index()) == 0
+    with handler.view() as view:
+        assert list(view) == []
+
+
+def test_jsonl_upsert_adds_updates_and_skips(temp_jsonl_file: Path) -> None:
+    """
+    upsert_vacs не дублирует записи: новые дописываются, изменившиеся заменяются, одинаковые пропускаются.
+    """
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    assert handler.upsert_vacs(VACS) == (2, 0)
+    size = temp_jsonl_file.stat().st_size
+
+    assert handler.upsert_vacs(VACS) == (0, 0)
+    assert temp_jsonl_file.stat().st_size == size
+
+    changed = {**VACS[0], "name": "Dev1 Senior"}
+    new = {**VACS[0], "url": "https://hh.ru/vacancy/3"}
+    assert handler.upsert_vacs([changed, new, {**changed, "name": "Dev1 Lead"}]) == (1, 1)
+    assert [r["name"] for r in handler.load_vacs()] == ["Dev2", "Dev1", "Dev1 Lead"]
+    assert [r["url"] for r in handler.load_vacs()] == [
+        "https://hh.ru/vacancy/2",
+        "https://hh.ru/vacancy/3",
+        "https://hh.ru/vacancy/1",
+    ]
+    # Затёртая строка осталась пустой строкой той же длины
+    assert temp_jsonl_file.read_text(encoding="utf-8").splitlines()[0].strip() == ""
+
+
+def test_jsonl_upsert_replaces_duplicates_from_plain_writes(temp_jsonl_file: Path) -> None:
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS[:1])
+    handler.write_vacs(VACS[:1])
+    assert handler.upsert_vacs([{**VACS[0], "name": "Dev1 Senior"}]) == (0, 1)
+    assert [r["name"] for r in handler.load_vacs()] == ["Dev1 Senior"]
+
+    # Одинаковые повторы тоже схлопываются в одну запись
+    handler.write_vacs(VACS[1:])
+    handler.write_vacs(VACS[1:])
+    assert handler.upsert_vacs(VACS[1:]) == (0, 1)
+    assert [r["name"] for r in handler.load_vacs()] == ["Dev1 Senior", "Dev2"]
+
+
+def test_jsonl_upsert_keyless_records_are_appended(temp_jsonl_file: Path) -> None:
+    handler = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    assert handler.upsert_vacs([{"foo": 1}, {"foo": 1}]) == (2, 0)
+    assert handler.load_vacs() == [{"foo": 1}, {"foo": 1}]
+
+
+def test_indexed_upsert_keeps_view_consistent(temp_jsonl_file: Path) -> None:
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    with handler.view() as view:
+        assert len(view) == 2
+
+    handler.upsert_vacs([{**VACS[1], "name": "Dev2 Senior"}])
+    with handler.view() as view:
+        assert [v.name for v in view] == ["Dev1", "Dev2 Senior"]
+        assert view.get("2").name == "Dev2 Senior"  # type: ignore[union-attr]
+
+
+def test_indexed_upsert_uses_index_not_file(temp_jsonl_file: Path, monkeypatch: MonkeyPatch) -> None:
+    """
+    Повторное сохранение той же выдачи сверяется с индексом: файл не читается и не растёт.
+    """
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    assert handler.upsert_vacs(VACS) == (2, 0)
+    size = temp_jsonl_file.stat().st_size
+
+    def no_scan(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("файл не должен перечитываться")
+
+    monkeypatch.setattr(OffsetIndex, "scan", no_scan)
+    assert handler.upsert_vacs(VACS) == (0, 0)
+    assert temp_jsonl_file.stat().st_size == size
+
+    changed = {**VACS[0], "name": "Dev1 Senior"}
+    assert handler.upsert_vacs([changed, {**VACS[1], "url": "https://hh.ru/vacancy/3"}]) == (1, 1)
+    index = handler.index()
+    assert index.keys == ["2", "1", "3"]
+    assert index.garbage == len(json.dumps(VACS[0], ensure_ascii=False).encode("utf-8")) + 1
+    with handler.view() as view:
+        assert [v.name for v in view] == ["Dev2", "Dev1 Senior", "Dev2"]
+
+
+def test_plain_upsert_drops_stale_indexes(temp_jsonl_file: Path) -> None:
+    """Обычный upsert затирает строки, не меняя размер файла, поэтому индексы рядом с файлом удаляются."""
+    indexed = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    indexed.upsert_vacs(VACS)
+    with indexed.view() as view:
+        InvertedIndex.for_file(indexed.filepath, view)
+
+    plain = JSONLinesVacancyFileHandler(str(temp_jsonl_file))
+    assert plain.upsert_vacs([{**VACS[0], "name": "Dev1 Senior"}]) == (0, 1)
+    assert not Path(indexed.index_path).exists()
+    assert not Path(indexed.filepath + ".fts.json").exists()
+
+    with indexed.view() as view:
+        assert [v.name for v in view] == ["Dev2", "Dev1 Senior"]
+        assert [view[i].name for i in InvertedIndex.for_file(indexed.filepath, view).search("senior")] == [
+            "Dev1 Senior"
+        ]
+
+
+def test_indexed_upsert_after_write_skips_unchanged(temp_jsonl_file: Path) -> None:
+    """write_vacs сохраняет в индексе хеши строк, поэтому повторный upsert тех же записей ничего не пишет."""
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    content = temp_jsonl_file.read_bytes()
+    assert handler.upsert_vacs(VACS) == (0, 0)
+    assert temp_jsonl_file.read_bytes() == content
+
+
+def test_indexed_upsert_collapses_duplicates_from_plain_writes(temp_jsonl_file: Path) -> None:
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS + VACS)
+    assert handler.upsert_vacs([VACS[0]]) == (0, 1)
+    assert [r["name"] for r in handler.load_vacs()] == ["Dev2", "Dev2", "Dev1"]
+
+
+def test_indexed_compact(temp_jsonl_file: Path) -> None:
+    """
+    Сжатие оставляет по одной (последней) версии записи, атомарно заменяя файл, и согласует индексы.
+    """
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    for i in range(10):
+        handler.upsert_vacs([{**VACS[0], "name": f"Dev1 v{i}"}, VACS[1]])
+    handler.write_vacs([VACS[1]])
+    Path(handler.filepath + ".fts.json").write_text("{}", encoding="utf-8")
+    before = handler.load_vacs()
+    size = temp_jsonl_file.stat().st_size
+
+    freed = handler.compact()
+    assert freed == size - temp_jsonl_file.stat().st_size > 0
+    assert handler.load_vacs() == before[1:] == [{**VACS[0], "name": "Dev1 v9"}, VACS[1]]
+    assert b"  " not in temp_jsonl_file.read_bytes()
+    assert sorted(p.name for p in temp_jsonl_file.parent.iterdir()) == [
+        "vacancies_test.jsonl",
+        "vacancies_test.jsonl.idx",
+    ]
+
+    index = OffsetIndex.load(handler.index_path)
+    assert index is not None and index.garbage == 0 and index.keys == ["1", "2"]
+    with handler.view() as view:
+        assert view.get("1").name == "Dev1 v9"  # type: ignore[union-attr]
+    assert handler.compact() == 0
+
+
+def test_indexed_old_index_format_is_rebuilt(temp_jsonl_file: Path) -> None:
+    handler = IndexedVacancyFileHandler(str(temp_jsonl_file))
+    handler.write_vacs(VACS)
+    Path(handler.index_path).write_bytes(b"VACIDX1\n" + bytes(16))
+    assert OffsetIndex.load(handler.index_path) is None
+    assert handler.index().keys == ["1", "2"]
+
+
+SQL_VACS: List[Dict[str, Any]] = [
+    {
+        "name": "Python-разработчик",
+        "url": "https://hh.ru/vacancy/1",
+        "salary_range": {"currency": "RUR", "from": 100000, "to": 200000},
+        "snippet": {"requirement": "Знание <highlighttext>Python</highlighttext>", "responsibility": "API"},
+    },
+    {
+        "name": "Java developer",
+        "url": "https://hh.ru/vacancy/2",
+        "salary_range": {"currency": "USD", "from": 3000, "to": None},
+        "snippet": {"requirement": "Java, Spring", "responsibility": None},
+    },
+    {
+        "name": "Аналитик",
+        "url": "https://hh.ru/vacancy/3",
+        "salary_range": None,
+        "snippet": {"requirement": "SQL, Python", "responsibility": "Отчёты"},
+    },
+    {
+        "name": "Senior Python",
+        "url": "https://hh.ru/vacancy/4",
+        "salary_range": {"currency": "RUR", "from": 300000, "to": 400000},
+        "snippet": {"requirement": "Python, Django", "responsibility": "Архитектура"},
+    },
+]
+
+
+@pytest.fixture
+def sqlite_handler(tmp_path: Path) -> SQLiteVacancyFileHandler:
+    handler = SQLiteVacancyFileHandler(str(tmp_path / "vacancies.db"))
+    handler.write_vacs(SQL_VACS)
+    return handler
+
+
+def test_sqlite_write_and_load_roundtrip(
+    sqlite_handler: SQLiteVacancyFileHandler, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """
+    Записи читаются в формате сохранённых вакансий, зарплата нормализуется как у Vacancy.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    assert SQLiteVacancyFileHandler().filepath == "data/vacancies.db"
+    loaded = sqlite_handler.load_vacs()
+    assert [r["name"] for r in loaded] == [r["name"] for r in SQL_VACS]
+    assert loaded[0] == SQL_VACS[0]
+    assert loaded[1]["salary_range"] == {"currency": "USD", "from": 3000, "to": 3000}
+    assert loaded[2]["salary_range"] == {"currency": None, "from": 0, "to": 0}
+
+
+def test_sqlite_write_upserts_by_key(sqlite_handler: SQLiteVacancyFileHandler) -> None:
+    sqlite_handler.write_vacs([SQL_VACS[0], {**SQL_VACS[1], "name": "Kotlin engineer"}])
+    assert sqlite_handler.count() == 4
+    assert sqlite_handler.load_vacs(keyword="kotlin")[0]["url"] == "https://hh.ru/vacancy/2"
+    # Полнотекстовый индекс обновлён вместе со строкой
+    assert sqlite_handler.load_vacs(keyword="developer") == []
+
+
+def test_sqlite_pushed_down_filters(sqlite_handler: SQLiteVacancyFileHandler) -> None:
+    names = lambda **kw: [r["name"] for r in sqlite_handler.load_vacs(**kw)]  # noqa: E731
+
+    assert names(min_salary=200000) == ["Python-разработчик", "Senior Python"]
+    assert names(max_salary=3000) == ["Java developer", "Аналитик"]
+    assert names(currency="RUR") == ["Python-разработчик", "Senior Python"]
+    assert names(keyword="python") == ["Python-разработчик", "Аналитик", "Senior Python"]
+    assert names(keyword="python django") == ["Senior Python"]
+    assert names(keyword="разраб*") == ["Python-разработчик"]
+    assert names(keyword="highlighttext") == []
+    assert names(keyword='"; DROP') == []
+    assert names(order_by="salary_to", limit=2) == ["Senior Python", "Python-разработчик"]
+    assert names(order_by="salary_from", descending=False, limit=1) == ["Аналитик"]
+    assert names(keyword="python", currency="RUR", min_salary=250000) == ["Senior Python"]
+    with pytest.raises(ValueError):
+        sqlite_handler.load_vacs(order_by="name")
+
+
+def test_sqlite_clear(sqlite_handler: SQLiteVacancyFileHandler) -> None:
+    sqlite_handler.clear()
+    assert sqlite_handler.count() == 0
+    assert sqlite_handler.load_vacs(keyword="python") == []
+    sqlite_handler.write_vacs(SQL_VACS[:1])
+    assert [r["name"] for r in sqlite_handler.load_vacs(keyword="python")] == ["Python-разработчик"]
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_jsonl_compressed_roundtrip(tmp_path: Path, suffix: str) -> None:
+    """
+    Сжатый файл JSON Lines дописывается и читается потоково, как обычный.
+    """
+    handler = JSONLinesVacancyFileHandler(str(tmp_path / ("vacancies.jsonl" + suffix)))
+    handler.clear()
+    handler.write_vacs(SQL_VACS[:2], indent=2)
+    handler.write_vacs(SQL_VACS[2:])
+    assert handler.compression is not None
+    assert handler.load_vacs() == SQL_VACS
+    assert b"name" not in (tmp_path / ("vacancies.jsonl" + suffix)).read_bytes()
+
+
+def test_jsonl_compressed_truncated_tail(tmp_path: Path) -> None:
+    path = tmp_path / "vacancies.jsonl.gz"
+    handler = JSONLinesVacancyFileHandler(str(path))
+    handler.write_vacs(SQL_VACS * 50)
+    path.write_bytes(path.read_bytes()[:-40])
+
+    loaded = handler.load_vacs()
+    assert 0 < len(loaded) < len(SQL_VACS) * 50
+    assert loaded == (SQL_VACS * 50)[: len(loaded)]
+
+
+def test_compressed_files_are_append_only(tmp_path: Path) -> None:
+    path = str(tmp_path / "vacancies.jsonl.gz")
+    with pytest.raises(ValueError):
+        JSONLinesVacancyFileHandler(path).upsert_vacs(SQL_VACS)
+    with pytest.raises(ValueError):
+        IndexedVacancyFileHandler(path)
+
+
+def test_json_compressed_and_migrate(tmp_path: Path) -> None:
+    src = str(tmp_path / "vacancies.json.xz")
+    handler = JSONVacancyFileHandler(src)
+    handler.write_vacs(SQL_VACS, indent=2)
+    assert handler.load_vacs() == SQL_VACS
+
+    dst = str(tmp_path / "vacancies.jsonl.gz")
+    assert migrate_json_to_jsonl(src, dst) == len(SQL_VACS)
+    assert JSONLinesVacancyFileHandler(dst).load_vacs() == SQL_VACS
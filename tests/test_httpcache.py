@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.httpcache import ResponseCache
+
+URL = "https://api.hh.ru/vacancies"
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_key_ignores_param_order_and_empty_values() -> None:
+    a = ResponseCache.key(URL, {"text": "python", "page": 1, "area": None})
+    b = ResponseCache.key(URL, {"page": "1", "text": "python"})
+    assert a == b
+    assert a != ResponseCache.key(URL, {"text": "python", "page": 2})
+    assert a != ResponseCache.key(URL + "/x", {"text": "python", "page": 1})
+
+
+def test_get_put_and_ttl(tmp_path: Path, clock: FakeClock) -> None:
+    """
+    Запись свежая ttl секунд, затем считается устаревшей, но остаётся доступной для перепроверки.
+    """
+    cache = ResponseCache(str(tmp_path), ttl=60, clock=clock)
+    assert cache.get(URL, {"page": 0}) is None
+
+    cache.put(URL, {"page": 0}, {"items": [1]}, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    entry = cache.get(URL, {"page": 0})
+    assert entry is not None
+    assert entry["body"] == {"items": [1]}
+    assert entry["etag"] == '"v1"'
+    assert cache.is_fresh(entry)
+
+    clock.now += 61
+    entry = cache.get(URL, {"page": 0})
+    assert entry is not None and not cache.is_fresh(entry)
+    assert (cache.hits, cache.misses, cache.stale) == (1, 1, 1)
+
+    cache.touch(URL, {"page": 0}, entry)
+    assert cache.is_fresh(cache.get(URL, {"page": 0}))  # type: ignore[arg-type]
+    assert cache.revalidated == 1
+
+
+def test_persists_between_instances(tmp_path: Path, clock: FakeClock) -> None:
+    ResponseCache(str(tmp_path), clock=clock).put(URL, {"page": 3}, {"items": []})
+    entry = ResponseCache(str(tmp_path), clock=clock).get(URL, {"page": 3})
+    assert entry is not None and entry["body"] == {"items": []}
+
+
+def test_lru_eviction_under_size_cap(tmp_path: Path, clock: FakeClock) -> None:
+    """
+    При превышении лимита удаляются записи, к которым дольше всего не обращались.
+    """
+    body = {"items": ["x" * 300]}
+    cache = ResponseCache(str(tmp_path), max_bytes=1300, clock=clock)
+    for page in range(3):
+        cache.put(URL, {"page": page}, body)
+        clock.now += 1
+    # Страница 0 использована недавно — вытеснена будет страница 1
+    assert cache.get(URL, {"page": 0}) is not None
+    clock.now += 1
+    cache.put(URL, {"page": 3}, body)
+
+    assert cache.get(URL, {"page": 1}) is None
+    assert all(cache.get(URL, {"page": p}) is not None for p in (0, 2, 3))
+    total = sum(f.stat().st_size for f in tmp_path.iterdir())
+    assert total <= 1300
+
+
+def test_corrupted_entry_is_a_miss(tmp_path: Path, clock: FakeClock) -> None:
+    cache = ResponseCache(str(tmp_path), clock=clock)
+    cache.put(URL, {"page": 0}, {"items": []})
+    (name,) = os.listdir(tmp_path)
+    (tmp_path / name).write_text("{broken", encoding="utf-8")
+    assert cache.get(URL, {"page": 0}) is None
+
+
+def test_clear(tmp_path: Path, clock: FakeClock) -> None:
+    cache = ResponseCache(str(tmp_path), clock=clock)
+    cache.put(URL, {"page": 0}, {"items": []})
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+    assert cache.get(URL, {"page": 0}) is None
@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+
+from src import metrics
+from src.API import HeadHunterAPI
+from src.fileutils import JSONLinesVacancyFileHandler, JSONVacancyFileHandler
+from src.metrics import Metrics
+from src.vacutils import Vacancy
+
+
+@pytest.fixture(autouse=True)
+def collected() -> Iterator[Metrics]:
+    yield metrics.enable()
+    metrics.disable()
+
+
+def test_counters_timers_and_summary(collected: Metrics, tmp_path: Path) -> None:
+    events: List[Tuple[str, str, float]] = []
+    collected.add_hook(lambda kind, name, value: events.append((kind, name, value)))
+
+    metrics.count("http.requests")
+    metrics.count("http.bytes", 512)
+    metrics.count("http.requests")
+    for _ in range(2):
+        with metrics.timer("stage"):
+            pass
+
+    summary = collected.summary()
+    assert summary["counters"] == {"http.bytes": 512, "http.requests": 2}
+    assert summary["timers"]["stage"]["count"] == 2
+    assert summary["timers"]["stage"]["max"] >= summary["timers"]["stage"]["mean"] > 0
+    assert [e[:2] for e in events] == [
+        ("count", "http.requests"),
+        ("count", "http.bytes"),
+        ("count", "http.requests"),
+        ("time", "stage"),
+        ("time", "stage"),
+    ]
+
+    collected.dump(str(tmp_path / "metrics.json"))
+    assert json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8")) == summary
+    collected.reset()
+    assert collected.summary() == {"counters": {}, "timers": {}}
+
+
+def test_disabled_metrics_record_nothing(collected: Metrics) -> None:
+    metrics.disable()
+    assert metrics.current() is None
+    metrics.count("http.requests")
+    # Выключенный таймер — один и тот же пустой контекстный менеджер, без создания объектов
+    assert metrics.timer("a") is metrics.timer("b")
+    with metrics.timer("a"):
+        pass
+    assert collected.summary() == {"counters": {}, "timers": {}}
+
+
+class Response:
+    def __init__(self, status_code: int, data: Dict[str, Any]) -> None:
+        self.status_code = status_code
+        self.headers: Dict[str, str] = {}
+        self.content = json.dumps(data).encode("utf-8")
+
+    def json(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = json.loads(self.content)
+        return data
+
+
+def test_api_requests_retries_and_bytes(collected: Metrics, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("src.API.time.sleep", lambda _: None)
+    statuses = {0: [503, 200], 1: [200]}
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> Response:
+        status = statuses[params["page"]].pop(0)
+        return Response(status, {"items": [{"id": str(params["page"])}], "pages": 2})
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+    HeadHunterAPI(max_workers=1).load_vacancies("python")
+
+    summary = collected.summary()
+    counters = summary["counters"]
+    assert counters["http.requests"] == 3
+    assert counters["http.retries"] == 1
+    assert counters["http.status.503"] == 1
+    assert counters["http.bytes"] == 2 * len(b'{"items": [{"id": "0"}], "pages": 2}')
+    assert summary["timers"]["http.request"]["count"] == 3
+    assert summary["timers"]["http.decode"]["count"] == 2
+
+
+def test_file_handlers_and_vacancies(collected: Metrics, tmp_path: Path) -> None:
+    records: List[Dict[str, Any]] = [
+        {"name": "Python", "url": "https://hh.ru/vacancy/1", "salary_range": None, "snippet": {}},
+        {"name": "Java", "url": "https://hh.ru/vacancy/2", "salary_range": None, "snippet": {}},
+    ]
+    jsonl = JSONLinesVacancyFileHandler(str(tmp_path / "v.jsonl"))
+    jsonl.write_vacs(records)
+    Vacancy.from_raw_many(jsonl.load_vacs())
+    JSONVacancyFileHandler(str(tmp_path / "v.json")).write_vacs(records)
+
+    summary = collected.summary()
+    assert summary["counters"]["file.records_written"] == 4
+    assert summary["counters"]["file.records_read"] == 2
+    assert summary["counters"]["file.bytes_written"] == (tmp_path / "v.jsonl").stat().st_size + (
+        tmp_path / "v.json"
+    ).stat().st_size
+    assert summary["counters"]["vacancy.records"] == 2
+    assert set(summary["timers"]) == {"file.write", "file.read", "vacancy.validate"}
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+
+from src.fileutils import IndexedVacancyFileHandler, JSONLinesVacancyFileHandler
+from src.parallel import index_ranges, load_parallel, split_ranges
+from src.vacutils import StringColumn, Vacancy, VacancyTable
+
+
+def records(n: int) -> list:
+    currencies = ["RUR", "USD", "EUR", None]
+    return [
+        {
+            "name": f"Вакансия {i}",
+            "url": f"https://hh.ru/vacancy/{i}",
+            "salary_range": {"currency": currencies[i % 4], "from": i * 10, "to": i * 20},
+            "snippet": {"requirement": f"Python {i}" if i % 3 else None, "responsibility": "код"},
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> str:
+    filepath = str(tmp_path / "vacancies.jsonl")
+    JSONLinesVacancyFileHandler(filepath).write_vacs(records(200))
+    return filepath
+
+
+def test_split_ranges_align_to_lines(store: str) -> None:
+    ranges = split_ranges(store, chunk_size=1000)
+    assert len(ranges) > 1
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == Path(store).stat().st_size
+    data = Path(store).read_bytes()
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1 : end] == b"\n"
+
+
+def test_load_parallel_keeps_order(store: str) -> None:
+    expected = [v.to_dict() for v in Vacancy.from_raw_many(JSONLinesVacancyFileHandler(store).load_vacs())]
+    assert load_parallel(store, workers=2, chunk_size=1000) == expected
+    assert load_parallel(store, workers=1, chunk_size=1000) == expected
+
+
+def test_load_parallel_by_index_skips_tombstones(store: str) -> None:
+    handler = IndexedVacancyFileHandler(store)
+    changed = records(200)[5]
+    changed["salary_range"]["to"] = 10**6
+    handler.upsert_vacs([changed])
+
+    result = load_parallel(store, workers=2, chunk_size=1000, index=handler.index())
+    assert len(index_ranges(handler.index(), 1000)) > 1
+    assert isinstance(result, list) and len(result) == 200
+    assert result[-1]["salary_range"]["to"] == 10**6
+
+
+def test_load_parallel_table(store: str) -> None:
+    table = load_parallel(store, workers=2, chunk_size=1000, as_table=True)
+    assert isinstance(table, VacancyTable)
+    assert [table.record(i) for i in range(len(table))] == load_parallel(store, workers=1)
+
+
+def test_concat_remaps_currencies() -> None:
+    first = VacancyTable.from_records(records(4)[2:])
+    second = VacancyTable.from_records(records(4)[:2])
+    table = VacancyTable.concat([first, second])
+    assert [table.record(i) for i in range(4)] == [*map(first.record, range(2)), *map(second.record, range(2))]
+
+
+def test_string_column_extend_column() -> None:
+    first, second = StringColumn(), StringColumn()
+    first.extend(["a", None])
+    second.extend(["bc", None, ""])
+    first.extend_column(second)
+    assert [first[i] for i in range(5)] == ["a", None, "bc", None, ""]
+
+
+def test_load_parallel_compressed(tmp_path: Path) -> None:
+    filepath = str(tmp_path / "vacancies.jsonl.gz")
+    JSONLinesVacancyFileHandler(filepath).write_vacs(records(10))
+    assert len(load_parallel(filepath, workers=2)) == 10
+
+
+def test_load_parallel_invalid_record(tmp_path: Path) -> None:
+    filepath = str(tmp_path / "vacancies.jsonl")
+    JSONLinesVacancyFileHandler(filepath).write_vacs([*records(3), {"name": "", "url": "x"}])
+    with pytest.raises(ValueError):
+        load_parallel(filepath, workers=2, chunk_size=100)
@@ -0,0 +1,164 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+
+from src.API import HeadHunterAPI
+from src.fileutils import JSONLinesVacancyFileHandler
+from src.pipeline import ingest, parse_page
+
+
+def page(n: int, size: int = 3) -> dict:
+    return {
+        "items": [
+            {
+                "id": f"{n}-{i}",
+                "name": f"Вакансия {n}-{i}",
+                "alternate_url": f"https://hh.ru/vacancy/{n * 100 + i}",
+                "salary": {"currency": "RUR", "from": 100, "to": None},
+                "snippet": {"requirement": "req"},
+            }
+            for i in range(size)
+        ],
+        "pages": 5,
+    }
+
+
+class RecordingHandler(JSONLinesVacancyFileHandler):
+    def __init__(self, filepath: str, delay: float = 0.0) -> None:
+        super().__init__(filepath)
+        self.delay = delay
+        self.batches: List[int] = []
+
+    def write_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> None:
+        time.sleep(self.delay)
+        self.batches.append(len(data))
+        super().write_vacs(data, **kwargs)
+
+
+def test_parse_page() -> None:
+    records = parse_page(page(1, size=1))
+    assert records == [
+        {
+            "name": "Вакансия 1-0",
+            "url": "https://hh.ru/vacancy/100",
+            "salary_range": {"currency": "RUR", "from": 100, "to": 100},
+            "snippet": {"requirement": "req"},
+        }
+    ]
+
+
+def test_ingest_writes_every_page_in_order(tmp_path: Path) -> None:
+    handler = RecordingHandler(str(tmp_path / "v.jsonl"))
+    assert ingest((page(n) for n in range(5)), handler) == 15
+    assert handler.batches == [3, 3, 3, 3, 3]
+    names = [r["name"] for r in handler.load_vacs()]
+    assert names[:4] == ["Вакансия 0-0", "Вакансия 0-1", "Вакансия 0-2", "Вакансия 1-0"]
+
+
+def test_ingest_applies_backpressure(tmp_path: Path) -> None:
+    """
+    Медленная запись тормозит получение страниц: источник не убегает вперёд больше чем на размер очередей.
+    """
+    produced: List[int] = []
+    lead: List[int] = []
+    handler = RecordingHandler(str(tmp_path / "v.jsonl"), delay=0.01)
+
+    def pages() -> Iterator[dict]:
+        for n in range(20):
+            lead.append(n - len(handler.batches))
+            produced.append(n)
+            yield page(n, size=1)
+
+    assert ingest(pages(), handler, queue_size=1) == 20
+    # Очередь после получения + очередь после разбора + по элементу в работе у каждой стадии
+    assert max(lead) <= 5
+
+
+def test_ingest_propagates_source_errors(tmp_path: Path) -> None:
+    def pages() -> Iterator[dict]:
+        yield page(0)
+        raise ConnectionError("Ошибка запроса: 500")
+
+    handler = RecordingHandler(str(tmp_path / "v.jsonl"))
+    with pytest.raises(ConnectionError, match="500"):
+        ingest(pages(), handler)
+    assert handler.batches == [3]
+
+
+def test_ingest_propagates_parse_errors(tmp_path: Path) -> None:
+    broken = {"items": [{"name": "", "alternate_url": "https://hh.ru/vacancy/1"}]}
+    with pytest.raises(ValueError):
+        ingest(iter([broken]), RecordingHandler(str(tmp_path / "v.jsonl")))
+
+
+def test_ingest_stops_stages_when_writer_fails(tmp_path: Path) -> None:
+    closed = threading.Event()
+
+    def pages() -> Iterator[dict]:
+        try:
+            for n in range(1000):
+                yield page(n)
+        finally:
+            closed.set()
+
+    class FailingHandler(RecordingHandler):
+        def write_vacs(self, data: List[Dict[str, Any]], **kwargs: Any) -> None:
+            raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        ingest(pages(), FailingHandler(str(tmp_path / "v.jsonl")))
+    assert closed.is_set()
+
+
+def test_stream_pages_yields_in_order_with_bounded_prefetch(monkeypatch: MonkeyPatch) -> None:
+    """
+    stream_pages отдаёт страницы по порядку и не запрашивает больше max_workers страниц впрок.
+    """
+    requested: List[int] = []
+
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        requested.append(params["page"])
+        time.sleep(0.001 * (10 - params["page"]))
+
+        class Response:
+            status_code = 200
+            headers: dict = {}
+
+            def json(self) -> dict:
+                return {"items": [{"id": params["page"]}], "pages": 10}
+
+        return Response()
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+    api = HeadHunterAPI(max_workers=2)
+
+    stream = api.stream_pages("python")
+    assert next(stream)["items"] == [{"id": 0}]
+    assert next(stream)["items"] == [{"id": 1}]
+    time.sleep(0.05)
+    # Страница 1 выдана, в работе не больше двух следующих
+    assert sorted(requested) == [0, 1, 2, 3]
+    assert [p["items"][0]["id"] for p in stream] == list(range(2, 10))
+    assert api.vacancies == []
+
+
+def test_stream_pages_into_ingest(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    def _get(self: Any, url: Any, headers: Any = None, params: Any = None, **kwargs: Any) -> object:
+        class Response:
+            status_code = 200
+            headers: dict = {}
+
+            def json(self) -> dict:
+                return page(params["page"])
+
+        return Response()
+
+    monkeypatch.setattr(requests.Session, "get", _get)
+    handler = JSONLinesVacancyFileHandler(str(tmp_path / "v.jsonl"))
+    assert ingest(HeadHunterAPI().stream_pages("python"), handler) == 15
+    assert len(handler.load_vacs()) == 15
@@ -0,0 +1,93 @@
+import pytest
+
+from src import metrics
+from src.query import Query, VacancyCollection
+from src.vacutils import Vacancy
+
+
+def vacancy(n: int, name: str, currency: str | None, to: int, requirement: str = "") -> Vacancy:
+    return Vacancy(
+        name,
+        f"https://hh.ru/vacancy/{n}",
+        {"currency": currency, "from": 0, "to": to},
+        {"requirement": requirement, "responsibility": None},
+    )
+
+
+VACANCIES = [
+    vacancy(0, "Python-разработчик", "RUR", 150_000, "Django, PostgreSQL"),
+    vacancy(1, "Senior Python developer", "USD", 5_000, "Python, FastAPI"),
+    vacancy(2, "Java-разработчик", "RUR", 250_000, "Spring"),
+    vacancy(3, "Стажёр Python", None, 0, "Python"),
+    vacancy(4, "Python-разработчик (Ёлка)", "RUR", 300_000, "Python, Django"),
+]
+
+
+@pytest.fixture
+def collection() -> VacancyCollection:
+    return VacancyCollection(VACANCIES)
+
+
+def urls(vacancies: list) -> list:
+    return [int(v.url.rsplit("/", 1)[1]) for v in vacancies]
+
+
+def test_query_is_normalized() -> None:
+    assert Query(keyword="  Django   python ") == Query(keyword="python django")
+    assert Query(currency=" usd", name=" ") == Query(currency="USD")
+    assert Query(min_salary=100).key() == Query(min_salary=100.0).key()
+    refined = Query().matching("python")
+    assert refined.salary(min=200_000) != refined
+    assert refined.salary(min=200_000).matching(None) == Query(min_salary=200_000)
+    with pytest.raises(ValueError):
+        Query(order="name")
+    with pytest.raises(ValueError):
+        Query().where(city="Москва")
+
+
+def test_combined_conditions(collection: VacancyCollection) -> None:
+    assert urls(collection.select(Query().salary(min=200_000))) == [1, 2, 4]
+    rows = collection.run(Query().salary(min=200_000).matching("python"))
+    assert rows == [i for i in collection.index.search("python") if i in (1, 4)]
+    assert urls(collection.select(Query().in_currency("RUR").named("разработчик").salary(max=200_000))) == [0]
+    assert urls(collection.select(Query().named("елка"))) == [4]
+    assert urls(collection.select(Query().in_currency("EUR"))) == []
+
+
+def test_top_by_salary(collection: VacancyCollection) -> None:
+    # 5000 USD больше 300000 RUR в пересчёте на рубли
+    assert urls(collection.select(Query().top(2))) == [1, 4]
+    assert urls(collection.select(Query().matching("django").top(5))) == [4, 0]
+
+
+def test_keyword_order_is_relevance(collection: VacancyCollection) -> None:
+    assert collection.run(Query().matching("django")) == collection.index.search("django")
+
+
+def test_results_are_cached_until_collection_changes(collection: VacancyCollection) -> None:
+    collected = metrics.enable()
+    try:
+        query = Query().matching("python").salary(min=100_000)
+        first = collection.run(query)
+        first.append(99)
+        assert collection.run(Query(min_salary=100_000, keyword="PYTHON")) == first[:-1]
+        assert collected.counters["query.cache_hits"] == 1
+
+        version = collection.version
+        collection.extend([vacancy(5, "Python lead", "RUR", 400_000, "Python")])
+        assert collection.version == version + 1
+        assert 5 in collection.run(query)
+        assert collected.counters["query.cache_misses"] == 2
+    finally:
+        metrics.disable()
+
+
+def test_cache_is_bounded() -> None:
+    collection = VacancyCollection(VACANCIES, cache_size=2)
+    collected = metrics.enable()
+    try:
+        for salary in (1, 2, 3, 1):
+            collection.run(Query(min_salary=salary))
+        assert collected.counters["query.cache_misses"] == 4
+    finally:
+        metrics.disable()
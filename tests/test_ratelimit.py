@@ -0,0 +1,110 @@
+from typing import Callable, List
+
+import pytest
+
+from src.ratelimit import BACKGROUND, INTERACTIVE, RateLimiter, set_shared_limiter, shared_limiter
+
+
+class FakeClock:
+    """Поддельные часы: sleep сдвигает время; on_sleep позволяет вмешаться, пока запрос ждёт."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+        self.on_sleep: Callable[[], None] | None = None
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+        if self.on_sleep is not None:
+            hook, self.on_sleep = self.on_sleep, None
+            hook()
+
+
+def make(clock: FakeClock, **kwargs: float) -> RateLimiter:
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)  # type: ignore[arg-type]
+
+
+def test_token_bucket_rate_and_burst() -> None:
+    clock = FakeClock()
+    limiter = make(clock, rate=2, burst=3)
+    waits = [limiter.acquire() for _ in range(5)]
+    # Три запроса подряд, дальше — по одному в полсекунды
+    assert waits == [0, 0, 0, 0.5, 0.5]
+
+    # За время простоя запас восстанавливается, но не больше burst
+    clock.now += 10
+    assert [limiter.acquire() for _ in range(4)] == [0, 0, 0, 0.5]
+
+
+def test_unlimited_until_429() -> None:
+    clock = FakeClock()
+    limiter = make(clock)
+    assert [limiter.acquire() for _ in range(100)] == [0] * 100
+    assert clock.sleeps == []
+
+
+def test_429_pauses_and_slows_down_then_recovers() -> None:
+    clock = FakeClock()
+    limiter = make(clock, rate=8, recovery=1)
+
+    limiter.penalize(retry_after=3)
+    assert limiter.rate == 4
+    # Все запросы ждут окончания паузы, дальше идут с уменьшенной скоростью
+    assert limiter.acquire() == 3
+    assert limiter.acquire() == 0.25
+
+    for _ in range(10):
+        limiter.reward()
+    assert limiter.rate == 8
+
+    for _ in range(10):
+        limiter.penalize()
+    assert limiter.rate == limiter.min_rate
+
+
+def test_429_without_limit_switches_to_fallback_rate() -> None:
+    clock = FakeClock()
+    limiter = make(clock, fallback_rate=5)
+    limiter.penalize(retry_after=1)
+    assert limiter.rate == 5
+    assert [limiter.acquire() for _ in range(3)] == pytest.approx([1, 0.2, 0.2])
+
+
+def test_interactive_requests_overtake_background() -> None:
+    """
+    Пока фоновый запрос ждёт слота, пришедший интерактивный занимает ближайший слот первым.
+    """
+    clock = FakeClock()
+    limiter = make(clock, rate=1)
+    order: List[str] = []
+
+    limiter.acquire()
+    clock.on_sleep = lambda: order.append(f"interactive:{limiter.acquire(INTERACTIVE)}")
+    waited = limiter.acquire(BACKGROUND)
+    order.append(f"background:{waited}")
+
+    # Фоновый дождался слота t=1, но его занял интерактивный; фоновому достался t=2
+    assert order == ["interactive:0.0", "background:2.0"]
+
+
+def test_shared_limiter_is_process_wide() -> None:
+    set_shared_limiter(None)
+    try:
+        assert shared_limiter() is shared_limiter()
+        custom = RateLimiter(rate=1)
+        set_shared_limiter(custom)
+        assert shared_limiter() is custom
+    finally:
+        set_shared_limiter(None)
+
+
+@pytest.mark.parametrize("priority", [INTERACTIVE, BACKGROUND])
+def test_acquire_returns_wait(priority: int) -> None:
+    clock = FakeClock()
+    limiter = make(clock, rate=4)
+    assert limiter.acquire(priority) == 0
+    assert limiter.acquire(priority) == 0.25
@@ -0,0 +1,168 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.fileutils import IndexedVacancyFileHandler
+from src.searchutils import InvertedIndex, tokenize
+from src.vacutils import Vacancy
+
+
+def make_vacs() -> list:
+    return [
+        Vacancy(
+            "Python-разработчик",
+            "https://hh.ru/vacancy/1",
+            None,
+            {
+                "requirement": "Опыт с <highlighttext>Python</highlighttext> и Django от 3 лет.",
+                "responsibility": "Разработка сервисов.",
+            },
+        ),
+        Vacancy(
+            "Java developer",
+            "https://hh.ru/vacancy/2",
+            None,
+            {"requirement": "Java, Spring. Python будет плюсом.", "responsibility": None},
+        ),
+        Vacancy("Стажёр C++", "https://hh.ru/vacancy/3", None, {"requirement": "Знание C++ и C#"}),
+        Vacancy("Аналитик", "https://hh.ru/vacancy/4", None, {}),
+    ]
+
+
+def test_tokenize_strips_markup_and_normalizes() -> None:
+    """
+    Разметка hh.ru убирается, регистр и "ё" нормализуются, "c++"/"c#" остаются словами.
+    """
+    assert tokenize("Опыт с <highlighttext>Python</highlighttext>!") == ["опыт", "с", "python"]
+    assert tokenize("Стажёр C++, C#") == ["стажер", "c++", "c#"]
+    assert tokenize(None) == []
+
+
+def test_search_and_or_prefix() -> None:
+    index = InvertedIndex.from_vacancies(make_vacs())
+    assert len(index) == 4
+
+    assert sorted(index.search("python")) == [0, 1]
+    assert index.search("python django") == [0]
+    assert sorted(index.search("django OR spring")) == [0, 1]
+    assert index.search("разраб*") == [0]
+    assert index.search("c++") == [2]
+    assert index.search("СТАЖЕР") == [2]
+    assert index.search("golang") == []
+    assert index.search("python golang") == []
+    assert index.search("") == []
+
+
+def test_search_is_ranked() -> None:
+    """
+    Вакансия, где слово встречается в названии и описании, выше той, где оно упомянуто вскользь.
+    """
+    index = InvertedIndex.from_vacancies(make_vacs())
+    assert index.search("python") == [0, 1]
+    assert index.search("python", limit=1) == [0]
+
+
+def test_incremental_add() -> None:
+    index = InvertedIndex.from_vacancies(make_vacs())
+    assert index.search("golang") == []
+    doc = index.add(Vacancy("Golang developer", "https://hh.ru/vacancy/5", None, {}))
+    assert doc == 4
+    assert index.search("gol*") == [4]
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    index = InvertedIndex.from_vacancies(make_vacs())
+    path = tmp_path / "index.json"
+    index.save(str(path), source_size=123)
+
+    loaded = InvertedIndex.load(str(path))
+    assert loaded.source_size == 123
+    assert len(loaded) == 4
+    for query in ("python", "django OR spring", "разраб*", "c#"):
+        assert loaded.search(query) == index.search(query)
+
+
+@pytest.fixture
+def handler(tmp_path: Path) -> IndexedVacancyFileHandler:
+    handler = IndexedVacancyFileHandler(str(tmp_path / "vacancies.jsonl"))
+    handler.write_vacs([v.to_dict() for v in make_vacs()])
+    return handler
+
+
+def test_for_file_saves_and_extends_index(handler: IndexedVacancyFileHandler) -> None:
+    """
+    Индекс сохраняется рядом с файлом; после дозаписи индексируются только новые вакансии.
+    """
+    with handler.view() as view:
+        index = InvertedIndex.for_file(handler.filepath, view)
+    assert Path(handler.filepath + ".fts.json").exists()
+    assert sorted(index.search("python")) == [0, 1]
+
+    handler.write_vacs([{"name": "Python QA", "url": "https://hh.ru/vacancy/9", "salary_range": None, "snippet": {}}])
+
+    class CountingView(list):
+        accessed: list = []
+
+        def __getitem__(self, i):  # type: ignore[no-untyped-def]
+            self.accessed.append(i)
+            return super().__getitem__(i)
+
+    with handler.view() as view:
+        counting = CountingView(view)
+    index = InvertedIndex.for_file(handler.filepath, counting)
+    assert counting.accessed == [4]
+    assert sorted(index.search("python")) == [0, 1, 4]
+
+
+def test_for_file_rebuilds_after_rewrite(handler: IndexedVacancyFileHandler) -> None:
+    with handler.view() as view:
+        InvertedIndex.for_file(handler.filepath, view)
+
+    handler.clear()
+    assert not Path(handler.filepath + ".fts.json").exists()
+    handler.write_vacs([{"name": "Golang", "url": "https://hh.ru/vacancy/7", "salary_range": None, "snippet": {}}])
+    with handler.view() as view:
+        index = InvertedIndex.for_file(handler.filepath, view)
+    assert len(index) == 1
+    assert index.search("golang") == [0]
+    assert index.search("python") == []
+
+
+def test_for_file_rebuilds_after_rewrite_of_larger_size(handler: IndexedVacancyFileHandler) -> None:
+    """
+    Перезапись файла большим числом вакансий видна по отпечатку: размер файла и число записей
+    не меньше сохранённых, но индекс строится заново.
+    """
+    with handler.view() as view:
+        InvertedIndex.for_file(handler.filepath, view)
+
+    golang = [
+        {"name": f"Golang developer {i}", "url": f"https://hh.ru/vacancy/{10 + i}", "snippet": {"requirement": "Go"}}
+        for i in range(10)
+    ]
+    with open(handler.filepath, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in golang)
+    with handler.view() as view:
+        index = InvertedIndex.for_file(handler.filepath, view)
+    assert index.search("python") == []
+    assert sorted(index.search("golang")) == list(range(10))
+
+
+def test_for_file_skips_save_when_unchanged(
+    handler: IndexedVacancyFileHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with handler.view() as view:
+        InvertedIndex.for_file(handler.filepath, view)
+
+    saved: list = []
+    monkeypatch.setattr(InvertedIndex, "save", lambda self, path, **kwargs: saved.append(path))
+    with handler.view() as view:
+        index = InvertedIndex.for_file(handler.filepath, view)
+    assert saved == []
+    assert sorted(index.search("python")) == [0, 1]
+
+    handler.write_vacs([{"name": "Python QA", "url": "https://hh.ru/vacancy/9", "salary_range": None, "snippet": {}}])
+    with handler.view() as view:
+        InvertedIndex.for_file(handler.filepath, view)
+    assert saved == [handler.filepath + ".fts.json"]
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from src.fileutils import SQLiteVacancyFileHandler
+from src.stats import SalaryStats, salaries
+from src.vacutils import VacancyTable
+
+
+def record(name: str, currency: str | None, frm: int, to: int, requirement: str | None = None) -> dict:
+    return {
+        "name": name,
+        "url": f"https://hh.ru/vacancy/{name}",
+        "salary_range": {"currency": currency, "from": frm, "to": to},
+        "snippet": {"requirement": requirement, "responsibility": None},
+    }
+
+
+RECORDS = [
+    record("python 1", "RUR", 100, 200, "Django"),
+    record("python 2", "RUR", 300, 400),
+    record("python 3", "RUR", 0, 500),
+    record("java", "RUR", 600, 0, "Spring"),
+    record("go", "USD", 10, 20),
+    record("стажёр", None, 0, 0),
+]
+
+
+def test_summary_by_currency() -> None:
+    summary = SalaryStats.from_records(RECORDS).summary(percentiles=(0, 50, 100), bins=2)
+    assert list(summary) == ["RUR", "USD"]
+    rur = summary["RUR"]
+    assert (rur["count"], rur["min"], rur["max"], rur["mean"]) == (4, 200, 600, 425)
+    assert rur["percentiles"] == {"0": 200, "50": 450, "100": 600}
+    assert rur["histogram"] == {"edges": [200, 400, 600], "counts": [1, 3]}
+    assert summary["USD"]["histogram"] == {"edges": [20, 20], "counts": [1]}
+
+
+def test_fields_and_keyword() -> None:
+    assert SalaryStats.from_records(RECORDS, field="from").summary()["RUR"]["min"] == 100
+    assert SalaryStats.from_records(RECORDS, field="mid").summary(bins=None)["RUR"]["max"] == 600
+    assert list(SalaryStats.from_records(RECORDS, field="normalized").values) == ["RUR"]
+    assert list(salaries(RECORDS, "python django")) == [("RUR", 100, 200)]
+    assert len(list(salaries(RECORDS, "pyth*"))) == 3
+    with pytest.raises(ValueError):
+        SalaryStats("median")
+
+
+def test_count_above() -> None:
+    stats = SalaryStats.from_records(RECORDS)
+    assert stats.count() == 5
+    assert stats.count("RUR", above=400) == 3
+    assert stats.count(above=20) == 5
+    assert stats.count("EUR") == 0
+
+
+def test_from_table_matches_records() -> None:
+    table = VacancyTable.from_records(RECORDS)
+    for field in ("to", "from", "mid", "normalized"):
+        assert SalaryStats.from_table(table, field).summary() == SalaryStats.from_records(RECORDS, field).summary()
+    rows = table.where(min_salary=300)
+    assert SalaryStats.from_table(table, rows=rows).count() == 3
+
+
+def test_sqlite_salaries(tmp_path: Path) -> None:
+    handler = SQLiteVacancyFileHandler(str(tmp_path / "vacancies.db"))
+    handler.write_vacs(RECORDS)
+    assert SalaryStats.from_salaries(handler.iter_salaries()).summary() == SalaryStats.from_records(RECORDS).summary()
+    assert list(handler.iter_salaries("django")) == [("RUR", 100, 200)]
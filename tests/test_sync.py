@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from src.fileutils import JSONLinesVacancyFileHandler
+from src.sync import SyncState, sync_keyword
+
+
+def raw(vac_id: int, published: str, name: str = "Dev", salary: int = 100) -> dict:
+    return {
+        "id": str(vac_id),
+        "name": f"{name} {vac_id}",
+        "alternate_url": f"https://hh.ru/vacancy/{vac_id}",
+        "salary": {"currency": "RUR", "from": salary, "to": None},
+        "snippet": {"requirement": "req", "responsibility": "resp"},
+        "published_at": published,
+    }
+
+
+class FakeAPI:
+    """Выдача, отсортированная от новых к старым, по per_page вакансий на страницу."""
+
+    def __init__(self, items: List[dict], per_page: int = 2) -> None:
+        self.items = items
+        self.per_page = per_page
+        self.requested: List[int] = []
+
+    def iter_pages(self, keyword: str, **params: Any) -> Iterator[dict]:
+        assert params["order_by"] == "publication_time"
+        pages = [self.items[i : i + self.per_page] for i in range(0, len(self.items), self.per_page)] or [[]]
+        for page, items in enumerate(pages):
+            self.requested.append(page)
+            yield {"items": items, "pages": len(pages)}
+
+
+@pytest.fixture
+def handler(tmp_path: Path) -> JSONLinesVacancyFileHandler:
+    return JSONLinesVacancyFileHandler(str(tmp_path / "vacancies.jsonl"))
+
+
+def test_first_sync_loads_everything_and_saves_watermark(handler: JSONLinesVacancyFileHandler) -> None:
+    api = FakeAPI(
+        [raw(3, "2025-05-03T10:00:00+0300"), raw(2, "2025-05-03T10:00:00+0300"), raw(1, "2025-05-01T09:00:00+0300")]
+    )
+
+    assert sync_keyword(api, handler, "python") == (3, 0)
+
+    assert [r["name"] for r in handler.load_vacs()] == ["Dev 3", "Dev 2", "Dev 1"]
+    assert handler.load_vacs()[0]["salary_range"] == {"currency": "RUR", "from": 100, "to": 100}
+    state = json.loads(Path(handler.filepath + ".sync.json").read_text(encoding="utf-8"))
+    assert state == {"python": {"published_at": "2025-05-03T10:00:00+0300", "keys": ["2", "3"]}}
+
+
+def test_next_sync_stops_at_known_vacancies(handler: JSONLinesVacancyFileHandler) -> None:
+    """
+    Вторая синхронизация запрашивает страницы только до первой уже известной вакансии.
+    """
+    old = [raw(3, "2025-05-03T10:00:00+0300"), raw(2, "2025-05-02T10:00:00+0300"), raw(1, "2025-05-01T10:00:00+0300")]
+    sync_keyword(FakeAPI(old), handler, "python")
+
+    new = [raw(5, "2025-05-04T12:00:00+0300"), raw(4, "2025-05-04T11:00:00+0300"), raw(6, "2025-05-04T07:30:00+0000")]
+    api = FakeAPI(new + old, per_page=2)
+    assert sync_keyword(api, handler, "python") == (3, 0)
+
+    # Страница 1 содержит уже известную вакансию 3 — дальше не идём
+    assert api.requested == [0, 1]
+    assert sorted(r["url"][-1] for r in handler.load_vacs()) == ["1", "2", "3", "4", "5", "6"]
+    assert SyncState.for_store(handler.filepath).get("python") == {
+        "published_at": "2025-05-04T12:00:00+0300",
+        "keys": ["5"],
+    }
+
+    # Ничего нового — одна страница и никаких записей
+    api = FakeAPI(new + old, per_page=2)
+    assert sync_keyword(api, handler, "python") == (0, 0)
+    assert api.requested == [0]
+
+
+def test_sync_upserts_changed_vacancies(handler: JSONLinesVacancyFileHandler) -> None:
+    """
+    Переопубликованная вакансия с новыми данными обновляется, а не дублируется.
+    """
+    sync_keyword(FakeAPI([raw(2, "2025-05-02T10:00:00+0300"), raw(1, "2025-05-01T10:00:00+0300")]), handler, "python")
+    size = Path(handler.filepath).stat().st_size
+
+    republished = raw(1, "2025-05-05T10:00:00+0300", salary=500)
+    assert sync_keyword(FakeAPI([republished, raw(2, "2025-05-02T10:00:00+0300")]), handler, "python") == (0, 1)
+
+    records = handler.load_vacs()
+    assert [(r["name"], r["salary_range"]["from"]) for r in records] == [("Dev 2", 100), ("Dev 1", 500)]
+    # Старая версия затёрта на месте, новая дописана в конец
+    assert Path(handler.filepath).stat().st_size > size
+
+
+def test_watermarks_are_per_keyword(handler: JSONLinesVacancyFileHandler) -> None:
+    state = SyncState.for_store(handler.filepath)
+    sync_keyword(FakeAPI([raw(1, "2025-05-01T10:00:00+0300")]), handler, "python", state)
+    sync_keyword(FakeAPI([raw(1, "2025-05-01T10:00:00+0300")]), handler, "django", state)
+    assert set(state.marks) == {"python", "django"}
+    assert len(handler.load_vacs()) == 1
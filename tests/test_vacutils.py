@@ -1,7 +1,11 @@
+import json
+import pickle
+
 import pytest
 
-from src.vacutils import Vacancy
-from typing import Optional, Union
+from src.currency import CurrencyRates
+from src.vacutils import StringColumn, Vacancy, VacancyTable, salary_value, top_n, vacancy_key
+from typing import Any, Dict, List, Optional, Union
 
 
 def test_vacancy_salary_none_becomes_zero() -> None:
@@ -35,11 +39,11 @@ def test_vacancy_salary_to_less_than_from_adjusts() -> None:
 
 def test_vacancy_comparisons_equal_and_not_equal() -> None:
     """
-    Два объекта Vacancy с одинаковым верхним пределом зарплаты считаются равными.
+    Два объекта Vacancy с одинаковым верхним пределом зарплаты (в рублях) считаются равными.
     Иначе not equal.
     """
     vac1 = Vacancy("A", "urlA", {"currency": "RUR", "from": 100, "to": 200}, {})
-    vac2 = Vacancy("B", "urlB", {"currency": "USD", "from": 50, "to": 200}, {})
+    vac2 = Vacancy("B", "urlB", {"currency": "RUR", "from": 50, "to": 200}, {})
     vac3 = Vacancy("C", "urlC", {"currency": "RUR", "from": 150, "to": 300}, {})
 
     assert vac1 == vac2
@@ -117,3 +121,229 @@ def validation_errors() -> None:
         Vacancy("fdsdsad", "urlSnip", {"currency": "RUR", "from": 0, "to": 0}, 3)
     with pytest.raises(ValueError, match="snippet должен быть словарём."):
         Vacancy("fdsdsad", "urlSnip", 2, snippet)
+
+
+@pytest.mark.parametrize(
+    "record, expected",
+    [
+        ({"id": 123, "url": "https://api.hh.ru/vacancies/999"}, "123"),
+        ({"alternate_url": "https://hh.ru/vacancy/121016072"}, "121016072"),
+        ({"url": "https://api.hh.ru/vacancies/121016072?host=hh.ru"}, "121016072"),
+        ({"url": "https://example.com/job"}, "https://example.com/job"),
+        ({"name": "no url"}, None),
+    ],
+)
+def test_vacancy_key(record: dict, expected: Optional[str]) -> None:
+    """
+    Ключ совпадает для ответа API и сохранённой записи одной и той же вакансии.
+    """
+    assert vacancy_key(record) == expected
+
+
+def test_string_column_roundtrip() -> None:
+    col = StringColumn(["abc", None, "", "где"])
+    col.append("x")
+    assert len(col) == 5
+    assert list(col) == ["abc", None, "", "где", "x"]
+    assert col[-1] == "x"
+    col.append("после чтения")
+    assert col[5] == "после чтения"
+
+
+RAW_API = {
+    "id": "7",
+    "name": " Python dev ",
+    "alternate_url": "https://hh.ru/vacancy/7",
+    "url": "https://api.hh.ru/vacancies/7",
+    "salary": {"currency": "USD", "from": 3000, "to": None},
+    "snippet": {"requirement": "Python", "responsibility": None},
+}
+STORED: List[Dict[str, Any]] = [
+    {
+        "name": "A",
+        "url": "https://hh.ru/vacancy/1",
+        "salary_range": {"currency": "RUR", "from": 100, "to": 300},
+        "snippet": {"requirement": "r1", "responsibility": "s1"},
+    },
+    {
+        "name": "B",
+        "url": "https://hh.ru/vacancy/2",
+        "salary_range": None,
+        "snippet": {"requirement": None, "responsibility": None},
+    },
+    {
+        "name": "C",
+        "url": "https://hh.ru/vacancy/3",
+        "salary_range": {"currency": "RUR", "from": 500, "to": 200},
+        "snippet": {"requirement": "r3", "responsibility": "s3"},
+    },
+]
+
+
+def test_vacancy_table_from_raw_and_stored_records() -> None:
+    """
+    Таблица принимает и ответы API, и сохранённые записи, нормализуя зарплату как Vacancy.
+    """
+    table = VacancyTable.from_records([RAW_API, *STORED])
+
+    assert len(table) == 4
+    assert table.record(0) == {
+        "name": "Python dev",
+        "url": "https://hh.ru/vacancy/7",
+        "salary_range": {"currency": "USD", "from": 3000, "to": 3000},
+        "snippet": {"requirement": "Python", "responsibility": None},
+    }
+    assert table.record(2)["salary_range"] == {"currency": None, "from": 0, "to": 0}
+    assert table.record(3)["salary_range"] == {"currency": "RUR", "from": 500, "to": 500}
+    # Валюта хранится кодом из общего справочника
+    assert table.currencies == [None, "USD", "RUR"]
+    assert list(table.currency_codes) == [1, 2, 0, 2]
+
+
+def test_vacancy_table_rows_are_vacancies() -> None:
+    table = VacancyTable.from_records(STORED)
+    vac = table[0]
+    assert isinstance(vac, Vacancy)
+    assert (vac.name, vac.url, vac.salary_range) == ("A", "https://hh.ru/vacancy/1", STORED[0]["salary_range"])
+    assert [v.name for v in table] == ["A", "B", "C"]
+
+    again = VacancyTable.from_vacancies(table)
+    assert [again.record(i) for i in range(3)] == [table.record(i) for i in range(3)]
+
+
+def test_vacancy_table_column_filters_and_sort() -> None:
+    table = VacancyTable.from_records([RAW_API, *STORED])
+
+    assert table.where(min_salary=300) == [0, 1, 3]
+    assert table.where(min_salary=300, currency="RUR") == [1, 3]
+    assert table.where(max_salary=400, currency="RUR") == [1]
+    assert table.where(currency="EUR") == []
+
+    assert table.argsort(reverse=True) == [0, 3, 1, 2]
+    assert table.argsort("from") == [2, 1, 3, 0]
+
+    top = table.take(table.argsort(reverse=True)[:2])
+    assert [top.names[i] for i in range(len(top))] == ["Python dev", "C"]
+
+
+def make_vacs() -> list:
+    return [
+        Vacancy("low", "u1", {"currency": "RUR", "from": 100, "to": 150}, {}),
+        Vacancy("usd", "u2", {"currency": "USD", "from": 10, "to": 20}, {}),
+        Vacancy("tie1", "u3", {"currency": "RUR", "from": 50, "to": 300}, {}),
+        Vacancy("tie2", "u4", {"currency": "RUR", "from": 250, "to": 300}, {}),
+        Vacancy("none", "u5", None, {}),
+    ]
+
+
+def test_top_n_matches_full_sort_and_is_stable() -> None:
+    """
+    top_n даёт тот же результат, что и полная сортировка, а при равенстве сохраняет исходный порядок.
+    """
+    vacs = make_vacs()
+    assert [v.name for v in top_n(vacs, 3)] == ["tie1", "tie2", "low"]
+    assert [v.name for v in top_n(vacs, 10)] == ["tie1", "tie2", "low", "usd", "none"]
+    assert top_n(vacs, 0) == []
+
+
+def test_top_n_sort_keys() -> None:
+    vacs = make_vacs()
+    rates = {"RUR": 1.0, "USD": 0.0125}
+    assert [v.name for v in top_n(vacs, 2, key="from")] == ["tie2", "low"]
+    assert [v.name for v in top_n(vacs, 2, key="mid")] == ["tie2", "tie1"]
+    assert [v.name for v in top_n(vacs, 2, key="normalized", rates=rates)] == ["usd", "tie1"]
+    assert salary_value(vacs[1], "normalized", rates) == 1600
+    assert [v.name for v in top_n(vacs, 1, key=lambda v: -v.salary_range["to"])] == ["none"]
+    with pytest.raises(ValueError):
+        top_n(vacs, 1, key="median")
+    with pytest.raises(ValueError):
+        salary_value(vacs[0], "median")
+
+
+def test_vacancy_table_top_n() -> None:
+    table = VacancyTable.from_vacancies(make_vacs())
+    assert table.top_n(2) == [2, 3]
+    assert table.top_n(1, "from") == [3]
+
+
+def test_vacancy_from_raw_and_to_dict() -> None:
+    """
+    from_raw понимает формат API (alternate_url, salary) и сохранённый формат (url, salary_range).
+    """
+    api_raw = {
+        "name": "Dev",
+        "alternate_url": "https://hh.ru/vacancy/1",
+        "url": "https://api.hh.ru/vacancies/1",
+        "salary": {"currency": "RUR", "from": 10, "to": None},
+        "snippet": {"requirement": "r"},
+    }
+    vac = Vacancy.from_raw(api_raw)
+    assert vac.to_dict() == {
+        "name": "Dev",
+        "url": "https://hh.ru/vacancy/1",
+        "salary_range": {"currency": "RUR", "from": 10, "to": 10},
+        "snippet": {"requirement": "r"},
+    }
+    assert Vacancy.from_raw(vac.to_dict()).to_dict() == vac.to_dict()
+
+
+def test_from_raw_many_validates_and_shares_salaries() -> None:
+    """
+    Пакетное создание даёт те же вакансии, что и поштучное, а одинаковые вилки разделяют один словарь.
+    """
+    raws = [RAW_API, *STORED, {**STORED[0], "url": "https://hh.ru/vacancy/10"}]
+    vacs = Vacancy.from_raw_many(raws)
+
+    assert [v.to_dict() for v in vacs] == [Vacancy.from_raw(r).to_dict() for r in raws]
+    assert vacs[1].salary_range is vacs[4].salary_range
+    # Общая вилка неизменяема: правка через одну вакансию не должна молча менять другие
+    with pytest.raises(TypeError):
+        vacs[1].salary_range["to"] = 1  # type: ignore[index]
+    assert pickle.loads(pickle.dumps(vacs[1])) == vacs[1]
+    assert json.dumps(vacs[1].to_dict())
+    assert vacs[0].name == "Python dev"
+
+    with pytest.raises(ValueError):
+        Vacancy.from_raw_many([{**STORED[0], "name": " "}])
+    with pytest.raises(ValueError):
+        Vacancy.from_raw_many([{**STORED[0], "salary_range": 100}])
+    with pytest.raises(ValueError):
+        Vacancy.from_raw_many([{**STORED[0], "snippet": "text"}])
+
+
+def test_from_trusted_many_skips_validation() -> None:
+    """
+    Доверенные записи (сохранённые через to_dict) восстанавливаются без проверок.
+    """
+    stored = [v.to_dict() for v in Vacancy.from_raw_many(STORED)]
+    vacs = Vacancy.from_trusted_many(stored)
+
+    assert [v.to_dict() for v in vacs] == stored
+    assert vacs[1].salary_range == {"currency": None, "from": 0, "to": 0}
+    assert Vacancy.from_trusted_many([{**stored[0], "salary_range": None}])[0].salary_range["to"] == 0
+    pair = Vacancy.from_trusted_many([stored[0], {**stored[0], "name": "Other"}])
+    assert pair[0].salary_range is pair[1].salary_range
+
+
+def test_vacancy_comparisons_use_rub_salary(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Зарплаты в разных валютах сравниваются после приведения к рублям, посчитанного один раз при создании.
+    """
+    monkeypatch.setattr("src.currency._default", CurrencyRates({"RUR": 1, "USD": 0.01, "UZS": 100}))
+    rub = Vacancy("rub", "u1", {"currency": "RUR", "from": 0, "to": 300_000}, {})
+    uzs = Vacancy("uzs", "u2", {"currency": "UZS", "from": 0, "to": 8_000_000}, {})
+    usd = Vacancy("usd", "u3", {"currency": "USD", "from": 0, "to": 3_000}, {})
+
+    assert (rub.salary_rub, uzs.salary_rub, usd.salary_rub) == (300_000, 80_000, 300_000)
+    assert uzs < rub
+    assert rub == usd
+    assert [v.name for v in top_n([uzs, rub, usd], 2, key="normalized")] == ["rub", "usd"]
+    assert [v.salary_rub for v in Vacancy.from_raw_many([uzs.to_dict()])] == [80_000]
+    assert [v.salary_rub for v in Vacancy.from_trusted_many([uzs.to_dict()])] == [80_000]
+
+    table = VacancyTable.from_vacancies([uzs, rub, usd])
+    assert list(table.salary_rub) == [80_000, 300_000, 300_000]
+    assert table.top_n(1, "normalized") == [1]
+    assert table.argsort("normalized") == [0, 1, 2]
+    with pytest.raises(ValueError):
+        table.column("median")